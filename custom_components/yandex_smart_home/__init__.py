@@ -94,6 +94,18 @@ ENTITY_CUSTOM_TOGGLE_SCHEMA = vol.Schema(
 )
 
 
+DEADBAND_SCHEMA = vol.Schema(
+    {
+        vol.All(cv.string, ycv.float_property_instance): vol.Schema(
+            {
+                vol.Optional(const.CONF_DEADBAND_ABSOLUTE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(const.CONF_DEADBAND_RELATIVE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            }
+        )
+    }
+)
+
+
 ENTITY_SCHEMA = vol.All(
     vol.Schema(
         {
@@ -109,6 +121,9 @@ ENTITY_SCHEMA = vol.All(
             vol.Optional(const.CONF_STATE_UNKNOWN): cv.boolean,
             vol.Optional(const.CONF_COLOR_PROFILE): cv.string,
             vol.Optional(const.CONF_ERROR_CODE_TEMPLATE): cv.template,
+            vol.Optional(const.CONF_ACTION_DEADLINE): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+            vol.Optional(const.CONF_REPORT_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=1)),
+            vol.Optional(const.CONF_DEADBAND): DEADBAND_SCHEMA,
             vol.Optional(const.CONF_ENTITY_RANGE, default={}): ENTITY_RANGE_SCHEMA,
             vol.Optional(const.CONF_ENTITY_MODE_MAP, default={}): ENTITY_MODE_MAP_SCHEMA,
             vol.Optional(const.CONF_ENTITY_CUSTOM_MODES, default={}): ENTITY_CUSTOM_MODE_SCHEMA,
@@ -123,6 +138,7 @@ NOTIFIER_SCHEMA = vol.Schema(
         vol.Required(const.CONF_NOTIFIER_OAUTH_TOKEN): cv.string,
         vol.Required(const.CONF_NOTIFIER_SKILL_ID): cv.string,
         vol.Required(const.CONF_NOTIFIER_USER_ID): cv.string,
+        vol.Optional(const.CONF_REPORT_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=1)),
     },
 )
 
@@ -134,6 +150,11 @@ SETTINGS_SCHEMA = vol.Schema(
         ),
         vol.Optional(const.CONF_BETA, default=False): cv.boolean,
         vol.Optional(const.CONF_CLOUD_STREAM, default=False): cv.boolean,
+        vol.Optional(const.CONF_ACTION_CONCURRENCY): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(const.CONF_ACTION_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+        vol.Optional(const.CONF_ACTION_DEADLINE): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+        vol.Optional(const.CONF_REPORT_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(const.CONF_DEADBAND): DEADBAND_SCHEMA,
     }
 )
 
@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING, Any, Protocol, Self, runtime_checkable
 
 from homeassistant.const import ATTR_SUPPORTED_FEATURES
 
-from .helpers import ListRegistry
+from .helpers import DomainListRegistry
 from .schema import (
     CapabilityDescription,
     CapabilityInstance,
@@ -92,6 +92,10 @@ class Capability(Protocol[CapabilityInstanceActionState]):
         """Change the capability state."""
         ...
 
+    def get_batch_service_call(self, state: CapabilityInstanceActionState) -> tuple[str, str] | None:
+        """Return domain and service of a call that changes the state and can be shared with other devices."""
+        return None
+
     def check_value_change(self, other: Self | None) -> bool:
         """Test if the capability value differs from other capability."""
         if other is None:
@@ -174,4 +178,4 @@ class StateCapability(Capability[CapabilityInstanceActionState], Protocol):
         return self._entry_data.cache
 
 
-STATE_CAPABILITIES_REGISTRY = ListRegistry[type[StateCapability[Any]]]()
+STATE_CAPABILITIES_REGISTRY = DomainListRegistry[type[StateCapability[Any]]]()
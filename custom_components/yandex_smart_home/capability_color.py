@@ -33,7 +33,7 @@ if TYPE_CHECKING:
     from .entry_data import ConfigEntryData
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(light.DOMAIN)
 class ColorSettingCapability(StateCapability[ColorSettingCapabilityInstanceActionState]):
     """Root capability to discover another light device capabilities.
 
@@ -83,7 +83,7 @@ class ColorSettingCapability(StateCapability[ColorSettingCapabilityInstanceActio
         return [self._color, self._temperature, self._color_scene]
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(light.DOMAIN)
 class RGBColorCapability(StateCapability[RGBInstanceActionState]):
     """Capability to control color of a light device."""
 
@@ -172,7 +172,7 @@ class RGBColorCapability(StateCapability[RGBInstanceActionState]):
         return ColorConverter()
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(light.DOMAIN)
 class ColorTemperatureCapability(StateCapability[TemperatureKInstanceActionState]):
     """Capability to control color temperature of a light device."""
 
@@ -309,7 +309,7 @@ class ColorTemperatureCapability(StateCapability[TemperatureKInstanceActionState
         return ColorTemperatureConverter(None, self.state)
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(light.DOMAIN)
 class ColorSceneCapability(StateCapability[SceneInstanceActionState]):
     """Capability to control effect of a light device."""
 
@@ -9,6 +9,7 @@ from homeassistant.const import STATE_OFF, STATE_UNKNOWN
 from homeassistant.core import callback
 from homeassistant.helpers.service import async_call_from_config
 from homeassistant.helpers.template import Template, forgiving_boolean
+from homeassistant.helpers.typing import UNDEFINED
 
 from .capability import Capability
 from .capability_mode import ModeCapability
@@ -58,6 +59,7 @@ class CustomCapability(Capability[Any], Protocol):
 
     _config: ConfigType
     _value_template: Template | None
+    _template_result: Any = UNDEFINED
 
     def __init__(
         self,
@@ -97,9 +99,20 @@ class CustomCapability(Capability[Any], Protocol):
         """Return copy of the capability with new value template."""
         return self.__class__(self._hass, self._entry_data, self._config, self.instance, self.device_id, value_template)
 
+    def new_with_template_result(self, result: Any) -> Self:
+        """Return copy of the capability with the value replaced by a rendered result of the value template."""
+        capability = self.__class__(
+            self._hass, self._entry_data, self._config, self.instance, self.device_id, self._value_template
+        )
+        capability._template_result = result
+        return capability
+
     @callback
     def _get_source_value(self) -> Any:
         """Return the current capability value (unprocessed)."""
+        if self._template_result is not UNDEFINED:
+            return self._template_result
+
         if self._value_template is None:
             return None
 
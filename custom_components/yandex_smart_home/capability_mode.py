@@ -156,7 +156,7 @@ class StateModeCapability(ModeCapability, StateCapability[ModeCapabilityInstance
         return self.state.state
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(climate.DOMAIN)
 class ThermostatCapability(StateModeCapability):
     """Capability to control mode of a climate device."""
 
@@ -197,7 +197,7 @@ class ThermostatCapability(StateModeCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(climate.DOMAIN)
 class SwingCapability(StateModeCapability):
     """Capability to control swing mode of a climate device."""
 
@@ -261,7 +261,7 @@ class ProgramCapability(StateModeCapability, ABC):
     }
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(humidifier.DOMAIN)
 class ProgramCapabilityHumidifier(ProgramCapability):
     """Capability to control the mode of a humidifier device."""
 
@@ -339,7 +339,7 @@ class ProgramCapabilityHumidifier(ProgramCapability):
         return self.state.attributes.get(humidifier.ATTR_MODE)
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(fan.DOMAIN)
 class ProgramCapabilityFan(ProgramCapability):
     """Capability to control the mode preset of a fan device."""
 
@@ -413,7 +413,7 @@ class ProgramCapabilityFan(ProgramCapability):
         return self.state.attributes.get(fan.ATTR_PRESET_MODE)
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(media_player.DOMAIN)
 class InputSourceCapability(StateModeCapability):
     """Capability to control the input source of a media player device."""
 
@@ -484,7 +484,7 @@ class FanSpeedCapability(StateModeCapability, ABC):
     instance = ModeCapabilityInstance.FAN_SPEED
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(climate.DOMAIN)
 class FanSpeedCapabilityClimate(FanSpeedCapability):
     """Capability to control the fan speed of a climate device."""
 
@@ -567,7 +567,7 @@ class FanSpeedCapabilityClimate(FanSpeedCapability):
         return self.state.attributes.get(climate.ATTR_FAN_MODE)
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(fan.DOMAIN)
 class FanSpeedCapabilityFanViaPreset(FanSpeedCapability):
     """Capability to control the fan speed of a fan device via preset."""
 
@@ -647,7 +647,7 @@ class FanSpeedCapabilityFanViaPreset(FanSpeedCapability):
         return self.state.attributes.get(fan.ATTR_PRESET_MODE)
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(fan.DOMAIN)
 class FanSpeedCapabilityFanViaPercentage(FanSpeedCapability):
     """Capability to control the fan speed in percents of a fan device."""
 
@@ -747,7 +747,7 @@ class FanSpeedCapabilityFanViaPercentage(FanSpeedCapability):
             )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(vacuum.DOMAIN)
 class CleanupModeCapability(StateModeCapability):
     """Capability to control the program of a vacuum."""
 
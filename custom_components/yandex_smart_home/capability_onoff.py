@@ -112,7 +112,9 @@ class OnlyOnCapability(ActionOnlyCapabilityMixin, OnOffCapability, ABC):
         return None
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(
+    light.DOMAIN, fan.DOMAIN, switch.DOMAIN, humidifier.DOMAIN, input_boolean.DOMAIN
+)
 class OnOffCapabilityBasic(OnOffCapability):
     """Capability to turn on or off a device."""
 
@@ -121,6 +123,13 @@ class OnOffCapabilityBasic(OnOffCapability):
         """Test if the capability is supported."""
         return self.state.domain in (light.DOMAIN, fan.DOMAIN, switch.DOMAIN, humidifier.DOMAIN, input_boolean.DOMAIN)
 
+    def get_batch_service_call(self, state: OnOffCapabilityInstanceActionState) -> tuple[str, str] | None:
+        """Return domain and service of a call that changes the state and can be shared with other devices."""
+        if CONF_TURN_ON in self._entity_config or CONF_TURN_OFF in self._entity_config:
+            return None
+
+        return self.state.domain, self._get_service(state)
+
     async def _set_instance_state(self, context: Context, state: OnOffCapabilityInstanceActionState) -> None:
         """Change the capability state (if wasn't overriden by the user)."""
         await self._hass.services.async_call(
@@ -132,7 +141,7 @@ class OnOffCapabilityBasic(OnOffCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(automation.DOMAIN)
 class OnOffCapabilityAutomation(OnOffCapability):
     """Capability to enable or disable an automation."""
 
@@ -156,7 +165,7 @@ class OnOffCapabilityAutomation(OnOffCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(group.DOMAIN)
 class OnOffCapabilityGroup(OnOffCapability):
     """Capability to turn on or off a group of devices."""
 
@@ -176,7 +185,7 @@ class OnOffCapabilityGroup(OnOffCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(scene.DOMAIN, script.DOMAIN)
 class OnOffCapabilityScript(OnlyOnCapability):
     """Capability to call a script or scene."""
 
@@ -196,7 +205,7 @@ class OnOffCapabilityScript(OnlyOnCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(button.DOMAIN)
 class OnOffCapabilityButton(OnlyOnCapability):
     """Capability to press a button."""
 
@@ -216,7 +225,7 @@ class OnOffCapabilityButton(OnlyOnCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(input_button.DOMAIN)
 class OnOffCapabilityInputButton(OnlyOnCapability):
     """Capability to press a input_button."""
 
@@ -236,7 +245,7 @@ class OnOffCapabilityInputButton(OnlyOnCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(lock.DOMAIN)
 class OnOffCapabilityLock(OnOffCapability):
     """Capability to lock or unlock a lock."""
 
@@ -261,7 +270,7 @@ class OnOffCapabilityLock(OnOffCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(cover.DOMAIN)
 class OnOffCapabilityCover(OnOffCapability):
     """Capability to open or close a cover."""
 
@@ -286,7 +295,7 @@ class OnOffCapabilityCover(OnOffCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(media_player.DOMAIN)
 class OnOffCapabilityMediaPlayer(OnOffCapability):
     """Capability to turn on or off a media player device."""
 
@@ -318,7 +327,7 @@ class OnOffCapabilityMediaPlayer(OnOffCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(vacuum.DOMAIN)
 class OnOffCapabilityVacuum(OnOffCapability):
     """Capability to start or stop cleaning by a vacuum."""
 
@@ -370,7 +379,7 @@ class OnOffCapabilityVacuum(OnOffCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(climate.DOMAIN)
 class OnOffCapabilityClimate(OnOffCapability):
     """Capability to turn on or off a climate device."""
 
@@ -404,7 +413,7 @@ class OnOffCapabilityClimate(OnOffCapability):
         await self._hass.services.async_call(climate.DOMAIN, service, service_data, blocking=True, context=context)
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(water_heater.DOMAIN)
 class OnOffCapabilityWaterHeater(OnOffCapability):
     """Capability to turn on or off a water heater."""
 
@@ -169,7 +169,7 @@ class StateRangeCapability(RangeCapability, StateCapability[RangeCapabilityInsta
         return max(min(value + relative_value, self._range.max), self._range.min)
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(cover.DOMAIN)
 class CoverPositionCapability(StateRangeCapability):
     """Capability to control position of a cover."""
 
@@ -211,7 +211,7 @@ class TemperatureCapability(StateRangeCapability, ABC):
         return True
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(water_heater.DOMAIN)
 class TemperatureCapabilityWaterHeater(TemperatureCapability):
     """Capability to control a water heater target temperature."""
 
@@ -246,7 +246,7 @@ class TemperatureCapabilityWaterHeater(TemperatureCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(climate.DOMAIN)
 class TemperatureCapabilityClimate(TemperatureCapability):
     """Capability to control a climate device target temperature."""
 
@@ -292,7 +292,7 @@ class HumidityCapability(StateRangeCapability, ABC):
         return True
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(humidifier.DOMAIN)
 class HumidityCapabilityHumidifier(HumidityCapability):
     """Capability to control a humidifier target humidity."""
 
@@ -325,7 +325,7 @@ class HumidityCapabilityHumidifier(HumidityCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(fan.DOMAIN)
 class HumidityCapabilityXiaomiFan(HumidityCapability):
     """Capability to control a Xiaomi fan target humidity."""
 
@@ -354,7 +354,7 @@ class HumidityCapabilityXiaomiFan(HumidityCapability):
         return self._convert_to_float(self.state.attributes.get(ATTR_TARGET_HUMIDITY))
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(light.DOMAIN)
 class BrightnessCapability(StateRangeCapability):
     """Capability to control brightness of a device."""
 
@@ -409,7 +409,7 @@ class BrightnessCapability(StateRangeCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(media_player.DOMAIN)
 class VolumeCapability(StateRangeCapability):
     """Capability to control volume of a device."""
 
@@ -490,7 +490,7 @@ class VolumeCapability(StateRangeCapability):
         return None
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(media_player.DOMAIN)
 class ChannelCapability(StateRangeCapability):
     """Capability to control media playback state."""
 
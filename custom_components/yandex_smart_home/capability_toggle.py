@@ -36,7 +36,7 @@ class StateToggleCapability(ToggleCapability, StateCapability[ToggleCapabilityIn
     pass
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(media_player.DOMAIN)
 class MuteCapability(StateToggleCapability):
     """Capability to mute and unmute device."""
 
@@ -74,7 +74,7 @@ class MuteCapability(StateToggleCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(media_player.DOMAIN)
 class PauseCapabilityMediaPlayer(StateToggleCapability):
     """Capability to pause and resume media player playback."""
 
@@ -111,7 +111,7 @@ class PauseCapabilityMediaPlayer(StateToggleCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(cover.DOMAIN)
 class PauseCapabilityCover(ActionOnlyCapabilityMixin, StateToggleCapability):
     """Capability to stop a cover."""
 
@@ -133,7 +133,7 @@ class PauseCapabilityCover(ActionOnlyCapabilityMixin, StateToggleCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(vacuum.DOMAIN)
 class PauseCapabilityVacuum(StateToggleCapability):
     """Capability to stop a vacuum."""
 
@@ -160,7 +160,7 @@ class PauseCapabilityVacuum(StateToggleCapability):
         )
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(fan.DOMAIN)
 class OscillationCapability(StateToggleCapability):
     """Capability to control fan oscillation."""
 
@@ -28,7 +28,7 @@ if TYPE_CHECKING:
     from . import YandexSmartHome
 
 
-@STATE_CAPABILITIES_REGISTRY.register
+@STATE_CAPABILITIES_REGISTRY.register_for(camera.DOMAIN)
 class VideoStreamCapability(ActionOnlyCapabilityMixin, StateCapability[GetStreamInstanceActionState]):
     """Capability to stream from cameras."""
 
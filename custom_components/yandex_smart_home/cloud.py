@@ -1,6 +1,7 @@
 """Implement the Yandex Smart Home cloud connection manager."""
 from __future__ import annotations
 
+import asyncio
 from asyncio import TimeoutError
 from datetime import datetime, timedelta
 from http import HTTPStatus
@@ -9,14 +10,14 @@ from typing import TYPE_CHECKING, Any, AsyncIterable, cast
 
 from aiohttp import ClientConnectorError, ClientResponseError, ClientWebSocketResponse, WSMessage, WSMsgType, hdrs
 from homeassistant.core import Context, HassJob
-from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE, async_create_clientsession, async_get_clientsession
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE, async_get_clientsession
 from homeassistant.helpers.event import async_call_later
 from homeassistant.util import dt
-from pydantic import BaseModel
 
 from . import handlers
 from .const import CLOUD_BASE_URL, DOMAIN
 from .helpers import RequestData
+from .schema import APIModel, Error, Response, ResponseCode
 
 if TYPE_CHECKING:
     from homeassistant.core import CALLBACK_TYPE, HomeAssistant
@@ -30,9 +31,14 @@ MAX_RECONNECTION_DELAY = 180
 FAST_RECONNECTION_TIME = timedelta(seconds=6)
 FAST_RECONNECTION_THRESHOLD = 5
 BASE_API_URL = f"{CLOUD_BASE_URL}/api/home_assistant/v1"
+MAX_CONCURRENT_REQUESTS = 10
+REQUEST_TIMEOUT = 30
+WS_COMPRESS = 15
+WS_COMPRESS_THRESHOLD = 1024
+WS_BINARY_PROTOCOL = "yandex_smart_home.binary"
 
 
-class CloudInstanceData(BaseModel):
+class CloudInstanceData(APIModel):
     """Hold settings for the cloud connection."""
 
     id: str
@@ -40,7 +46,7 @@ class CloudInstanceData(BaseModel):
     connection_token: str
 
 
-class CloudRequest(BaseModel):
+class CloudRequest(APIModel):
     """Request from the cloud."""
 
     request_id: str
@@ -62,6 +68,8 @@ class CloudManager:
         self._ws_reconnect_delay = DEFAULT_RECONNECTION_DELAY
         self._ws_active = True
         self._unsub_connect: CALLBACK_TYPE | None = None
+        self._requests_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._request_tasks: set[asyncio.Task[None]] = set()
 
         self._url = f"{BASE_API_URL}/connect"
 
@@ -73,19 +81,24 @@ class CloudManager:
             self._ws = await self._session.ws_connect(
                 self._url,
                 heartbeat=45,
-                compress=15,
+                compress=WS_COMPRESS,
+                protocols=(WS_BINARY_PROTOCOL,),
                 headers={
                     hdrs.AUTHORIZATION: f"Bearer {self._entry_data.cloud_connection_token}",
                     hdrs.USER_AGENT: f"{SERVER_SOFTWARE} {DOMAIN}/{self._entry_data.version}",
                 },
             )
 
-            _LOGGER.debug("Connection to Yandex Smart Home cloud established")
+            _disable_default_compression(self._ws)
+            _LOGGER.debug(
+                f"Connection to Yandex Smart Home cloud established "
+                f"(compress: {self._ws.compress}, protocol: {self._ws.protocol})"
+            )
             self._ws_reconnect_delay = DEFAULT_RECONNECTION_DELAY
             self._last_connection_at = dt.utcnow()
 
             async for msg in cast(AsyncIterable[WSMessage], self._ws):
-                if msg.type == WSMsgType.TEXT:
+                if msg.type in (WSMsgType.TEXT, WSMsgType.BINARY):
                     await self._on_message(msg)
 
             _LOGGER.debug(f"Disconnected: {self._ws.close_code}")
@@ -103,6 +116,9 @@ class CloudManager:
     async def async_disconnect(self, *_: Any) -> None:
         """Disconnect from the cloud."""
         self._ws_active = False
+        for task in self._request_tasks:
+            task.cancel()
+
         if self._ws:
             await self._ws.close()
 
@@ -113,10 +129,23 @@ class CloudManager:
         return None
 
     async def _on_message(self, message: WSMessage) -> None:
-        """Handle incoming request from the cloud."""
+        """Handle incoming request from the cloud.
+
+        Requests are handled concurrently, reading of next messages waits while too many requests are in progress.
+        """
         request = CloudRequest.parse_raw(message.data)
         _LOGGER.debug("Request: %s (message: %s)" % (request.action, request.message))
 
+        assert self._ws is not None
+        await self._requests_semaphore.acquire()
+
+        task = self._hass.async_create_task(self._async_handle_request(self._ws, request))
+        self._request_tasks.add(task)
+        task.add_done_callback(self._request_tasks.discard)
+        return None
+
+    async def _async_handle_request(self, ws: ClientWebSocketResponse, request: CloudRequest) -> None:
+        """Handle a request and send the response tagged by the request id."""
         data = RequestData(
             entry_data=self._entry_data,
             context=Context(user_id=self._entry_data.user_id),
@@ -124,12 +153,38 @@ class CloudManager:
             request_id=request.request_id,
         )
 
-        result = await handlers.async_handle_request(self._hass, data, request.action, request.message)
-        response = result.as_json()
+        try:
+            async with asyncio.timeout(REQUEST_TIMEOUT):
+                result = await handlers.async_handle_request(self._hass, data, request.action, request.message)
+        except TimeoutError:
+            _LOGGER.error(f"Timeout while handling request {request.action} ({request.request_id})")
+            result = Response(request_id=request.request_id, payload=Error(error_code=ResponseCode.INTERNAL_ERROR))
+        finally:
+            self._requests_semaphore.release()
+
+        response = await handlers.async_serialize_response(self._hass, result)
         _LOGGER.debug(f"Response: {response}")
 
-        assert self._ws is not None
-        await self._ws.send_str(response)
+        if ws.closed:
+            _LOGGER.debug(f"Connection closed, response to request {request.request_id} dropped")
+            return None
+
+        await self._async_send_response(ws, response)
+        return None
+
+    @staticmethod
+    async def _async_send_response(ws: ClientWebSocketResponse, response: str) -> None:
+        """Send a response to the cloud.
+
+        Only responses larger than the threshold are compressed, RFC 7692 allows it per message. The frame type
+        depends on the negotiated subprotocol: UTF-8 encoded JSON is sent in binary frames for the binary one.
+        """
+        compress = ws.compress if len(response) >= WS_COMPRESS_THRESHOLD else None
+        if ws.protocol == WS_BINARY_PROTOCOL:
+            await ws.send_bytes(response.encode("utf-8"), compress=compress)
+        else:
+            await ws.send_str(response, compress=compress)
+
         return None
 
     def _try_reconnect(self) -> None:
@@ -155,7 +210,7 @@ class CloudManager:
 
 async def register_cloud_instance(hass: HomeAssistant) -> CloudInstanceData:
     """Register a new cloud instance."""
-    session = async_create_clientsession(hass)
+    session = async_get_clientsession(hass)
 
     response = await session.post(f"{BASE_API_URL}/instance/register")
     response.raise_for_status()
@@ -165,7 +220,7 @@ async def register_cloud_instance(hass: HomeAssistant) -> CloudInstanceData:
 
 async def delete_cloud_instance(hass: HomeAssistant, instance_id: str, token: str) -> None:
     """Delete a cloud instance from the cloud."""
-    session = async_create_clientsession(hass)
+    session = async_get_clientsession(hass)
 
     response = await session.delete(
         f"{BASE_API_URL}/instance/{instance_id}",
@@ -175,3 +230,17 @@ async def delete_cloud_instance(hass: HomeAssistant, instance_id: str, token: st
         _LOGGER.error(f"Failed to delete cloud instance, status code: {response.status}")
 
     return None
+
+
+def _disable_default_compression(ws: ClientWebSocketResponse) -> None:
+    """Stop compressing every frame of the connection, large responses are compressed per message instead.
+
+    aiohttp has no public switch for the connection default: compress=0 of a send falls back to it. If the writer
+    attribute is missing in a future release all frames stay compressed.
+    """
+    # noinspection PyProtectedMember
+    writer = getattr(ws, "_writer", None)
+    if writer is not None and isinstance(getattr(writer, "compress", None), int):
+        writer.compress = 0
+
+    return None
@@ -45,6 +45,19 @@ def property_type(value: str) -> str:
     )
 
 
+def float_property_instance(value: str) -> str:
+    try:
+        FloatPropertyInstance(value)
+    except ValueError:
+        _LOGGER.error(
+            f"Float property instance {value!r} is not supported. "
+            f"See valid values at https://yandex.ru/dev/dialogs/smart-home/doc/concepts/float-instance.html"
+        )
+        raise vol.Invalid(f"Float property instance {value!r} is not supported.")
+
+    return value
+
+
 def mode_instance(value: str) -> str:
     if value == ColorSettingCapabilityInstance.SCENE:
         return value
@@ -8,6 +8,13 @@ CONF_SETTINGS = "settings"
 CONF_PRESSURE_UNIT = "pressure_unit"
 CONF_BETA = "beta"
 CONF_CLOUD_STREAM = "cloud_stream"
+CONF_ACTION_CONCURRENCY = "action_concurrency"
+CONF_ACTION_TIMEOUT = "action_timeout"
+CONF_ACTION_DEADLINE = "action_deadline"
+CONF_REPORT_INTERVAL = "report_interval"
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_ABSOLUTE = "absolute"
+CONF_DEADBAND_RELATIVE = "relative"
 CONF_NOTIFIER = "notifier"
 CONF_NOTIFIER_OAUTH_TOKEN = "oauth_token"
 CONF_NOTIFIER_SKILL_ID = "skill_id"
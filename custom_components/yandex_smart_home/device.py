@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Mapping
 
 from homeassistant.components import (
     air_quality,
@@ -32,6 +32,7 @@ from homeassistant.components import (
 from homeassistant.const import ATTR_DEVICE_CLASS, CLOUD_NEVER_EXPOSED_ENTITIES, CONF_NAME, STATE_UNAVAILABLE
 from homeassistant.core import State, callback
 from homeassistant.helpers.template import Template
+from homeassistant.helpers.typing import UNDEFINED
 
 from . import (  # noqa: F401
     capability_color,
@@ -48,7 +49,7 @@ from . import (  # noqa: F401
 from . import const  # noqa: F401
 from .capability import STATE_CAPABILITIES_REGISTRY
 from .capability_custom import get_custom_capability
-from .helpers import ActionNotAllowed, APIError
+from .helpers import ActionNotAllowed, APIError, StateAttributesRecorder
 from .property import STATE_PROPERTIES_REGISTRY
 from .property_custom import get_custom_property
 from .schema import (
@@ -141,6 +142,74 @@ def _alias_priority(text: str) -> tuple[int, str]:
     return 1, text
 
 
+class DeviceDescriptionCache:
+    """Hold device descriptions until the state or registry entries of the device change."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._descriptions: dict[str, tuple[tuple[Any, ...], DeviceDescription]] = {}
+
+    def get(self, device_id: str, fingerprint: tuple[Any, ...]) -> DeviceDescription | None:
+        """Return a cached description if it was created for the same fingerprint."""
+        if (cached := self._descriptions.get(device_id)) is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        return None
+
+    def set(self, device_id: str, fingerprint: tuple[Any, ...], description: DeviceDescription) -> None:
+        """Cache a description of the device."""
+        self._descriptions[device_id] = (fingerprint, description)
+
+    def invalidate(self, device_id: str) -> None:
+        """Forget the description of the device."""
+        self._descriptions.pop(device_id, None)
+
+    def clear(self) -> None:
+        """Forget all descriptions."""
+        self._descriptions.clear()
+
+
+class DeviceSupportPlan:
+    """Hold classes of state capabilities and properties supported by the device.
+
+    The plan is valid while the attributes that were read during the support check keep their values.
+    """
+
+    __slots__ = ("key", "attributes", "capabilities", "properties")
+
+    def __init__(self, key: tuple[Any, ...]):
+        """Initialize an empty plan for the support inputs."""
+        self.key = key
+        self.attributes: dict[str, Any] | None = {}
+        self.capabilities: list[type[StateCapability[Any]]] | None = None
+        self.properties: list[type[StateProperty]] | None = None
+
+    def matches(self, key: tuple[Any, ...], attributes: Mapping[str, Any]) -> bool:
+        """Test if the plan is valid for the state."""
+        if self.key != key or self.attributes is None:
+            return False
+
+        for name, value in self.attributes.items():
+            if attributes.get(name, UNDEFINED) != value:
+                return False
+
+        return True
+
+    def record_attributes(self, attributes: StateAttributesRecorder) -> None:
+        """Remember values of the attributes that were read during the support check."""
+        if self.attributes is None:
+            return None
+
+        if attributes.read_keys is None:
+            self.attributes = None
+            return None
+
+        for name in attributes.read_keys:
+            self.attributes[name] = dict.get(attributes, name, UNDEFINED)
+
+        return None
+
+
 class Device:
     """Represent user device."""
 
@@ -188,10 +257,24 @@ class Device:
     @callback
     def get_state_capabilities(self) -> list[StateCapability[Any]]:
         """Return capabilities of the device based on the state."""
+        plan = self._get_support_plan()
+        if plan is not None and plan.capabilities is not None:
+            return [CapabilityT(self._hass, self._entry_data, self._state) for CapabilityT in plan.capabilities]
+
+        if plan is None:
+            return self._get_supported_state_capabilities(self._state)
+
+        state, attributes = self._get_recording_state()
+        plan.capabilities = [type(c) for c in self._get_supported_state_capabilities(state)]
+        plan.record_attributes(attributes)
+        return [CapabilityT(self._hass, self._entry_data, self._state) for CapabilityT in plan.capabilities]
+
+    def _get_supported_state_capabilities(self, state: State) -> list[StateCapability[Any]]:
+        """Return capabilities of the device supported by the state."""
         capabilities: list[StateCapability[Any]] = []
 
-        for CapabilityT in STATE_CAPABILITIES_REGISTRY:
-            state_capability = CapabilityT(self._hass, self._entry_data, self._state)
+        for CapabilityT in STATE_CAPABILITIES_REGISTRY.for_domain(state.domain):
+            state_capability = CapabilityT(self._hass, self._entry_data, state)
             if state_capability.supported and state_capability not in capabilities:
                 capabilities.append(state_capability)
 
@@ -219,15 +302,62 @@ class Device:
     @callback
     def get_state_properties(self) -> list[StateProperty]:
         """Return properties for the devic based on the state."""
+        plan = self._get_support_plan()
+        if plan is not None and plan.properties is not None:
+            return [PropertyT(self._hass, self._entry_data, self._state) for PropertyT in plan.properties]
+
+        if plan is None:
+            return self._get_supported_state_properties(self._state)
+
+        state, attributes = self._get_recording_state()
+        plan.properties = [type(p) for p in self._get_supported_state_properties(state)]
+        plan.record_attributes(attributes)
+        return [PropertyT(self._hass, self._entry_data, self._state) for PropertyT in plan.properties]
+
+    def _get_supported_state_properties(self, state: State) -> list[StateProperty]:
+        """Return properties of the device supported by the state."""
         properties: list[StateProperty] = []
 
-        for PropertyT in STATE_PROPERTIES_REGISTRY:
-            device_property = PropertyT(self._hass, self._entry_data, self._state)
+        for PropertyT in STATE_PROPERTIES_REGISTRY.for_domain(state.domain):
+            device_property = PropertyT(self._hass, self._entry_data, state)
             if device_property.supported and device_property not in properties:
                 properties.append(device_property)
 
         return properties
 
+    def _get_recording_state(self) -> tuple[State, StateAttributesRecorder]:
+        """Return a copy of the state that remembers which attributes were read."""
+        attributes = StateAttributesRecorder(self._state.attributes)
+        state = State(
+            self._state.entity_id,
+            self._state.state,
+            last_changed=self._state.last_changed,
+            last_updated=self._state.last_updated,
+            context=self._state.context,
+            validate_entity_id=False,
+        )
+        state.attributes = attributes
+        return state, attributes
+
+    @callback
+    def _get_support_plan(self) -> DeviceSupportPlan | None:
+        """Return the plan of supported state capabilities and properties for the current state."""
+        support_plans = self._entry_data.support_plans
+        if support_plans is None:
+            return None
+
+        # entity config can't change at runtime, support is decided by the domain, features, device class
+        # and other attributes. The input source of a media player also depends on the player state.
+        key: tuple[Any, ...] = (self._state.domain,)
+        if self._state.domain == media_player.DOMAIN:
+            key += (self._state.state,)
+
+        plan = support_plans.get(self.id)
+        if plan is None or not plan.matches(key, self._state.attributes):
+            plan = support_plans[self.id] = DeviceSupportPlan(key)
+
+        return plan
+
     @property
     def should_expose(self) -> bool:
         """Test if the device should be exposed."""
@@ -262,6 +392,27 @@ class Device:
         self, ent_reg: EntityRegistry, dev_reg: DeviceRegistry, area_reg: AreaRegistry
     ) -> DeviceDescription | None:
         """Return description of the device."""
+        entity_entry, device_entry = await self._get_entity_and_device(ent_reg, dev_reg)
+        area_entry = self._get_area(entity_entry, device_entry, area_reg)
+
+        description_cache = self._entry_data.description_cache
+        if description_cache is None:
+            return self._describe(entity_entry, device_entry, area_entry)
+
+        # registry entries are immutable, any update replaces them
+        fingerprint = (self._state.state, self._state.attributes, entity_entry, device_entry, area_entry)
+        if (description := description_cache.get(self.id, fingerprint)) is not None:
+            return description
+
+        if (description := self._describe(entity_entry, device_entry, area_entry)) is not None:
+            description_cache.set(self.id, fingerprint, description)
+
+        return description
+
+    def _describe(
+        self, entity_entry: RegistryEntry | None, device_entry: DeviceEntry | None, area_entry: AreaEntry | None
+    ) -> DeviceDescription | None:
+        """Build description of the device."""
         capabilities: list[CapabilityDescription] = []
         for c in self.get_capabilities():
             if c_description := c.get_description():
@@ -275,7 +426,6 @@ class Device:
         if not capabilities and not properties:
             return None
 
-        entity_entry, device_entry = await self._get_entity_and_device(ent_reg, dev_reg)
         device_info = DeviceInfo(model=self.id)
         if device_entry is not None:
             if device_entry.model:
@@ -289,7 +439,7 @@ class Device:
                 sw_version=device_entry.sw_version,
             )
 
-        if (room := self._get_room(entity_entry, device_entry, area_reg)) is not None:
+        if (room := self._get_room(area_entry)) is not None:
             room = room.strip()
 
         assert self.type
@@ -328,6 +478,22 @@ class Device:
         self, context: Context, action: CapabilityInstanceAction
     ) -> CapabilityInstanceActionResultValue | None:
         """Execute an action to change capability state."""
+        target_capability = self.get_action_capability(action)
+
+        try:
+            return await target_capability.set_instance_state(context, action.state)
+        except (APIError, ActionNotAllowed):
+            raise
+        except Exception as e:
+            raise APIError(
+                ResponseCode.INTERNAL_ERROR,
+                f"Failed to execute action for instance {action.state.instance.value} ({action.type.value}) of "
+                f"{self.id}: {e!r}",
+            )
+
+    @callback
+    def get_action_capability(self, action: CapabilityInstanceAction) -> Capability[Any]:
+        """Return the capability to be changed by the action if the action is allowed."""
         target_capability: Capability[Any] | None = None
 
         for capability in self.get_capabilities():
@@ -351,16 +517,7 @@ class Device:
 
                 raise ActionNotAllowed(code)
 
-        try:
-            return await target_capability.set_instance_state(context, action.state)
-        except (APIError, ActionNotAllowed):
-            raise
-        except Exception as e:
-            raise APIError(
-                ResponseCode.INTERNAL_ERROR,
-                f"Failed to execute action for instance {action.state.instance.value} ({action.type.value}) of "
-                f"{self.id}: {e!r}",
-            )
+        return target_capability
 
     async def _get_entity_and_device(
         self, ent_reg: EntityRegistry, dev_reg: DeviceRegistry
@@ -386,14 +543,11 @@ class Device:
 
         return self._state.name or self.id
 
-    def _get_room(
-        self, entity_entry: RegistryEntry | None, device_entry: DeviceEntry | None, area_reg: AreaRegistry
-    ) -> str | None:
+    def _get_room(self, area: AreaEntry | None) -> str | None:
         """Return room of the device."""
         if room := self._config.get(const.CONF_ROOM):
             return str(room)
 
-        area = self._get_area(entity_entry, device_entry, area_reg)
         if area:
             if area.aliases:
                 return sorted(area.aliases, key=_alias_priority)[0]
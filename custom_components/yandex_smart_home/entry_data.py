@@ -5,9 +5,17 @@ import logging
 from typing import Any, Self, cast
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, EVENT_HOMEASSISTANT_STOP, UnitOfPressure
-from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CLOUD_NEVER_EXPOSED_ENTITIES,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
+    UnitOfPressure,
+)
+from homeassistant.core import CoreState, Event, HomeAssistant, State, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.entityfilter import EntityFilter
 from homeassistant.helpers.template import Template
 from homeassistant.helpers.typing import ConfigType
@@ -18,8 +26,9 @@ from .capability_custom import CustomCapability, get_custom_capability
 from .cloud import CloudManager
 from .color import ColorProfiles
 from .const import DOMAIN, ConnectionType
+from .device import DeviceDescriptionCache, DeviceSupportPlan
 from .helpers import APIError, CacheStore
-from .notifier import NotifierConfig, YandexCloudNotifier, YandexDirectNotifier, YandexNotifier
+from .notifier import NotifierConfig, NotifierPipeline, YandexCloudNotifier, YandexDirectNotifier, YandexNotifier
 from .property_custom import CustomProperty, get_custom_property
 from .schema import CapabilityType
 
@@ -48,7 +57,11 @@ class ConfigEntryData:
         self._entity_filter = entity_filter
         self._cloud_manager: CloudManager | None = None
         self._notifiers: list[YandexNotifier] = []
+        self._notifier_pipeline: NotifierPipeline | None = None
         self._notifier_configs: list[NotifierConfig] = []
+        self._exposed_entity_ids: dict[str, None] | None = None
+        self.description_cache: DeviceDescriptionCache | None = None
+        self.support_plans: dict[str, DeviceSupportPlan] | None = None
 
     async def async_setup(self) -> Self:
         """Set up the config entry data."""
@@ -56,6 +69,10 @@ class ConfigEntryData:
         self.cache = CacheStore(self._hass)
         await self.cache.async_load()
 
+        self._async_setup_exposed_entities()
+        self.description_cache = DeviceDescriptionCache()
+        self.support_plans = {}
+
         if self.connection_type == ConnectionType.CLOUD:
             await self._async_setup_cloud_connection()
 
@@ -70,6 +87,9 @@ class ConfigEntryData:
     async def async_unload(self) -> None:
         """Unload the config entry data."""
         tasks = [asyncio.create_task(n.async_unload()) for n in self._notifiers]
+        if self._notifier_pipeline:
+            tasks.append(asyncio.create_task(self._notifier_pipeline.async_unload()))
+
         if self._cloud_manager:
             tasks.append(asyncio.create_task(self._cloud_manager.async_disconnect()))
 
@@ -92,6 +112,30 @@ class ConfigEntryData:
         settings = self._yaml_config.get(const.CONF_SETTINGS, {})
         return bool(settings.get(const.CONF_CLOUD_STREAM))
 
+    @property
+    def action_concurrency(self) -> int:
+        """Return maximum number of devices changed in parallel by an action request."""
+        settings = self._yaml_config.get(const.CONF_SETTINGS, {})
+        return int(settings.get(const.CONF_ACTION_CONCURRENCY, 10))
+
+    @property
+    def action_timeout(self) -> float | None:
+        """Return maximum duration of actions for one device."""
+        settings = self._yaml_config.get(const.CONF_SETTINGS, {})
+        if (timeout := settings.get(const.CONF_ACTION_TIMEOUT)) is not None:
+            return float(timeout)
+
+        return None
+
+    @property
+    def report_interval(self) -> float | None:
+        """Return minimal time between state reports of one device."""
+        settings = self._yaml_config.get(const.CONF_SETTINGS, {})
+        if (interval := settings.get(const.CONF_REPORT_INTERVAL)) is not None:
+            return float(interval)
+
+        return None
+
     @property
     def connection_type(self) -> ConnectionType:
         """Return connection type."""
@@ -132,6 +176,28 @@ class ConfigEntryData:
         """Return configuration for the entity."""
         return cast(ConfigType, self.entity_config.get(entity_id, {}))
 
+    def get_action_deadline(self, entity_id: str) -> float | None:
+        """Return time to wait for actions of the entity before responding."""
+        settings = self._yaml_config.get(const.CONF_SETTINGS, {})
+        deadline = self.get_entity_config(entity_id).get(
+            const.CONF_ACTION_DEADLINE, settings.get(const.CONF_ACTION_DEADLINE)
+        )
+        if deadline is not None:
+            return float(deadline)
+
+        return None
+
+    def get_property_deadband(self, entity_id: str, instance: str) -> ConfigType | None:
+        """Return changes of a float property value that are too small to report."""
+        if (deadband := self.get_entity_config(entity_id).get(const.CONF_DEADBAND, {}).get(instance)) is not None:
+            return cast(ConfigType, deadband)
+
+        settings = self._yaml_config.get(const.CONF_SETTINGS, {})
+        if (deadband := settings.get(const.CONF_DEADBAND, {}).get(instance)) is not None:
+            return cast(ConfigType, deadband)
+
+        return None
+
     def should_expose(self, entity_id: str) -> bool:
         """Test if the entity should be exposed."""
         if self._entity_filter and not self._entity_filter.empty_filter:
@@ -139,6 +205,27 @@ class ConfigEntryData:
 
         return False
 
+    @callback
+    def is_exposed_entity(self, entity_id: str) -> bool:
+        """Test if the entity can be exposed (it doesn't test the device type and availability)."""
+        if self._exposed_entity_ids is None:
+            return self._is_exposed_entity(entity_id)
+
+        return entity_id in self._exposed_entity_ids
+
+    @callback
+    def get_exposed_states(self) -> list[State]:
+        """Return states of entities that can be exposed (it doesn't test the device type and availability)."""
+        if self._exposed_entity_ids is None:
+            return [s for s in self._hass.states.async_all() if self._is_exposed_entity(s.entity_id)]
+
+        states: list[State] = []
+        for entity_id in self._exposed_entity_ids:
+            if (state := self._hass.states.get(entity_id)) is not None:
+                states.append(state)
+
+        return states
+
     def discover_devices(self) -> bool:
         """Mark config entry has returned the device list once."""
         if self.entry.data.get(const.CONF_DEVICES_DISCOVERED):
@@ -157,21 +244,102 @@ class ConfigEntryData:
         except KeyError:
             return "unknown"
 
+    def _is_exposed_entity(self, entity_id: str) -> bool:
+        """Test if the entity passes the filter."""
+        return entity_id not in CLOUD_NEVER_EXPOSED_ENTITIES and self.should_expose(entity_id)
+
+    @callback
+    def _async_setup_exposed_entities(self) -> None:
+        """Build the index of exposed entities and keep it up to date.
+
+        The entity filter can't change at runtime, the config entry is reloaded instead.
+        """
+        self._exposed_entity_ids = {}
+        for state in self._hass.states.async_all():
+            if self._is_exposed_entity(state.entity_id):
+                self._exposed_entity_ids[state.entity_id] = None
+
+        self.entry.async_on_unload(
+            self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_handle_state_added_or_removed,
+                event_filter=_state_added_or_removed_filter,
+                run_immediately=True,
+            )
+        )
+        self.entry.async_on_unload(
+            self._hass.bus.async_listen(
+                EVENT_ENTITY_REGISTRY_UPDATED, self._async_handle_entity_registry_updated, run_immediately=True
+            )
+        )
+
+        return None
+
+    @callback
+    def _async_handle_state_added_or_removed(self, event: Event) -> None:
+        """Update the exposed entities index when a state is added or removed."""
+        assert self._exposed_entity_ids is not None
+        entity_id = str(event.data[ATTR_ENTITY_ID])
+
+        if event.data.get("new_state") is None:
+            self._exposed_entity_ids.pop(entity_id, None)
+            self._forget_entity(entity_id)
+        elif self._is_exposed_entity(entity_id):
+            self._exposed_entity_ids[entity_id] = None
+
+        return None
+
+    @callback
+    def _async_handle_entity_registry_updated(self, event: Event) -> None:
+        """Update the exposed entities index when an entity is removed or renamed."""
+        assert self._exposed_entity_ids is not None
+        entity_id = str(event.data[ATTR_ENTITY_ID])
+
+        self._forget_entity(entity_id)
+        if "old_entity_id" in event.data:
+            self._forget_entity(event.data["old_entity_id"])
+
+        match event.data["action"]:
+            case "remove" if self._hass.states.get(entity_id) is None:
+                self._exposed_entity_ids.pop(entity_id, None)
+            case "update" if "old_entity_id" in event.data:
+                self._exposed_entity_ids.pop(event.data["old_entity_id"], None)
+                if self._hass.states.get(entity_id) is not None and self._is_exposed_entity(entity_id):
+                    self._exposed_entity_ids[entity_id] = None
+
+        return None
+
+    @callback
+    def _forget_entity(self, entity_id: str) -> None:
+        """Drop cached descriptions, support plans and last reported states of the entity."""
+        if self.description_cache is not None:
+            self.description_cache.invalidate(entity_id)
+
+        if self.support_plans is not None:
+            self.support_plans.pop(entity_id, None)
+
+        if self._notifier_pipeline is not None:
+            self._notifier_pipeline.async_forget_device(entity_id)
+
+        return None
+
     async def _async_setup_notifiers(self, *_: Any) -> None:
         """Set up notifiers."""
         if not self.entry.data.get(const.CONF_DEVICES_DISCOVERED) or not self._notifier_configs:
             return
 
-        track_templates = self._get_trackable_states()
         for config in self._notifier_configs:
             match self.connection_type:
                 case ConnectionType.CLOUD:
-                    self._notifiers.append(YandexCloudNotifier(self._hass, self, config, track_templates))
+                    self._notifiers.append(YandexCloudNotifier(self._hass, self, config))
                 case ConnectionType.DIRECT:
-                    self._notifiers.append(YandexDirectNotifier(self._hass, self, config, track_templates))
+                    self._notifiers.append(YandexDirectNotifier(self._hass, self, config))
 
         await asyncio.wait([asyncio.create_task(n.async_setup()) for n in self._notifiers])
 
+        self._notifier_pipeline = NotifierPipeline(self._hass, self, self._notifiers, self._get_trackable_states())
+        await self._notifier_pipeline.async_setup()
+
         return None
 
     async def _async_setup_cloud_connection(self) -> None:
@@ -189,7 +357,13 @@ class ConfigEntryData:
 
         match self.connection_type:
             case ConnectionType.CLOUD:
-                configs.append(NotifierConfig(user_id=self.cloud_instance_id, token=self.cloud_connection_token))
+                configs.append(
+                    NotifierConfig(
+                        user_id=self.cloud_instance_id,
+                        token=self.cloud_connection_token,
+                        report_interval=self.report_interval,
+                    )
+                )
             case ConnectionType.DIRECT:
                 items = self._yaml_config.get(const.CONF_NOTIFIER, [])
                 for item in items:
@@ -200,6 +374,7 @@ class ConfigEntryData:
                             token=item[const.CONF_NOTIFIER_OAUTH_TOKEN],
                             skill_id=item[const.CONF_NOTIFIER_SKILL_ID],
                             verbose_log=len(items) > 1,
+                            report_interval=item.get(const.CONF_REPORT_INTERVAL, self.report_interval),
                         )
                     )
 
@@ -255,3 +430,9 @@ class ConfigEntryData:
                     _LOGGER.debug(f"Failed to track custom property: {e}")
 
         return templates
+
+
+@callback
+def _state_added_or_removed_filter(event: Event) -> bool:
+    """Test if the state change event is about adding or removing an entity."""
+    return event.data.get("old_state") is None or event.data.get("new_state") is None
@@ -1,4 +1,5 @@
 """The Yandex Smart Home request handlers."""
+import asyncio
 import logging
 from typing import Any, Callable, Coroutine
 
@@ -11,11 +12,12 @@ from .const import ATTR_CAPABILITY, ATTR_ERROR_CODE, EVENT_DEVICE_ACTION
 from .device import Device
 from .helpers import ActionNotAllowed, APIError, RequestData
 from .schema import (
-    ActionRequest,
     ActionResult,
     ActionResultCapability,
     ActionResultCapabilityState,
     ActionResultDevice,
+    CapabilityInstanceAction,
+    CapabilityInstanceActionResultValue,
     DeviceDescription,
     DeviceList,
     DeviceState,
@@ -25,8 +27,9 @@ from .schema import (
     Response,
     ResponseCode,
     ResponsePayload,
-    StatesRequest,
     SuccessActionResult,
+    parse_action_request,
+    parse_states_request,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -40,6 +43,7 @@ HANDLERS: Registry[
 ] = Registry()
 
 PING_REQUEST_USER_ID = "ping"
+EXECUTOR_SERIALIZATION_THRESHOLD = 100
 
 
 async def async_handle_request(hass: HomeAssistant, data: RequestData, action: str, payload: str) -> Response:
@@ -61,6 +65,44 @@ async def async_handle_request(hass: HomeAssistant, data: RequestData, action: s
         return Response(request_id=data.request_id, payload=Error(error_code=ResponseCode.INTERNAL_ERROR))
 
 
+async def async_serialize_response(hass: HomeAssistant, response: Response) -> str:
+    """Serialize a response, responses with many devices left to serialize are serialized in the executor.
+
+    Compression of the cloud responses stays on the event loop, aiohttp can't send a frame compressed elsewhere.
+    With debug logging the event loop lag is measured by a callback scheduled before the serialization.
+    """
+    loop = hass.loop
+    devices = _get_unserialized_devices(response.payload)
+    lag_probe: asyncio.Future[float] | None = None
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        lag_probe = probe = loop.create_future()
+        loop.call_soon(lambda: probe.set_result(loop.time()))
+
+    started_at = loop.time()
+    if devices >= EXECUTOR_SERIALIZATION_THRESHOLD:
+        result = await hass.async_add_executor_job(response.as_json)
+    else:
+        result = response.as_json()
+
+    if lag_probe is not None:
+        duration = loop.time() - started_at
+        lag = await lag_probe - started_at
+        _LOGGER.debug(
+            f"Response serialized in {duration * 1000:.1f} ms "
+            f"(devices to serialize: {devices}, event loop lag: {lag * 1000:.1f} ms)"
+        )
+
+    return result
+
+
+def _get_unserialized_devices(payload: ResponsePayload | None) -> int:
+    """Return number of devices in the payload which JSON representation is not cached."""
+    if isinstance(payload, DeviceList):
+        return payload.unserialized_devices
+
+    return len(getattr(payload, "devices", None) or [])
+
+
 @HANDLERS.register("/user/devices")
 async def async_device_list(hass: HomeAssistant, data: RequestData, _payload: str) -> DeviceList:
     """Handle request that return information about supported user devices.
@@ -72,7 +114,7 @@ async def async_device_list(hass: HomeAssistant, data: RequestData, _payload: st
     dev_reg = device_registry.async_get(hass)
     area_reg = area_registry.async_get(hass)
 
-    for state in hass.states.async_all():
+    for state in data.entry_data.get_exposed_states():
         device = Device(hass, data.entry_data, state.entity_id, state)
         if not device.should_expose:
             continue
@@ -95,10 +137,9 @@ async def async_devices_query(hass: HomeAssistant, data: RequestData, payload: s
 
     https://yandex.ru/dev/dialogs/smart-home/doc/reference/post-devices-query.html
     """
-    request = StatesRequest.parse_raw(payload)
     states: list[DeviceState] = []
 
-    for device_id in [rd.id for rd in request.devices]:
+    for device_id in [rd.id for rd in parse_states_request(payload)]:
         device = Device(hass, data.entry_data, device_id, hass.states.get(device_id))
         if not device.should_expose:
             _LOGGER.warning(
@@ -117,70 +158,244 @@ async def async_devices_action(hass: HomeAssistant, data: RequestData, payload:
 
     https://yandex.ru/dev/dialogs/smart-home/doc/reference/post-action.html
     """
-    request = ActionRequest.parse_raw(payload)
-    results: list[ActionResultDevice] = []
+    request_devices = parse_action_request(payload)
+    semaphore = asyncio.Semaphore(data.entry_data.action_concurrency)
+    results: dict[int, ActionResultDevice] = {}
+
+    async def _async_execute(index: int, device_id: str, actions: list[CapabilityInstanceAction]) -> None:
+        async with semaphore:
+            results[index] = await _async_device_action(hass, data, device_id, actions)
+
+    async def _async_execute_batch(
+        service_call: tuple[str, str], members: list[tuple[int, Device, CapabilityInstanceAction]]
+    ) -> None:
+        batch_results = await _async_batch_action(hass, data, semaphore, service_call, [(d, a) for _, d, a in members])
+
+        for (index, _, _), result in zip(members, batch_results):
+            results[index] = result
+
+    executors: list[Coroutine[Any, Any, None]] = []
+    batches: dict[tuple[str, str], list[tuple[int, Device, CapabilityInstanceAction]]] = {}
+    for index, rd in enumerate(request_devices):
+        device = Device(hass, data.entry_data, rd.id, hass.states.get(rd.id))
+        if len(rd.capabilities) == 1 and (service_call := _get_batch_service_call(device, rd.capabilities[0])):
+            batches.setdefault(service_call, []).append((index, device, rd.capabilities[0]))
+        else:
+            executors.append(_async_execute(index, rd.id, rd.capabilities))
 
-    for device_id, actions in [(rd.id, rd.capabilities) for rd in request.payload.devices]:
-        device = Device(hass, data.entry_data, device_id, hass.states.get(device_id))
+    for service_call, members in batches.items():
+        if len(members) == 1:
+            index, device, action = members[0]
+            executors.append(_async_execute(index, device.id, [action]))
+        else:
+            executors.append(_async_execute_batch(service_call, members))
 
-        if device.unavailable:
-            hass.bus.async_fire(
-                EVENT_DEVICE_ACTION,
-                {ATTR_ENTITY_ID: device_id, ATTR_ERROR_CODE: ResponseCode.DEVICE_UNREACHABLE.value},
-                context=data.context,
-            )
+    await asyncio.gather(*executors)
 
-            results.append(
-                ActionResultDevice(
-                    id=device_id, action_result=FailedActionResult(error_code=ResponseCode.DEVICE_UNREACHABLE)
-                )
-            )
-            continue
+    return ActionResult(devices=[results[index] for index in range(len(request_devices))])
 
-        capability_results: list[ActionResultCapability] = []
-        for action in actions:
-            try:
-                value = await device.execute(data.context, action)
-                hass.bus.async_fire(
-                    EVENT_DEVICE_ACTION,
-                    {ATTR_ENTITY_ID: device_id, ATTR_CAPABILITY: action.as_dict()},
-                    context=data.context,
-                )
-            except (APIError, ActionNotAllowed) as err:
-                if isinstance(err, APIError):
-                    _LOGGER.error(f"{err.message} ({err.code.value})")
-
-                hass.bus.async_fire(
-                    EVENT_DEVICE_ACTION,
-                    {ATTR_ENTITY_ID: device_id, ATTR_CAPABILITY: action.as_dict(), ATTR_ERROR_CODE: err.code.value},
-                    context=data.context,
-                )
 
+def _get_batch_service_call(device: Device, action: CapabilityInstanceAction) -> tuple[str, str] | None:
+    """Return a service call that can change the device state together with other devices."""
+    if device.unavailable:
+        return None
+
+    try:
+        return device.get_action_capability(action).get_batch_service_call(action.state)
+    except (APIError, ActionNotAllowed):
+        return None
+
+
+async def _async_batch_action(
+    hass: HomeAssistant,
+    data: RequestData,
+    semaphore: asyncio.Semaphore,
+    service_call: tuple[str, str],
+    members: list[tuple[Device, CapabilityInstanceAction]],
+) -> list[ActionResultDevice]:
+    """Change state of several devices with one service call, respond before the deadline of the devices."""
+    deadlines = [d for d in (data.entry_data.get_action_deadline(device.id) for device, _ in members) if d is not None]
+    if not deadlines:
+        return await _async_batch_service_call(hass, data, semaphore, service_call, members)
+
+    task = hass.async_create_task(_async_batch_service_call(hass, data, semaphore, service_call, members))
+    if (await asyncio.wait([task], timeout=min(deadlines)))[0]:
+        return task.result()
+
+    _LOGGER.debug(f"Deadline reached while changing state of {', '.join(device.id for device, _ in members)}")
+    return [
+        ActionResultDevice(id=device.id, capabilities=[_accepted_capability_action(action)])
+        for device, action in members
+    ]
+
+
+async def _async_batch_service_call(
+    hass: HomeAssistant,
+    data: RequestData,
+    semaphore: asyncio.Semaphore,
+    service_call: tuple[str, str],
+    members: list[tuple[Device, CapabilityInstanceAction]],
+) -> list[ActionResultDevice]:
+    """Call a service for several devices at once, on failure the devices are retried in parallel."""
+    domain, service = service_call
+    entity_ids = [device.id for device, _ in members]
+
+    async def _async_retry(device: Device, action: CapabilityInstanceAction) -> ActionResultDevice:
+        async with semaphore:
+            return await _async_device_action(hass, data, device.id, [action])
+
+    try:
+        async with semaphore, asyncio.timeout(data.entry_data.action_timeout):
+            await hass.services.async_call(
+                domain, service, {ATTR_ENTITY_ID: entity_ids}, blocking=True, context=data.context
+            )
+    except TimeoutError:
+        _LOGGER.error(f"Timeout while changing state of {', '.join(entity_ids)}")
+
+        return [
+            ActionResultDevice(
+                id=device.id,
+                capabilities=[
+                    _failed_capability_action(hass, data, device.id, action, ResponseCode.DEVICE_UNREACHABLE)
+                ],
+            )
+            for device, action in members
+        ]
+    except Exception as e:
+        _LOGGER.warning(f"Failed to call {domain}.{service} for {', '.join(entity_ids)}, retrying each device: {e!r}")
+
+        return list(await asyncio.gather(*(_async_retry(device, action) for device, action in members)))
+
+    return [
+        ActionResultDevice(id=device.id, capabilities=[_succeeded_capability_action(hass, data, device.id, action)])
+        for device, action in members
+    ]
+
+
+async def _async_device_action(
+    hass: HomeAssistant, data: RequestData, device_id: str, actions: list[CapabilityInstanceAction]
+) -> ActionResultDevice:
+    """Change state of capabilities of the device one by one."""
+    device = Device(hass, data.entry_data, device_id, hass.states.get(device_id))
+
+    if device.unavailable:
+        hass.bus.async_fire(
+            EVENT_DEVICE_ACTION,
+            {ATTR_ENTITY_ID: device_id, ATTR_ERROR_CODE: ResponseCode.DEVICE_UNREACHABLE.value},
+            context=data.context,
+        )
+
+        return ActionResultDevice(
+            id=device_id, action_result=FailedActionResult(error_code=ResponseCode.DEVICE_UNREACHABLE)
+        )
+
+    capability_results: list[ActionResultCapability] = []
+    deadline_reached = False
+
+    async def _async_execute() -> None:
+        try:
+            async with asyncio.timeout(data.entry_data.action_timeout):
+                for action in actions:
+                    if deadline_reached:
+                        break
+
+                    capability_results.append(await _async_capability_action(hass, data, device, action))
+        except TimeoutError:
+            _LOGGER.error(f"Timeout while changing state of {device_id}")
+
+            unfinished_actions = actions[len(capability_results) :]
+            if deadline_reached:
+                unfinished_actions = unfinished_actions[:1]
+
+            for action in unfinished_actions:
                 capability_results.append(
-                    ActionResultCapability(
-                        type=action.type,
-                        state=ActionResultCapabilityState(
-                            instance=action.state.instance,
-                            action_result=FailedActionResult(error_code=ResponseCode(err.code)),
-                        ),
-                    )
+                    _failed_capability_action(hass, data, device_id, action, ResponseCode.DEVICE_UNREACHABLE)
                 )
-                continue
-
-            capability_results.append(
-                ActionResultCapability(
-                    type=action.type,
-                    state=ActionResultCapabilityState(
-                        instance=action.state.instance,
-                        value=value,
-                        action_result=SuccessActionResult(),
-                    ),
-                )
-            )
 
-        results.append(ActionResultDevice(id=device_id, capabilities=capability_results))
+    if (deadline := data.entry_data.get_action_deadline(device_id)) is None:
+        await _async_execute()
+        return ActionResultDevice(id=device_id, capabilities=capability_results)
+
+    task = hass.async_create_task(_async_execute())
+    if (await asyncio.wait([task], timeout=deadline))[0]:
+        return ActionResultDevice(id=device_id, capabilities=capability_results)
+
+    # the current action continues in background, the rest is not started
+    _LOGGER.debug(f"Deadline reached while changing state of {device_id}")
+    deadline_reached = True
 
-    return ActionResult(devices=results)
+    results = capability_results.copy()
+    results.append(_accepted_capability_action(actions[len(results)]))
+    for action in actions[len(results) :]:
+        results.append(_failed_capability_action(hass, data, device_id, action, ResponseCode.DEVICE_BUSY))
+
+    return ActionResultDevice(id=device_id, capabilities=results)
+
+
+async def _async_capability_action(
+    hass: HomeAssistant, data: RequestData, device: Device, action: CapabilityInstanceAction
+) -> ActionResultCapability:
+    """Change state of a capability of the device."""
+    try:
+        value = await device.execute(data.context, action)
+    except (APIError, ActionNotAllowed) as err:
+        if isinstance(err, APIError):
+            _LOGGER.error(f"{err.message} ({err.code.value})")
+
+        return _failed_capability_action(hass, data, device.id, action, ResponseCode(err.code))
+
+    return _succeeded_capability_action(hass, data, device.id, action, value)
+
+
+def _succeeded_capability_action(
+    hass: HomeAssistant,
+    data: RequestData,
+    device_id: str,
+    action: CapabilityInstanceAction,
+    value: CapabilityInstanceActionResultValue | None = None,
+) -> ActionResultCapability:
+    """Return result of a succeeded capability state change."""
+    hass.bus.async_fire(
+        EVENT_DEVICE_ACTION,
+        {ATTR_ENTITY_ID: device_id, ATTR_CAPABILITY: action.as_dict()},
+        context=data.context,
+    )
+
+    return ActionResultCapability(
+        type=action.type,
+        state=ActionResultCapabilityState(
+            instance=action.state.instance,
+            value=value,
+            action_result=SuccessActionResult(),
+        ),
+    )
+
+
+def _accepted_capability_action(action: CapabilityInstanceAction) -> ActionResultCapability:
+    """Return result of a capability state change that has not been finished yet."""
+    return ActionResultCapability(
+        type=action.type,
+        state=ActionResultCapabilityState(instance=action.state.instance, action_result=SuccessActionResult()),
+    )
+
+
+def _failed_capability_action(
+    hass: HomeAssistant, data: RequestData, device_id: str, action: CapabilityInstanceAction, code: ResponseCode
+) -> ActionResultCapability:
+    """Return result of a failed capability state change."""
+    hass.bus.async_fire(
+        EVENT_DEVICE_ACTION,
+        {ATTR_ENTITY_ID: device_id, ATTR_CAPABILITY: action.as_dict(), ATTR_ERROR_CODE: code.value},
+        context=data.context,
+    )
+
+    return ActionResultCapability(
+        type=action.type,
+        state=ActionResultCapabilityState(
+            instance=action.state.instance,
+            action_result=FailedActionResult(error_code=code),
+        ),
+    )
 
 
 @HANDLERS.register("/user/unlink")
@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Protocol, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping, Protocol, TypeVar
 
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.storage import Store
+from homeassistant.util.read_only_dict import ReadOnlyDict
 
 from .const import DOMAIN
 from .schema import ResponseCode
@@ -83,6 +84,72 @@ class CacheStore:
         return None
 
 
+class StateAttributesRecorder(ReadOnlyDict[str, Any]):
+    """State attributes that remember which of them were read."""
+
+    def __init__(self, attributes: Mapping[str, Any]):
+        """Initialize."""
+        if isinstance(attributes, StateAttributesRecorder):
+            # copy attributes of another recorder without marking them as read there
+            super().__init__(dict.items(attributes))
+        else:
+            super().__init__(attributes)
+
+        self.read_keys: set[str] | None = set()
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the attribute value and remember the key."""
+        self._remember(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        """Test if the attribute exists and remember the key."""
+        self._remember(key)
+        return super().__contains__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the attribute value and remember the key."""
+        self._remember(key)
+        return super().get(key, default)
+
+    def __iter__(self) -> Any:
+        """Iterate over all attributes."""
+        self.read_keys = None
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        """Return number of attributes."""
+        self.read_keys = None
+        return super().__len__()
+
+    def keys(self) -> Any:
+        """Return all attribute keys."""
+        self.read_keys = None
+        return super().keys()
+
+    def values(self) -> Any:
+        """Return all attribute values."""
+        self.read_keys = None
+        return super().values()
+
+    def items(self) -> Any:
+        """Return all attributes."""
+        self.read_keys = None
+        return super().items()
+
+    def copy(self) -> dict[str, Any]:
+        """Return copy of all attributes."""
+        self.read_keys = None
+        return super().copy()
+
+    def _remember(self, key: object) -> None:
+        """Remember the attribute key as read."""
+        if self.read_keys is not None and isinstance(key, str):
+            self.read_keys.add(key)
+
+        return None
+
+
 @dataclass
 class RequestData:
     """Hold data associated with a particular request."""
@@ -121,3 +188,37 @@ class ListRegistry(list[_TypeT]):
         """Register decorated type."""
         self.append(obj)
         return obj
+
+
+class DomainListRegistry(ListRegistry[_TypeT]):
+    """List Registry of items applicable to specific domains.
+
+    Types registered without domains are applicable to any domain.
+    """
+
+    def __init__(self, items: Iterable[_TypeT] = ()):
+        """Initialize the registry."""
+        super().__init__(items)
+        self._domains: dict[_TypeT, tuple[str, ...]] = {}
+        self._domain_index: dict[str, list[_TypeT]] = {}
+
+    def register(self, obj: _TypeT) -> _TypeT:
+        """Register decorated type applicable to any domain."""
+        self._domain_index.clear()
+        return super().register(obj)
+
+    def register_for(self, *domains: str) -> Callable[[_TypeT], _TypeT]:
+        """Register decorated type applicable to the domains."""
+
+        def decorator(obj: _TypeT) -> _TypeT:
+            self._domains[obj] = domains
+            return self.register(obj)
+
+        return decorator
+
+    def for_domain(self, domain: str) -> list[_TypeT]:
+        """Return types applicable to the domain in order of registration."""
+        if (items := self._domain_index.get(domain)) is None:
+            items = self._domain_index[domain] = [obj for obj in self if domain in self._domains.get(obj, (domain,))]
+
+        return items
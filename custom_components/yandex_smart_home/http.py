@@ -116,7 +116,7 @@ class YandexSmartHomeAPIView(YandexSmartHomeView):
         result = await handlers.async_handle_request(
             hass, data, action=request.path.replace(self.url, "", 1), payload=await request.text()
         )
-        response = json_response(text=result.as_json())
+        response = json_response(text=await handlers.async_serialize_response(hass, result))
         _LOGGER.debug(f"Response: {response.text}")
 
         return response
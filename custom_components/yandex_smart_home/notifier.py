@@ -3,25 +3,32 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 import asyncio
-from contextlib import suppress
+from collections import deque
 from dataclasses import dataclass
-import itertools
+from datetime import timedelta
 import logging
-from typing import TYPE_CHECKING, Any, Mapping, Protocol, Self, Sequence
+import random
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping, Protocol, Self, Sequence
 
 from aiohttp import JsonPayload, hdrs
 from aiohttp.client_exceptions import ClientConnectionError
 from homeassistant.const import ATTR_ENTITY_ID, EVENT_STATE_CHANGED
-from homeassistant.core import HassJob
-from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE, async_create_clientsession
-from homeassistant.helpers.event import TrackTemplate, async_call_later, async_track_template_result
-from homeassistant.helpers.template import Template
+from homeassistant.core import HassJob, State, callback
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE, async_get_clientsession
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    async_call_later,
+    async_track_template_result,
+    async_track_time_interval,
+)
+from homeassistant.helpers.typing import UNDEFINED
 from pydantic import ValidationError
 
 from . import DOMAIN, const
 from .capability import Capability
 from .device import Device
-from .helpers import APIError
+from .helpers import APIError, StateAttributesRecorder
 from .property import Property
 from .schema import (
     CallbackDiscoveryRequest,
@@ -36,8 +43,9 @@ from .schema import (
 )
 
 if TYPE_CHECKING:
-    from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State
+    from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
     from homeassistant.helpers.event import EventStateChangedData, TrackTemplateResult, TrackTemplateResultInfo
+    from homeassistant.helpers.template import Template
     from homeassistant.helpers.typing import EventType
 
     from .entry_data import ConfigEntryData
@@ -47,6 +55,15 @@ _LOGGER = logging.getLogger(__name__)
 INITIAL_REPORT_DELAY = 15
 DISCOVERY_REQUEST_DELAY = 5
 REPORT_STATE_WINDOW = 1
+REPORT_STATE_MAX_INTERVAL = 60
+REPORT_STATE_HEARTBEAT = 300
+REPORT_STATE_MAX_DEVICES = 50
+REPORT_STATE_MAX_SIZE = 64 * 1024
+REPORT_STATE_MAX_REQUESTS = 2
+REPORT_STATE_QUEUE_SIZE = 10
+REPORT_STATE_RETRY_DELAY = 5
+REPORT_STATE_RETRY_MAX_DELAY = 300
+STATS_LOG_INTERVAL = timedelta(minutes=10)
 
 
 @dataclass
@@ -58,6 +75,7 @@ class NotifierConfig:
     hass_user_id: str | None = None
     skill_id: str | None = None
     verbose_log: bool = False
+    report_interval: float | None = None
 
     async def async_validate(self, hass: HomeAssistant) -> None:
         """Validates the configuration."""
@@ -68,11 +86,58 @@ class NotifierConfig:
         return None
 
 
+@dataclass
+class NotifierStats:
+    """Hold counters of a notifier."""
+
+    send_queue_depth: int = 0
+    send_queue_max_depth: int = 0
+    requests_sent: int = 0
+    requests_failed: int = 0
+    request_time_last: float = 0
+    request_time_max: float = 0
+    request_time_total: float = 0
+
+    @property
+    def request_time_avg(self) -> float:
+        """Return average time of sending a request."""
+        if not self.requests_sent:
+            return 0
+
+        return self.request_time_total / self.requests_sent
+
+    def track_request(self, request_time: float) -> None:
+        """Count a sent request."""
+        self.requests_sent += 1
+        self.request_time_last = request_time
+        self.request_time_max = max(request_time, self.request_time_max)
+        self.request_time_total += request_time
+        return None
+
+
+@dataclass
+class NotifierPipelineStats:
+    """Hold counters of a notifier pipeline."""
+
+    state_changes: int = 0
+    state_changes_skipped: int = 0
+
+
 class ReportableDeviceState(Protocol):
     """Protocol type for device capabilities and properties."""
 
     device_id: str
 
+    @property
+    def type(self) -> str:
+        """Return type of the capability or property."""
+        ...
+
+    @property
+    def instance(self) -> str:
+        """Return instance of the capability or property."""
+        ...
+
     @property
     @abstractmethod
     def time_sensitive(self) -> bool:
@@ -95,12 +160,91 @@ class ReportableDeviceState(Protocol):
         ...
 
 
+def _state_key(state: ReportableDeviceState) -> tuple[str, str, str]:
+    """Return key that identifies the state in pending states."""
+    return state.device_id, state.type, state.instance
+
+
+def _get_value_or_none(state: ReportableDeviceState) -> Any:
+    """Return the state value or None if the value is not supported."""
+    try:
+        return state.get_value()
+    except APIError:
+        return None
+
+
+def _get_changed_states(
+    new_states: Sequence[ReportableDeviceState],
+    old_states: Sequence[ReportableDeviceState],
+) -> list[ReportableDeviceState]:
+    """Return new states which values are changed compared to the old states."""
+    changed_states: list[ReportableDeviceState] = []
+    indexed_old_states = {_state_key(s): s for s in old_states}
+
+    for state in new_states:
+        try:
+            if state.check_value_change(indexed_old_states.get(_state_key(state))):
+                changed_states.append(state)
+        except APIError as e:
+            _LOGGER.warning(e)
+
+    return changed_states
+
+
+def _split_device_states(
+    states: Sequence[DeviceState],
+    max_devices: int = REPORT_STATE_MAX_DEVICES,
+    max_size: int = REPORT_STATE_MAX_SIZE,
+) -> list[list[DeviceState]]:
+    """Split device states to chunks limited by number of devices and size of their JSON representation."""
+    chunks: list[list[DeviceState]] = []
+    chunk: list[DeviceState] = []
+    chunk_size = 0
+
+    for state in states:
+        size = len(state.as_json().encode("utf-8"))
+        if chunk and (len(chunk) >= max_devices or chunk_size + size > max_size):
+            chunks.append(chunk)
+            chunk, chunk_size = [], 0
+
+        chunk.append(state)
+        chunk_size += size
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def _merge_device_states(states: Sequence[DeviceState], other: Sequence[DeviceState]) -> list[DeviceState]:
+    """Return device states with added instance states from other device states."""
+    merged = {state.id: state for state in states}
+    for state in other:
+        if (device_state := merged.get(state.id)) is None:
+            merged[state.id] = state
+            continue
+
+        merged[state.id] = DeviceState(
+            id=state.id,
+            capabilities=[*(device_state.capabilities or []), *(state.capabilities or [])] or None,
+            properties=[*(device_state.properties or []), *(state.properties or [])] or None,
+        )
+
+    return list(merged.values())
+
+
+def _get_retry_delay(attempt: int) -> float:
+    """Return delay before retry of failed requests (exponential backoff with jitter)."""
+    delay: float = min(REPORT_STATE_RETRY_DELAY * 2 ** min(attempt, 10), REPORT_STATE_RETRY_MAX_DELAY)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
 class ReportableTemplateDeviceState(ReportableDeviceState, Protocol):
     """Protocol type for custom properties and capabilities."""
 
     @abstractmethod
-    def new_with_value_template(self, value_template: Template) -> Self:
-        """Return copy of the state with new value template."""
+    def new_with_template_result(self, result: Any) -> Self:
+        """Return copy of the state with the value replaced by a rendered result of the value template."""
         ...
 
 
@@ -109,42 +253,66 @@ class PendingStates:
 
     def __init__(self) -> None:
         """Initialize."""
-        self._device_states: dict[str, list[ReportableDeviceState]] = {}
-        self._lock = asyncio.Lock()
+        self._device_states: dict[str, dict[tuple[str, str, str], ReportableDeviceState]] = {}
+        self._time_sensitive_count = 0
 
-    async def async_add(
+    @callback
+    def async_add(
         self,
         new_states: Sequence[ReportableDeviceState],
         old_states: Sequence[ReportableDeviceState],
     ) -> list[ReportableDeviceState]:
         """Add changed states to pending and return list of them."""
-        scheduled_states: list[ReportableDeviceState] = []
+        scheduled_states = _get_changed_states(new_states, old_states)
+        self.async_extend(scheduled_states)
+        return scheduled_states
 
-        async with self._lock:
-            for state in new_states:
-                try:
-                    old_state = old_states[old_states.index(state)]
-                except ValueError:
-                    old_state = None
-                try:
-                    if state.check_value_change(old_state):
-                        device_states = self._device_states.setdefault(state.device_id, [])
-                        with suppress(ValueError):
-                            device_states.remove(state)
+    @callback
+    def async_extend(self, states: Sequence[ReportableDeviceState]) -> None:
+        """Add states which are known to be changed to pending."""
+        for state in states:
+            key = _state_key(state)
+            device_states = self._device_states.setdefault(state.device_id, {})
+            if (replaced_state := device_states.pop(key, None)) is not None:
+                self._time_sensitive_count -= replaced_state.time_sensitive
 
-                        device_states.append(state)
-                        scheduled_states.append(state)
-                except APIError as e:
-                    _LOGGER.warning(e)
+            device_states[key] = state
+            self._time_sensitive_count += state.time_sensitive
 
-        return scheduled_states
+        return None
 
-    async def async_get_all(self) -> dict[str, list[ReportableDeviceState]]:
+    @callback
+    def async_get_all(self) -> dict[str, list[ReportableDeviceState]]:
         """Return all states and clear pending."""
-        async with self._lock:
-            states = self._device_states.copy()
-            self._device_states.clear()
-            return states
+        states = {device_id: list(device_states.values()) for device_id, device_states in self._device_states.items()}
+        self._device_states.clear()
+        self._time_sensitive_count = 0
+        return states
+
+    @callback
+    def async_get(self, should_report: Callable[[str], bool]) -> dict[str, list[ReportableDeviceState]]:
+        """Return and clear states of devices that should be reported and all time sensitive states."""
+        states: dict[str, list[ReportableDeviceState]] = {}
+
+        for device_id, device_states in list(self._device_states.items()):
+            if should_report(device_id):
+                states[device_id] = list(device_states.values())
+                self._time_sensitive_count -= sum(s.time_sensitive for s in device_states.values())
+                del self._device_states[device_id]
+            elif self._time_sensitive_count:
+                keys = [key for key, state in device_states.items() if state.time_sensitive]
+                if keys:
+                    states[device_id] = [device_states.pop(key) for key in keys]
+                    self._time_sensitive_count -= len(keys)
+                    if not device_states:
+                        del self._device_states[device_id]
+
+        return states
+
+    @property
+    def device_ids(self) -> Iterable[str]:
+        """Return devices with pending states."""
+        return self._device_states.keys()
 
     @property
     def empty(self) -> bool:
@@ -154,11 +322,108 @@ class PendingStates:
     @property
     def time_sensitive(self) -> bool:
         """Test if pending states should be sent immediately."""
-        for state in itertools.chain(*self._device_states.values()):
-            if state.time_sensitive:
-                return True
+        return self._time_sensitive_count > 0
 
-        return False
+
+def _get_instance_states(state: DeviceState) -> list[CapabilityInstanceState | PropertyInstanceState]:
+    """Return states of capabilities and properties of the device state."""
+    instance_states: list[CapabilityInstanceState | PropertyInstanceState] = []
+    instance_states.extend(state.capabilities or [])
+    instance_states.extend(state.properties or [])
+    return instance_states
+
+
+class StatesSpool:
+    """Hold the latest states of device instances from failed callback requests."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._device_states: dict[str, dict[tuple[str, str], CapabilityInstanceState | PropertyInstanceState]] = {}
+
+    def add(self, states: Iterable[DeviceState]) -> None:
+        """Add device states, previous states of same instances are replaced."""
+        for state in states:
+            device_states = self._device_states.setdefault(state.id, {})
+            for instance_state in _get_instance_states(state):
+                device_states[(instance_state.type, instance_state.state.instance)] = instance_state
+
+        return None
+
+    def discard(self, states: Iterable[DeviceState]) -> None:
+        """Remove states of instances that are superseded by the device states."""
+        for state in states:
+            if (device_states := self._device_states.get(state.id)) is None:
+                continue
+
+            for instance_state in _get_instance_states(state):
+                device_states.pop((instance_state.type, instance_state.state.instance), None)
+
+            if not device_states:
+                del self._device_states[state.id]
+
+        return None
+
+    def pop_all(self) -> list[DeviceState]:
+        """Return all device states and clear the spool."""
+        states: list[DeviceState] = []
+        for device_id, device_states in self._device_states.items():
+            capabilities = [s for s in device_states.values() if isinstance(s, CapabilityInstanceState)]
+            properties = [s for s in device_states.values() if isinstance(s, PropertyInstanceState)]
+            states.append(DeviceState(id=device_id, capabilities=capabilities or None, properties=properties or None))
+
+        self._device_states.clear()
+        return states
+
+    @property
+    def empty(self) -> bool:
+        """Test if the spool has no states."""
+        return not bool(self._device_states)
+
+
+class DeviceReportRate:
+    """Hold report rate of a device."""
+
+    __slots__ = ("interval", "reported_at")
+
+    def __init__(self, interval: float, reported_at: float):
+        """Initialize."""
+        self.interval = interval
+        self.reported_at = reported_at
+
+
+class ReportRateLimiter:
+    """Limit how often states of a device are reported.
+
+    The interval is doubled for devices that are changed constantly and restored when the device calms down.
+    """
+
+    def __init__(self, max_interval: float = REPORT_STATE_MAX_INTERVAL) -> None:
+        """Initialize."""
+        self._max_interval = max_interval
+        self._rates: dict[str, DeviceReportRate] = {}
+
+    def get_delay(self, device_id: str, now: float) -> float:
+        """Return time in seconds until states of the device can be reported."""
+        if (rate := self._rates.get(device_id)) is None:
+            return 0
+
+        return max(rate.reported_at + rate.interval - now, 0)
+
+    def reported(self, device_id: str, now: float, min_interval: float) -> None:
+        """Remember that states of the device were reported."""
+        rate = self._rates.get(device_id)
+        if rate is None or now - rate.reported_at > rate.interval * 2:
+            self._rates[device_id] = DeviceReportRate(min_interval, now)
+        else:
+            rate.interval = min(rate.interval * 2, max(self._max_interval, min_interval))
+            rate.reported_at = now
+
+        return None
+
+    def forget(self, device_id: str) -> None:
+        """Forget report rate of the device."""
+        self._rates.pop(device_id, None)
+        return None
 
 
 class YandexNotifier(ABC):
@@ -169,72 +434,92 @@ class YandexNotifier(ABC):
         hass: HomeAssistant,
         entry_data: ConfigEntryData,
         config: NotifierConfig,
-        track_templates: Mapping[Template, Sequence[ReportableTemplateDeviceState]],
     ):
         """Initialize."""
         self._hass = hass
         self._entry_data = entry_data
         self._config = config
-        self._session = async_create_clientsession(hass)
+        self._session = async_get_clientsession(hass)
 
         self._pending = PendingStates()
+        self._rate_limiter = ReportRateLimiter()
+        self._stats = NotifierStats()
         self._report_states_job = HassJob(self._async_report_states)
 
-        self._track_templates = track_templates
-        self._template_changes_tracker: TrackTemplateResultInfo | None = None
-
-        self._unsub_state_changed: CALLBACK_TYPE | None = None
-        self._unsub_initial_report: CALLBACK_TYPE | None = None
+        self._loaded = False
         self._unsub_report_states: CALLBACK_TYPE | None = None
         self._unsub_discovery: CALLBACK_TYPE | None = None
+        self._report_states_at = 0.0
+        self._send_queue: deque[CallbackStatesRequest] = deque()
+        self._send_workers = 0
+        self._spool = StatesSpool()
+        self._retry_attempt = 0
+        self._retry_due = False
+        self._unsub_retry: CALLBACK_TYPE | None = None
 
     async def async_setup(self) -> None:
         """Set up the notifier."""
-        self._unsub_state_changed = self._hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed)
-        self._unsub_initial_report = async_call_later(
-            self._hass, INITIAL_REPORT_DELAY, HassJob(self._async_initial_report)
-        )
+        self._loaded = True
         self._unsub_discovery = async_call_later(
             self._hass, DISCOVERY_REQUEST_DELAY, HassJob(self.async_send_discovery)
         )
 
-        if self._track_templates:
-            self._template_changes_tracker = async_track_template_result(
-                self._hass,
-                [TrackTemplate(t, None) for t in self._track_templates],
-                self._async_template_result_changed,
-            )
-            self._template_changes_tracker.async_refresh()
+        return None
 
+    @property
+    def stats(self) -> NotifierStats:
+        """Return counters of the notifier."""
+        return self._stats
+
+    @callback
+    def async_log_stats(self) -> None:
+        """Log counters of the send queue and requests."""
+        stats = self._stats
+        _LOGGER.debug(
+            self._format_log_message(
+                f"Notifier stats: queue depth {stats.send_queue_depth} (max {stats.send_queue_max_depth}), "
+                f"requests sent {stats.requests_sent}, failed {stats.requests_failed}, "
+                f"request time {stats.request_time_last:.3f}s (avg {stats.request_time_avg:.3f}s, "
+                f"max {stats.request_time_max:.3f}s)"
+            )
+        )
         return None
 
     async def async_unload(self) -> None:
         """Unload the notifier."""
+        self._loaded = False
         for unsub in [
-            self._unsub_state_changed,
-            self._unsub_initial_report,
             self._unsub_report_states,
             self._unsub_discovery,
+            self._unsub_retry,
         ]:
             if unsub:
                 unsub()
 
-        self._unsub_state_changed = None
-        self._unsub_initial_report = None
         self._unsub_report_states = None
         self._unsub_discovery = None
-
-        if self._template_changes_tracker is not None:
-            self._template_changes_tracker.async_remove()
-            self._template_changes_tracker = None
+        self._unsub_retry = None
+        self._send_queue.clear()
 
         return None
 
+    @callback
+    def async_add_states(self, states: Sequence[ReportableDeviceState]) -> None:
+        """Schedule report of changed states."""
+        self._pending.async_extend(states)
+        return self._schedule_report_states()
+
+    @callback
+    def async_forget_device(self, device_id: str) -> None:
+        """Forget the removed device."""
+        return self._rate_limiter.forget(device_id)
+
     async def async_send_discovery(self, *_: Any) -> None:
         """Send notification about change of devices' parameters."""
         _LOGGER.debug(self._format_log_message("Sending discovery request"))
         request = CallbackDiscoveryRequest(payload=CallbackDiscoveryRequestPayload(user_id=self._config.user_id))
-        return await self._async_send_request(f"{self._base_url}/discovery", request)
+        await self._async_send_request(f"{self._base_url}/discovery", request)
+        return None
 
     @property
     @abstractmethod
@@ -254,9 +539,28 @@ class YandexNotifier(ABC):
 
     async def _async_report_states(self, *_: Any) -> None:
         """Send notification about device state change."""
+        if self._send_queue or self._send_workers:
+            # the previous report is still being sent, the workers schedule next one when done
+            self._unsub_report_states = None
+            return None
+
         states: list[DeviceState] = []
+        now = self._hass.loop.time()
+        devices_left = REPORT_STATE_QUEUE_SIZE * REPORT_STATE_MAX_DEVICES
+
+        def _should_report(device_id: str) -> bool:
+            nonlocal devices_left
+            if not devices_left or self._rate_limiter.get_delay(device_id, now) > 0:
+                return False
+
+            devices_left -= 1
+            return True
+
+        pending = self._pending.async_get(_should_report)
+        for device_id, device_states in pending.items():
+            if not all(s.time_sensitive for s in device_states):
+                self._rate_limiter.reported(device_id, now, self._get_report_interval(device_id))
 
-        for device_id, device_states in (await self._pending.async_get_all()).items():
             capabilities: list[CapabilityInstanceState] = []
             properties: list[PropertyInstanceState] = []
 
@@ -283,27 +587,85 @@ class YandexNotifier(ABC):
                     )
                 )
 
+        # fresh values supersede values of the failed requests
+        self._spool.discard(states)
+        if self._retry_due:
+            self._retry_due = False
+            states = _merge_device_states(states, self._spool.pop_all())
+
         if states:
-            request = CallbackStatesRequest(
-                payload=CallbackStatesRequestPayload(user_id=self._config.user_id, devices=states)
-            )
+            requests = [
+                CallbackStatesRequest(payload=CallbackStatesRequestPayload(user_id=self._config.user_id, devices=chunk))
+                for chunk in _split_device_states(states)
+            ]
 
-            asyncio.create_task(self._async_send_request(f"{self._base_url}/state", request))
+            self._enqueue_states_requests(requests)
 
-        if self._pending.empty:
-            self._unsub_report_states = None
-        else:
-            self._unsub_report_states = async_call_later(
-                self._hass,
-                delay=0 if self._pending.time_sensitive else REPORT_STATE_WINDOW,
-                action=self._report_states_job,
-            )
+        self._unsub_report_states = None
+        return self._schedule_report_states()
+
+    def _enqueue_states_requests(self, requests: Sequence[CallbackStatesRequest]) -> None:
+        """Add requests with device states to the send queue and start workers to send them."""
+        self._send_queue.extend(requests)
+        self._stats.send_queue_depth = len(self._send_queue)
+        self._stats.send_queue_max_depth = max(self._stats.send_queue_depth, self._stats.send_queue_max_depth)
+
+        while self._send_workers < min(REPORT_STATE_MAX_REQUESTS, len(self._send_queue)):
+            self._send_workers += 1
+            self._hass.async_create_task(self._async_send_worker())
 
         return None
 
+    async def _async_send_worker(self) -> None:
+        """Send requests from the queue until it is empty."""
+        try:
+            while self._send_queue:
+                request = self._send_queue.popleft()
+                self._stats.send_queue_depth = len(self._send_queue)
+
+                started_at = self._hass.loop.time()
+                if await self._async_send_request(f"{self._base_url}/state", request):
+                    self._retry_attempt = 0
+                else:
+                    self._stats.requests_failed += 1
+                    self._spool.add(request.payload.devices)
+
+                self._stats.track_request(self._hass.loop.time() - started_at)
+        finally:
+            self._send_workers -= 1
+
+        # states changed while sending are merged in pending and sent with the next report
+        if not self._send_workers and self._loaded:
+            self._schedule_retry()
+            self._schedule_report_states()
+
+        return None
+
+    def _schedule_retry(self) -> None:
+        """Schedule retry of failed requests."""
+        if self._spool.empty or self._retry_due or self._unsub_retry:
+            return None
+
+        delay = _get_retry_delay(self._retry_attempt)
+        self._retry_attempt += 1
+
+        _LOGGER.debug(self._format_log_message(f"Retrying failed state reports in {delay:.1f} seconds"))
+        self._unsub_retry = async_call_later(self._hass, delay=delay, action=HassJob(self._async_retry))
+        return None
+
+    @callback
+    def _async_retry(self, *_: Any) -> None:
+        """Report states from failed requests with the next report."""
+        self._unsub_retry = None
+        self._retry_due = True
+        return self._schedule_report_states()
+
     # noinspection PyBroadException
-    async def _async_send_request(self, url: str, request: CallbackRequest) -> None:
-        """Send a request to the url."""
+    async def _async_send_request(self, url: str, request: CallbackRequest) -> bool:
+        """Send a request to the url.
+
+        Return False if the request failed due to a temporary error and may be retried.
+        """
         try:
             _LOGGER.debug(f"Request: {url} (POST data: {request.as_json()})")
 
@@ -324,13 +686,201 @@ class YandexNotifier(ABC):
 
             if r.status != 202 or error_message:
                 _LOGGER.warning(self._format_log_message(f"Notification request failed: {error_message or r.status}"))
+                return r.status < 500 and r.status != 429
         except ClientConnectionError as e:
             _LOGGER.warning(self._format_log_message(f"Notification request failed: {e!r}"))
+            return False
         except asyncio.TimeoutError as e:
             _LOGGER.debug(self._format_log_message(f"Notification request failed: {e!r}"))
+            return False
         except Exception:
             _LOGGER.exception(self._format_log_message("Unexpected exception"))
 
+        return True
+
+    def _schedule_report_states(self) -> None:
+        """Schedule run report states job if there are pending states."""
+        if self._pending.empty and not self._retry_due:
+            return None
+
+        now = self._hass.loop.time()
+        delay: float = 0
+        if not self._pending.empty and not self._pending.time_sensitive:
+            delay = max(
+                REPORT_STATE_WINDOW,
+                min(self._rate_limiter.get_delay(device_id, now) for device_id in self._pending.device_ids),
+            )
+
+        if self._unsub_report_states:
+            if self._report_states_at <= now + delay:
+                return None
+
+            self._unsub_report_states()
+
+        self._report_states_at = now + delay
+        self._unsub_report_states = async_call_later(self._hass, delay=delay, action=self._report_states_job)
+        return None
+
+    def _get_report_interval(self, device_id: str) -> float:
+        """Return minimal time between state reports of the device."""
+        entity_config = self._entry_data.get_entity_config(device_id)
+        if (interval := entity_config.get(const.CONF_REPORT_INTERVAL, self._config.report_interval)) is not None:
+            return float(interval)
+
+        return REPORT_STATE_WINDOW
+
+
+class YandexDirectNotifier(YandexNotifier):
+    """Notifier for direct connection."""
+
+    @property
+    def _base_url(self) -> str:
+        """Return base URL."""
+        return f"https://dialogs.yandex.net/api/v1/skills/{self._config.skill_id}/callback"
+
+    @property
+    def _request_headers(self) -> dict[str, str]:
+        """Return headers for a request."""
+        return {hdrs.AUTHORIZATION: f"OAuth {self._config.token}"}
+
+    def _format_log_message(self, message: str) -> str:
+        """Format a message."""
+        if self._config.verbose_log:
+            return f"{message} ({self._config.user_id }@{self._config.skill_id})"
+
+        return message
+
+
+class YandexCloudNotifier(YandexNotifier):
+    """Notifier for cloud connection."""
+
+    @property
+    def _base_url(self) -> str:
+        """Return base URL."""
+        return f"{const.CLOUD_BASE_URL}/api/home_assistant/v1/callback"
+
+    @property
+    def _request_headers(self) -> dict[str, str]:
+        """Return headers for a request."""
+        return {
+            hdrs.AUTHORIZATION: f"Bearer {self._config.token}",
+            hdrs.USER_AGENT: f"{SERVER_SOFTWARE} {DOMAIN}/{self._entry_data.version}",
+        }
+
+
+class NotifierPipeline:
+    """Detect changes of device states once and pass them to all notifiers of a config entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_data: ConfigEntryData,
+        notifiers: Sequence[YandexNotifier],
+        track_templates: Mapping[Template, Sequence[ReportableTemplateDeviceState]],
+    ):
+        """Initialize."""
+        self._hass = hass
+        self._entry_data = entry_data
+        self._notifiers = notifiers
+
+        self._watched_attributes: dict[str, frozenset[str]] = {}
+        self._last_states: dict[str, dict[tuple[str, str, str], ReportableDeviceState]] = {}
+        self._suppressed_states: dict[str, dict[tuple[str, str, str], ReportableDeviceState]] = {}
+        self._stats = NotifierPipelineStats()
+
+        self._track_templates = track_templates
+        self._template_changes_tracker: TrackTemplateResultInfo | None = None
+
+        self._unsub_state_changed: CALLBACK_TYPE | None = None
+        self._unsub_initial_report: CALLBACK_TYPE | None = None
+        self._unsub_heartbeat: CALLBACK_TYPE | None = None
+        self._unsub_log_stats: CALLBACK_TYPE | None = None
+
+    async def async_setup(self) -> None:
+        """Set up the pipeline."""
+        self._unsub_state_changed = self._hass.bus.async_listen(
+            EVENT_STATE_CHANGED, self._async_state_changed, event_filter=self._state_changed_filter
+        )
+        self._unsub_initial_report = async_call_later(
+            self._hass, INITIAL_REPORT_DELAY, HassJob(self._async_initial_report)
+        )
+        self._unsub_log_stats = async_track_time_interval(self._hass, self._async_log_stats, STATS_LOG_INTERVAL)
+
+        if self._track_templates:
+            self._template_changes_tracker = async_track_template_result(
+                self._hass,
+                [TrackTemplate(t, None) for t in self._track_templates],
+                self._async_template_result_changed,
+            )
+            self._template_changes_tracker.async_refresh()
+
+        return None
+
+    async def async_unload(self) -> None:
+        """Unload the pipeline."""
+        for unsub in [
+            self._unsub_state_changed,
+            self._unsub_initial_report,
+            self._unsub_heartbeat,
+            self._unsub_log_stats,
+        ]:
+            if unsub:
+                unsub()
+
+        self._unsub_state_changed = None
+        self._unsub_initial_report = None
+        self._unsub_heartbeat = None
+        self._unsub_log_stats = None
+
+        if self._template_changes_tracker is not None:
+            self._template_changes_tracker.async_remove()
+            self._template_changes_tracker = None
+
+        return None
+
+    @property
+    def stats(self) -> NotifierPipelineStats:
+        """Return counters of the pipeline."""
+        return self._stats
+
+    @callback
+    def async_forget_device(self, device_id: str) -> None:
+        """Forget the removed device, a new device with the same id reports all its states."""
+        self._watched_attributes.pop(device_id, None)
+        self._last_states.pop(device_id, None)
+        self._suppressed_states.pop(device_id, None)
+        for notifier in self._notifiers:
+            notifier.async_forget_device(device_id)
+
+        return None
+
+    @callback
+    def _async_log_stats(self, *_: Any) -> None:
+        """Log counters of the pipeline and the notifiers."""
+        if not _LOGGER.isEnabledFor(logging.DEBUG):
+            return None
+
+        _LOGGER.debug(
+            f"Notifier pipeline stats: state changes {self._stats.state_changes}, "
+            f"skipped by watched attributes {self._stats.state_changes_skipped}"
+        )
+        for notifier in self._notifiers:
+            notifier.async_log_stats()
+
+        return None
+
+    @callback
+    def _async_add_states(self, states: Sequence[ReportableDeviceState]) -> None:
+        """Pass changed states to the notifiers."""
+        if not states:
+            return None
+
+        for state in states:
+            _LOGGER.debug(f"State report with value '{state.get_value()!s}' scheduled for {state}")
+
+        for notifier in self._notifiers:
+            notifier.async_add_states(states)
+
         return None
 
     async def _async_template_result_changed(
@@ -342,22 +892,40 @@ class YandexNotifier(ABC):
         if event_type is None:  # update during setup
             return None
 
+        changed_states: list[ReportableDeviceState] = []
+
         for result in updates:
-            old_value_template = Template(str(result.last_result), self._hass)
-            new_value_template = Template(str(result.result), self._hass)
+            # the rendered results are compared as is, a failed render is an unknown value
+            new_result = None if isinstance(result.result, TemplateError) else result.result
+            last_result = None if isinstance(result.last_result, TemplateError) else result.last_result
 
             for state in self._track_templates[result.template]:
-                old_state = state.new_with_value_template(old_value_template)
-                new_state = state.new_with_value_template(new_value_template)
-
-                for pending_state in await self._pending.async_add([new_state], [old_state]):
-                    _LOGGER.debug(
-                        self._format_log_message(
-                            f"State report with value '{pending_state.get_value()!s}' scheduled for {pending_state}"
-                        )
-                    )
+                new_state = state.new_with_template_result(new_result)
+                key = _state_key(new_state)
 
-        return self._schedule_report_states()
+                # compare with the last reported value, not the previous render, to notice a slow drift
+                last_states = self._last_states.get(state.device_id, {})
+                if key not in last_states:
+                    last_states = {key: state.new_with_template_result(last_result)}
+
+                device_changed_states = _get_changed_states([new_state], [last_states[key]])
+                self._update_last_states(
+                    state.device_id, [new_state], last_states, {_state_key(s) for s in device_changed_states}
+                )
+                changed_states.extend(device_changed_states)
+
+        return self._async_add_states(changed_states)
+
+    @callback
+    def _state_changed_filter(self, event: Event) -> bool:
+        """Test if the state change event is about an exposed entity.
+
+        Removals always pass, the entity is already dropped from the exposed entities index at this point.
+        """
+        if event.data.get("new_state") is None:
+            return True
+
+        return self._entry_data.is_exposed_entity(str(event.data.get(ATTR_ENTITY_ID)))
 
     async def _async_state_changed(self, event: Event) -> None:
         """Handle state changes."""
@@ -366,92 +934,158 @@ class YandexNotifier(ABC):
         new_state: State | None = event.data.get("new_state")
 
         if not new_state:
+            return self.async_forget_device(device_id)
+
+        self._stats.state_changes += 1
+        if old_state and not self._is_watched_state_changed(old_state, new_state):
+            self._stats.state_changes_skipped += 1
             return None
 
+        attributes = StateAttributesRecorder(new_state.attributes)
+        new_state = State(
+            new_state.entity_id,
+            new_state.state,
+            last_changed=new_state.last_changed,
+            last_updated=new_state.last_updated,
+            context=new_state.context,
+            validate_entity_id=False,
+        )
+        new_state.attributes = attributes
+
         new_device = Device(self._hass, self._entry_data, device_id, new_state)
         if not new_device.should_expose:
-            return None
+            # events must be compared with the unavailable state, not with the last known value
+            if (last_states := self._last_states.get(device_id)) is not None:
+                for key in [key for key, state in last_states.items() if state.time_sensitive]:
+                    del last_states[key]
 
-        old_states: list[ReportableDeviceState] = []
-        new_states: list[ReportableDeviceState] = []
+            return self._watch_attributes(device_id, attributes)
 
+        new_states: list[ReportableDeviceState] = []
         new_states.extend(new_device.get_state_capabilities())
         new_states.extend(new_device.get_state_properties())
 
-        if old_state:
-            old_device = Device(self._hass, self._entry_data, device_id, old_state)
-            old_states.extend(old_device.get_state_capabilities())
-            old_states.extend(old_device.get_state_properties())
-
-        for pending_state in await self._pending.async_add(new_states, old_states):
-            _LOGGER.debug(
-                self._format_log_message(
-                    f"State report with value '{pending_state.get_value()!s}' scheduled for {pending_state}"
-                )
-            )
+        if (last_states := self._last_states.get(device_id)) is None:
+            last_states = {}
+            if old_state:
+                old_device = Device(self._hass, self._entry_data, device_id, old_state)
+                old_states: list[ReportableDeviceState] = []
+                old_states.extend(old_device.get_state_capabilities())
+                old_states.extend(old_device.get_state_properties())
+                last_states = {_state_key(state): state for state in old_states}
+
+        changed_states = _get_changed_states(new_states, list(last_states.values()))
+        self._update_last_states(device_id, new_states, last_states, {_state_key(s) for s in changed_states})
+        self._watch_attributes(device_id, attributes)
+        return self._async_add_states(changed_states)
+
+    def _update_last_states(
+        self,
+        device_id: str,
+        new_states: Sequence[ReportableDeviceState],
+        last_states: Mapping[tuple[str, str, str], ReportableDeviceState],
+        scheduled_keys: set[tuple[str, str, str]],
+    ) -> None:
+        """Remember states to compare next changes with.
+
+        A state keeps the last known one until its change is reported, so the value is not reported again after
+        intermediate states and a slow drift within the deadband is noticed.
+        Events are always compared with the previous state.
+        Other states of the device (e.g. template based ones) are kept as is.
+        """
+        states = self._last_states.setdefault(device_id, {})
+        suppressed_states = self._suppressed_states.setdefault(device_id, {})
+
+        for state in new_states:
+            key = _state_key(state)
+            # values of the states without old ones may be not read during the change check
+            value = _get_value_or_none(state)
+            suppressed_states.pop(key, None)
+
+            last_state = last_states.get(key)
+            if last_state is None or state.time_sensitive or key in scheduled_keys:
+                states[key] = state
+                continue
 
-        return self._schedule_report_states()
+            states[key] = last_state
+            if value is not None and value != _get_value_or_none(last_state):
+                suppressed_states[key] = state
 
-    async def _async_initial_report(self, *_: Any) -> None:
-        """Schedule initial report."""
-        _LOGGER.debug("Reporting initial states")
-        for state in self._hass.states.async_all():
-            device = Device(self._hass, self._entry_data, state.entity_id, state)
-            if not device.should_expose:
-                continue
+        if not suppressed_states:
+            del self._suppressed_states[device_id]
+        elif not self._unsub_heartbeat:
+            self._unsub_heartbeat = async_call_later(
+                self._hass, delay=REPORT_STATE_HEARTBEAT, action=self._async_heartbeat
+            )
 
-            await self._pending.async_add(device.get_capabilities(), [])
-            await self._pending.async_add([p for p in device.get_properties() if p.report_on_startup], [])
+        return None
 
-        return self._schedule_report_states()
+    @callback
+    def _async_heartbeat(self, *_: Any) -> None:
+        """Report values which changes were too small to report immediately."""
+        self._unsub_heartbeat = None
+        changed_states: list[ReportableDeviceState] = []
 
-    def _schedule_report_states(self) -> None:
-        """Schedule run report states job if there are pending states."""
-        if self._pending.empty or self._unsub_report_states:
-            return None
+        for device_id, suppressed_states in self._suppressed_states.items():
+            last_states = self._last_states.setdefault(device_id, {})
+            for key, state in suppressed_states.items():
+                changed_states.extend(_get_changed_states([state], []))
+                last_states[key] = state
 
-        self._unsub_report_states = async_call_later(
-            self._hass,
-            delay=0 if self._pending.time_sensitive else REPORT_STATE_WINDOW,
-            action=self._report_states_job,
-        )
+        self._suppressed_states.clear()
+        return self._async_add_states(changed_states)
 
-        return None
+    def _is_watched_state_changed(self, old_state: State, new_state: State) -> bool:
+        """Test if the state or attributes used by capabilities and properties of the entity are changed."""
+        if old_state.state != new_state.state:
+            return True
 
+        watched_attributes = self._watched_attributes.get(new_state.entity_id)
+        if watched_attributes is None:
+            return True
 
-class YandexDirectNotifier(YandexNotifier):
-    """Notifier for direct connection."""
+        for attribute in watched_attributes:
+            if old_state.attributes.get(attribute, UNDEFINED) != new_state.attributes.get(attribute, UNDEFINED):
+                return True
 
-    @property
-    def _base_url(self) -> str:
-        """Return base URL."""
-        return f"https://dialogs.yandex.net/api/v1/skills/{self._config.skill_id}/callback"
+        return False
 
-    @property
-    def _request_headers(self) -> dict[str, str]:
-        """Return headers for a request."""
-        return {hdrs.AUTHORIZATION: f"OAuth {self._config.token}"}
+    def _watch_attributes(self, device_id: str, attributes: StateAttributesRecorder) -> None:
+        """Remember attributes that were read from the entity state.
+
+        Attributes that decide supported capabilities and properties are not read while the support plan is valid,
+        they are taken from the plan.
+        """
+        read_keys = attributes.read_keys
+        if read_keys is not None and self._entry_data.support_plans is not None:
+            if (plan := self._entry_data.support_plans.get(device_id)) is not None:
+                if plan.attributes is None:
+                    read_keys = None
+                else:
+                    read_keys = read_keys | plan.attributes.keys()
+
+        if read_keys is None:
+            self._watched_attributes.pop(device_id, None)
+        else:
+            self._watched_attributes[device_id] = frozenset(read_keys)
 
-    def _format_log_message(self, message: str) -> str:
-        """Format a message."""
-        if self._config.verbose_log:
-            return f"{message} ({self._config.user_id }@{self._config.skill_id})"
+        return None
 
-        return message
+    async def _async_initial_report(self, *_: Any) -> None:
+        """Schedule initial report."""
+        self._unsub_initial_report = None
+        states: list[ReportableDeviceState] = []
 
+        _LOGGER.debug("Reporting initial states")
+        for state in self._entry_data.get_exposed_states():
+            device = Device(self._hass, self._entry_data, state.entity_id, state)
+            if not device.should_expose:
+                continue
 
-class YandexCloudNotifier(YandexNotifier):
-    """Notifier for cloud connection."""
+            states.extend(_get_changed_states(device.get_capabilities(), []))
+            states.extend(_get_changed_states([p for p in device.get_properties() if p.report_on_startup], []))
 
-    @property
-    def _base_url(self) -> str:
-        """Return base URL."""
-        return f"{const.CLOUD_BASE_URL}/api/home_assistant/v1/callback"
+        for notifier in self._notifiers:
+            notifier.async_add_states(states)
 
-    @property
-    def _request_headers(self) -> dict[str, str]:
-        """Return headers for a request."""
-        return {
-            hdrs.AUTHORIZATION: f"Bearer {self._config.token}",
-            hdrs.USER_AGENT: f"{SERVER_SOFTWARE} {DOMAIN}/{self._entry_data.version}",
-        }
+        return None
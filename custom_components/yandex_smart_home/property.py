@@ -4,7 +4,7 @@ from __future__ import annotations
 from abc import abstractmethod
 from typing import TYPE_CHECKING, Any, Protocol, Self, runtime_checkable
 
-from .helpers import ListRegistry
+from .helpers import DomainListRegistry
 from .schema import (
     PropertyDescription,
     PropertyInstance,
@@ -121,4 +121,4 @@ class StateProperty(Property, Protocol):
         self.device_id = state.entity_id
 
 
-STATE_PROPERTIES_REGISTRY = ListRegistry[type[StateProperty]]()
+STATE_PROPERTIES_REGISTRY = DomainListRegistry[type[StateProperty]]()
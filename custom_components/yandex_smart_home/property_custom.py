@@ -7,6 +7,7 @@ from homeassistant.components import binary_sensor
 from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
 from homeassistant.core import split_entity_id
 from homeassistant.helpers.template import Template
+from homeassistant.helpers.typing import UNDEFINED
 
 from .const import (
     CONF_ENTITY_PROPERTY_ATTRIBUTE,
@@ -59,6 +60,7 @@ class CustomProperty(Property, Protocol):
 
     _config: ConfigType
     _value_template: Template
+    _template_result: Any = UNDEFINED
 
     def __init__(
         self,
@@ -84,12 +86,21 @@ class CustomProperty(Property, Protocol):
 
     def _get_native_value(self) -> str:
         """Return the current property value without conversion."""
+        if self._template_result is not UNDEFINED:
+            return str(self._template_result)
+
         return str(self._value_template.async_render())
 
     def new_with_value_template(self, value_template: Template) -> Self:
         """Return copy of the property with new value template."""
         return self.__class__(self._hass, self._entry_data, self._config, self.device_id, value_template)
 
+    def new_with_template_result(self, result: Any) -> Self:
+        """Return copy of the property with the value replaced by a rendered result of the value template."""
+        prop = self.new_with_value_template(self._value_template)
+        prop._template_result = result
+        return prop
+
     def __repr__(self) -> str:
         """Return the representation."""
         return (
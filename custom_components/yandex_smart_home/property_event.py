@@ -308,7 +308,7 @@ class StateEventProperty(StateProperty, EventProperty[Any], Protocol):
         return self.state.state
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(binary_sensor.DOMAIN)
 class OpenStateEventProperty(StateEventProperty, OpenEventProperty):
     """Represents the state event property that detect opening of something."""
 
@@ -326,7 +326,7 @@ class OpenStateEventProperty(StateEventProperty, OpenEventProperty):
         return False
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(binary_sensor.DOMAIN)
 class MotionStateEventProperty(StateEventProperty, MotionEventProperty):
     """Represents the state event property that detect motion, presence or occupancy."""
 
@@ -343,7 +343,7 @@ class MotionStateEventProperty(StateEventProperty, MotionEventProperty):
         return False
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(binary_sensor.DOMAIN)
 class GasStateEventProperty(StateEventProperty, GasEventProperty):
     """Represents the state event property that detect gas presence."""
 
@@ -356,7 +356,7 @@ class GasStateEventProperty(StateEventProperty, GasEventProperty):
         return False
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(binary_sensor.DOMAIN)
 class SmokeStateEventProperty(StateEventProperty, SmokeEventProperty):
     """Represents the state event property that detect smoke presence."""
 
@@ -369,7 +369,7 @@ class SmokeStateEventProperty(StateEventProperty, SmokeEventProperty):
         return False
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(binary_sensor.DOMAIN)
 class BatteryLevelStateEvent(StateEventProperty, BatteryLevelEventProperty):
     """Represents the state event property that detect low level of a battery."""
 
@@ -382,7 +382,7 @@ class BatteryLevelStateEvent(StateEventProperty, BatteryLevelEventProperty):
         return False
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(binary_sensor.DOMAIN)
 class WaterLevelStateEventProperty(StateEventProperty, WaterLevelEventProperty):
     """Represents the state event property that detect low level of water."""
 
@@ -397,7 +397,7 @@ class WaterLevelStateEventProperty(StateEventProperty, WaterLevelEventProperty):
         return False
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(binary_sensor.DOMAIN)
 class WaterLeakStateEventProperty(StateEventProperty, WaterLeakEventProperty):
     """Represents the state event property that detect water leakage."""
 
@@ -449,7 +449,7 @@ class ButtonPressStateEventProperty(StateEventProperty, ButtonPressEventProperty
         return None
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(binary_sensor.DOMAIN, sensor.DOMAIN)
 class VibrationStateEventProperty(StateEventProperty, VibrationEventProperty):
     """Represents the state event property that detect vibration."""
 
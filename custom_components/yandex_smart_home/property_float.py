@@ -113,9 +113,12 @@ class FloatProperty(Property, Protocol):
         if value is None:
             return False
 
-        if other_value is None or value != other_value:
+        if other_value is None:
             return True
 
+        if value != other_value:
+            return self._is_significant_change(value, other_value)
+
         return False
 
     @property
@@ -128,6 +131,22 @@ class FloatProperty(Property, Protocol):
         """Return the current property value without conversion."""
         ...
 
+    def _is_significant_change(self, value: float, other_value: float) -> bool:
+        """Test if the value change exceeds the deadband."""
+        deadband = self._entry_data.get_property_deadband(self.device_id, self.instance)
+        if deadband is None:
+            return True
+
+        change = abs(value - other_value)
+        if (absolute := deadband.get(const.CONF_DEADBAND_ABSOLUTE)) is not None and change < absolute:
+            return False
+
+        relative = deadband.get(const.CONF_DEADBAND_RELATIVE)
+        if relative is not None and change < abs(other_value) * relative / 100:
+            return False
+
+        return True
+
     @property
     def _native_unit_of_measurement(self) -> str | None:
         """Return the unit the native value is expressed in."""
@@ -353,7 +372,9 @@ class BatteryLevelPercentageProperty(FloatProperty, Protocol):
         return BatteryLevelFloatPropertyParameters()
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(
+    sensor.DOMAIN, air_quality.DOMAIN, climate.DOMAIN, fan.DOMAIN, humidifier.DOMAIN, water_heater.DOMAIN
+)
 class TemperatureSensor(StateProperty, TemperatureProperty):
     """Representaton of the state as a temperature sensor."""
 
@@ -386,7 +407,9 @@ class TemperatureSensor(StateProperty, TemperatureProperty):
         return str(self.state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, UnitOfTemperature.CELSIUS))
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(
+    sensor.DOMAIN, air_quality.DOMAIN, climate.DOMAIN, fan.DOMAIN, humidifier.DOMAIN
+)
 class HumiditySensor(StateProperty, HumidityProperty):
     """Representaton of the state as a humidity sensor."""
 
@@ -414,7 +437,7 @@ class HumiditySensor(StateProperty, HumidityProperty):
         return self.state.state
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(sensor.DOMAIN)
 class PressureSensor(StateProperty, PressureProperty):
     """Representaton of the state as a pressure sensor."""
 
@@ -436,7 +459,7 @@ class PressureSensor(StateProperty, PressureProperty):
         return str(self.state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, self.unit_of_measurement))
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(sensor.DOMAIN, light.DOMAIN, fan.DOMAIN)
 class IlluminationSensor(StateProperty, IlluminationProperty):
     """Representaton of the state as a illumination sensor."""
 
@@ -463,7 +486,7 @@ class IlluminationSensor(StateProperty, IlluminationProperty):
         return self.state.attributes.get(const.ATTR_ILLUMINANCE)
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(fan.DOMAIN, humidifier.DOMAIN)
 class WaterLevelPercentageSensor(StateProperty, WaterLevelPercentageProperty):
     """Representaton of the state as a water level sensor."""
 
@@ -480,7 +503,7 @@ class WaterLevelPercentageSensor(StateProperty, WaterLevelPercentageProperty):
         return self.state.attributes.get(const.ATTR_WATER_LEVEL)
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(sensor.DOMAIN, air_quality.DOMAIN, fan.DOMAIN)
 class CO2LevelSensor(StateProperty, CO2LevelProperty):
     """Representaton of the state as a CO2 level sensor."""
 
@@ -503,7 +526,7 @@ class CO2LevelSensor(StateProperty, CO2LevelProperty):
         return self.state.attributes.get(air_quality.ATTR_CO2)
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(air_quality.DOMAIN)
 class PM1DensitySensor(StateProperty, PM1DensityProperty):
     """Representaton of the state as a PM1 density sensor."""
 
@@ -527,7 +550,7 @@ class PM1DensitySensor(StateProperty, PM1DensityProperty):
         return self.state.attributes.get(air_quality.ATTR_PM_0_1)
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(air_quality.DOMAIN)
 class PM25DensitySensor(StateProperty, PM25DensityProperty):
     """Representaton of the state as a PM2.5 density sensor."""
 
@@ -544,7 +567,7 @@ class PM25DensitySensor(StateProperty, PM25DensityProperty):
         return self.state.attributes.get(air_quality.ATTR_PM_2_5)
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(air_quality.DOMAIN)
 class PM10DensitySensor(StateProperty, PM10DensityProperty):
     """Representaton of the state as a PM10 density sensor."""
 
@@ -561,7 +584,7 @@ class PM10DensitySensor(StateProperty, PM10DensityProperty):
         return self.state.attributes.get(air_quality.ATTR_PM_10)
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(air_quality.DOMAIN)
 class TVOCConcentrationSensor(StateProperty, TVOCConcentrationProperty):
     """Representaton of the state as a TVOC concentration sensor."""
 
@@ -583,7 +606,7 @@ class TVOCConcentrationSensor(StateProperty, TVOCConcentrationProperty):
         return str(self.state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, CONCENTRATION_MICROGRAMS_PER_CUBIC_METER))
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(sensor.DOMAIN, switch.DOMAIN, light.DOMAIN)
 class VoltageSensor(StateProperty, VoltageProperty):
     """Representaton of the state as a voltage sensor."""
 
@@ -614,7 +637,7 @@ class VoltageSensor(StateProperty, VoltageProperty):
         return self.unit_of_measurement
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(sensor.DOMAIN, switch.DOMAIN, light.DOMAIN)
 class ElectricCurrentSensor(StateProperty, ElectricCurrentProperty):
     """Representaton of the state as a electric current sensor."""
 
@@ -645,7 +668,7 @@ class ElectricCurrentSensor(StateProperty, ElectricCurrentProperty):
         return self.unit_of_measurement
 
 
-@STATE_PROPERTIES_REGISTRY.register
+@STATE_PROPERTIES_REGISTRY.register_for(sensor.DOMAIN, switch.DOMAIN)
 class ElectricPowerSensor(StateProperty, ElectricPowerProperty):
     """Representaton of the state as a electric power sensor."""
 
@@ -1,16 +1,31 @@
 """Base class for API response schemas."""
-from typing import Any
+from typing import Any, Callable
 
+import orjson
 from pydantic import BaseModel
 from pydantic.generics import GenericModel
 
 
+def json_dumps(obj: Any, *, default: Callable[[Any], Any] | None = None, **_: Any) -> str:
+    """Serialize an object to a compact JSON string without escaping of non-ASCII characters."""
+    return orjson.dumps(obj, default=default).decode("utf-8")
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Deserialize a JSON document."""
+    return orjson.loads(data)
+
+
 class APIModel(BaseModel):
     """Base API response model."""
 
+    class Config:
+        json_loads = json_loads
+        json_dumps = json_dumps
+
     def as_json(self) -> str:
         """Generate a JSON representation of the model."""
-        return super().json(exclude_none=True, ensure_ascii=False)
+        return super().json(exclude_none=True)
 
     def as_dict(self) -> dict[str, Any]:
         """Generate a dictionary representation of the model."""
@@ -135,6 +135,16 @@ CapabilityInstanceAction = Annotated[
 ]
 """New capability state including type for a state change request."""
 
+CAPABILITY_INSTANCE_ACTIONS: dict[str, type[APIModel]] = {
+    CapabilityType.ON_OFF: OnOffCapabilityInstanceAction,
+    CapabilityType.COLOR_SETTING: ColorSettingCapabilityInstanceAction,
+    CapabilityType.MODE: ModeCapabilityInstanceAction,
+    CapabilityType.RANGE: RangeCapabilityInstanceAction,
+    CapabilityType.TOGGLE: ToggleCapabilityInstanceAction,
+    CapabilityType.VIDEO_STREAM: VideoStreamCapabilityInstanceAction,
+}
+"""Capability state change models by capability type."""
+
 CapabilityInstanceActionState = TypeVar(
     "CapabilityInstanceActionState",
     OnOffCapabilityInstanceActionState,
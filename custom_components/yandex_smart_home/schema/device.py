@@ -4,11 +4,15 @@ https://yandex.ru/dev/dialogs/smart-home/doc/reference/get-devices.html
 https://yandex.ru/dev/dialogs/smart-home/doc/reference/post-devices-query.html
 https://yandex.ru/dev/dialogs/smart-home/doc/reference/post-action.html
 """
+from dataclasses import dataclass
 from enum import StrEnum
-from typing import Any, Literal
+from typing import Any, Literal, cast
 
-from .base import APIModel
+from pydantic import PrivateAttr
+
+from .base import APIModel, json_dumps, json_loads
 from .capability import (
+    CAPABILITY_INSTANCE_ACTIONS,
     CapabilityDescription,
     CapabilityInstance,
     CapabilityInstanceAction,
@@ -85,6 +89,19 @@ class DeviceDescription(APIModel):
     properties: list[PropertyDescription] | None
     device_info: DeviceInfo | None
 
+    _json: str | None = PrivateAttr(default=None)
+
+    class Config:
+        # keep the serialized fragment when the description is added to a device list
+        copy_on_model_validation = "none"
+
+    def as_json(self) -> str:
+        """Generate a JSON representation of the model, the description is serialized only once."""
+        if self._json is None:
+            self._json = super().as_json()
+
+        return self._json
+
 
 class DeviceState(APIModel):
     """Device state for a state query request."""
@@ -102,6 +119,16 @@ class DeviceList(ResponsePayload):
     user_id: str
     devices: list[DeviceDescription]
 
+    @property
+    def unserialized_devices(self) -> int:
+        """Return number of device descriptions without cached JSON representation."""
+        return sum(1 for d in self.devices if d._json is None)
+
+    def as_json(self) -> str:
+        """Generate a JSON representation of the model from serialized device descriptions."""
+        devices = ",".join(d.as_json() for d in self.devices)
+        return f'{{"user_id":{json_dumps(self.user_id)},"devices":[{devices}]}}'
+
 
 class DeviceStates(ResponsePayload):
     """Response payload for a state query request."""
@@ -141,6 +168,110 @@ class ActionRequest(APIModel):
     payload: ActionRequestPayload
 
 
+@dataclass(slots=True)
+class StatesRequestDeviceData:
+    """Device for a state query request, lightweight version of StatesRequestDevice."""
+
+    id: str
+    custom_data: dict[str, Any] | None = None
+
+
+@dataclass(slots=True)
+class ActionRequestDeviceData:
+    """Device for a state change request, lightweight version of ActionRequestDevice."""
+
+    id: str
+    capabilities: list[CapabilityInstanceAction]
+
+
+def parse_states_request(payload: str | bytes) -> list[StatesRequestDeviceData]:
+    """Parse body of a state query request without building of pydantic models."""
+    data = _parse_dict(json_loads(payload), "__root__")
+    return [
+        StatesRequestDeviceData(
+            id=_parse_str(_get_field(device, "id", f"devices -> {index}"), f"devices -> {index} -> id"),
+            custom_data=_parse_optional_dict(device.get("custom_data"), f"devices -> {index} -> custom_data"),
+        )
+        for index, device in _iter_dicts(_get_field(data, "devices", "__root__"), "devices")
+    ]
+
+
+def parse_action_request(payload: str | bytes) -> list[ActionRequestDeviceData]:
+    """Parse body of a state change request, only capability actions are validated by pydantic models."""
+    data = _parse_dict(json_loads(payload), "__root__")
+    payload_data = _parse_dict(_get_field(data, "payload", "__root__"), "payload")
+    devices: list[ActionRequestDeviceData] = []
+
+    for index, device in _iter_dicts(_get_field(payload_data, "devices", "payload"), "payload -> devices"):
+        loc = f"payload -> devices -> {index}"
+        devices.append(
+            ActionRequestDeviceData(
+                id=_parse_str(_get_field(device, "id", loc), f"{loc} -> id"),
+                capabilities=[
+                    _parse_capability_action(capability, f"{loc} -> capabilities -> {capability_index}")
+                    for capability_index, capability in _iter_dicts(
+                        _get_field(device, "capabilities", loc), f"{loc} -> capabilities"
+                    )
+                ],
+            )
+        )
+
+    return devices
+
+
+def _parse_capability_action(data: dict[str, Any], loc: str) -> CapabilityInstanceAction:
+    """Parse a capability state change using a model for the capability type."""
+    capability_type = _get_field(data, "type", loc)
+    model = CAPABILITY_INSTANCE_ACTIONS.get(capability_type) if isinstance(capability_type, str) else None
+    if model is None:
+        raise ValueError(f"{loc} -> type: no match for discriminator value {capability_type!r}")
+
+    return cast(CapabilityInstanceAction, model.parse_obj(data))
+
+
+def _get_field(data: dict[str, Any], name: str, loc: str) -> Any:
+    """Return a value of the required field."""
+    if name not in data:
+        raise ValueError(f"{loc} -> {name}: field required")
+
+    return data[name]
+
+
+def _parse_dict(value: Any, loc: str) -> dict[str, Any]:
+    """Validate the value is a dictionary."""
+    if not isinstance(value, dict):
+        raise ValueError(f"{loc}: value is not a valid dict")
+
+    return value
+
+
+def _parse_optional_dict(value: Any, loc: str) -> dict[str, Any] | None:
+    """Validate the value is a dictionary or None."""
+    if value is None:
+        return None
+
+    return _parse_dict(value, loc)
+
+
+def _parse_str(value: Any, loc: str) -> str:
+    """Validate the value is a string, coerce numbers as pydantic does."""
+    if isinstance(value, str):
+        return value
+
+    if isinstance(value, (int, float)):
+        return str(value)
+
+    raise ValueError(f"{loc}: str type expected")
+
+
+def _iter_dicts(value: Any, loc: str) -> list[tuple[int, dict[str, Any]]]:
+    """Validate the value is a list of dictionaries."""
+    if not isinstance(value, list):
+        raise ValueError(f"{loc}: value is not a valid list")
+
+    return [(index, _parse_dict(item, f"{loc} -> {index}")) for index, item in enumerate(value)]
+
+
 class SuccessActionResult(APIModel):
     """Success device action result."""
 
@@ -4,7 +4,7 @@ https://yandex.ru/dev/dialogs/smart-home/doc/concepts/response-codes.html
 """
 from enum import StrEnum
 
-from .base import APIModel
+from .base import APIModel, json_dumps
 
 
 class ResponseCode(StrEnum):
@@ -49,3 +49,14 @@ class Response(APIModel):
 
     request_id: str | None
     payload: ResponsePayload | None
+
+    def as_json(self) -> str:
+        """Generate a JSON representation of the model using the payload own serialization."""
+        if self.payload is None:
+            return super().as_json()
+
+        payload = self.payload.as_json()
+        if self.request_id is None:
+            return f'{{"payload":{payload}}}'
+
+        return f'{{"request_id":{json_dumps(self.request_id)},"payload":{payload}}}'
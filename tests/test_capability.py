@@ -30,6 +30,7 @@ def get_capabilities(
             continue
 
         if capability.supported:
+            assert CapabilityT in STATE_CAPABILITIES_REGISTRY.for_domain(state.domain)
             caps.append(capability)
 
     return caps
@@ -304,6 +304,15 @@ async def test_capability_custom_toggle(hass):
     for t in ("False", "off", "0"):
         assert cap.new_with_value_template(Template(t)).get_value() is False
 
+    for r in (None, "", STATE_UNAVAILABLE):
+        assert cap.new_with_template_result(r).get_value() is None
+
+    for r in (True, "on", 1):
+        assert cap.new_with_template_result(r).get_value() is True
+
+    assert cap.new_with_template_result(False).get_value() is False
+    assert cap.get_value() is False
+
 
 async def test_capability_custom_range_random_access(hass):
     state = State("switch.test", "30", {})
@@ -1,3 +1,4 @@
+import asyncio
 from asyncio import TimeoutError
 import json
 from typing import Any
@@ -13,8 +14,14 @@ from homeassistant.setup import async_setup_component
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.yandex_smart_home import DOMAIN, YandexSmartHome
-from custom_components.yandex_smart_home.cloud import CloudManager
+from custom_components.yandex_smart_home import DOMAIN, YandexSmartHome, handlers
+from custom_components.yandex_smart_home.cloud import CloudManager, CloudRequest
+from custom_components.yandex_smart_home.schema import Response
+
+
+class MockWSWriter:
+    def __init__(self, compress: int):
+        self.compress = compress
 
 
 class MockWSConnection:
@@ -24,7 +31,12 @@ class MockWSConnection:
         self.close_code: int | None = kwargs.get("ws_close_code")
         self.closed = False
         self.msg = kwargs.get("msg", []) or []
+        self.compress = kwargs.get("compress", 0)
+        self.protocol = kwargs.get("protocol")
         self.send_queue = []
+        self.send_compress = []
+        self.send_drain: asyncio.Event | None = None
+        self._writer = MockWSWriter(self.compress)
 
     def __aiter__(self):
         return self
@@ -41,23 +53,41 @@ class MockWSConnection:
     async def close(self):
         self.closed = True
 
-    async def send_str(self, s):
+    async def send_str(self, s, compress=None):
         self.send_queue.append(s)
+        self.send_compress.append(compress or self._writer.compress)
+        if self.send_drain:
+            await self.send_drain.wait()
+
+    async def send_bytes(self, b, compress=None):
+        self.send_queue.append(b)
+        self.send_compress.append(compress or self._writer.compress)
+        if self.send_drain:
+            await self.send_drain.wait()
 
 
 class MockSession:
-    def __init__(self, aioclient, ws_close_code=None, msg=None):
+    def __init__(self, aioclient, ws_close_code=None, msg=None, protocol=None):
         self.aioclient = aioclient
         self.ws: MockWSConnection | None = None
         self.ws_close_code = ws_close_code
         self.msg = msg
+        self.protocol = protocol
 
     async def ws_connect(self, *args, **kwargs):
         kwargs["ws_close_code"] = self.ws_close_code
         kwargs["msg"] = self.msg
+        if self.protocol in kwargs.get("protocols", ()):
+            kwargs["protocol"] = self.protocol
         self.ws = MockWSConnection(*args, **kwargs)
         return self.ws
 
+    async def post(self, *args, **kwargs):
+        return await self.aioclient.match_request("post", *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        return await self.aioclient.match_request("delete", *args, **kwargs)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -416,3 +446,160 @@ async def test_cloud_req_user_devices_action(hass_platform, config_entry_cloud,
     }
 
     assert hass.states.get("switch.ac").state == "on"
+
+
+async def test_cloud_requests_concurrent(hass_platform, config_entry_cloud, aioclient_mock):
+    hass = hass_platform
+    action_started, action_finished = asyncio.Event(), asyncio.Event()
+    async_handle_request = handlers.async_handle_request
+
+    async def _async_handle_request(hass, data, action, message):
+        if action == "/user/devices/action":
+            action_started.set()
+            await action_finished.wait()
+
+        return await async_handle_request(hass, data, action, message)
+
+    requests = [
+        {"request_id": "req_action", "action": "/user/devices/action", "message": "{}"},
+        {"request_id": "req_query", "action": "/user/devices/query", "message": json.dumps({"devices": []})},
+    ]
+    session = MockSession(
+        aioclient_mock, msg=[WSMessage(type=WSMsgType.TEXT, extra={}, data=json.dumps(r)) for r in requests]
+    )
+    with patch.object(handlers, "async_handle_request", side_effect=_async_handle_request):
+        hass.data[DATA_CLIENTSESSION] = session
+        config_entry_cloud.add_to_hass(hass)
+        hass.async_create_task(hass.config_entries.async_setup(config_entry_cloud.entry_id))
+        await action_started.wait()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert [json.loads(r)["request_id"] for r in session.ws.send_queue] == ["req_query"]
+        assert len(_get_manager(hass, config_entry_cloud)._request_tasks) == 1
+
+        action_finished.set()
+        await hass.async_block_till_done()
+
+    assert [json.loads(r)["request_id"] for r in session.ws.send_queue] == ["req_query", "req_action"]
+    assert len(_get_manager(hass, config_entry_cloud)._request_tasks) == 0
+
+
+async def test_cloud_requests_limit(hass_platform, config_entry_cloud, aioclient_mock):
+    hass = hass_platform
+    in_progress, max_in_progress = 0, 0
+
+    async def _async_handle_request(hass, data, action, message):
+        nonlocal in_progress, max_in_progress
+        in_progress += 1
+        max_in_progress = max(in_progress, max_in_progress)
+        await asyncio.sleep(0)
+        in_progress -= 1
+        return Response(request_id=data.request_id, payload=None)
+
+    requests = [{"request_id": f"req_{i}", "action": "/user/devices"} for i in range(10)]
+    session = MockSession(
+        aioclient_mock, msg=[WSMessage(type=WSMsgType.TEXT, extra={}, data=json.dumps(r)) for r in requests]
+    )
+    with patch.object(handlers, "async_handle_request", side_effect=_async_handle_request), patch(
+        "custom_components.yandex_smart_home.cloud.MAX_CONCURRENT_REQUESTS", 3
+    ):
+        await async_setup_entry(hass, config_entry_cloud, session=session)
+
+    assert max_in_progress == 3
+    assert len(session.ws.send_queue) == 10
+
+
+async def test_cloud_requests_timeout(hass_platform, config_entry_cloud, aioclient_mock, caplog):
+    hass = hass_platform
+
+    async def _async_handle_request(hass, data, action, message):
+        await asyncio.sleep(1)
+
+    requests = [{"request_id": "req_slow", "action": "/user/devices"}]
+    session = MockSession(
+        aioclient_mock, msg=[WSMessage(type=WSMsgType.TEXT, extra={}, data=json.dumps(r)) for r in requests]
+    )
+    with patch.object(handlers, "async_handle_request", side_effect=_async_handle_request), patch(
+        "custom_components.yandex_smart_home.cloud.REQUEST_TIMEOUT", 0.01
+    ):
+        await async_setup_entry(hass, config_entry_cloud, session=session)
+
+    assert json.loads(session.ws.send_queue[0]) == {
+        "request_id": "req_slow",
+        "payload": {"error_code": "INTERNAL_ERROR"},
+    }
+    assert "Timeout while handling request /user/devices (req_slow)" in caplog.messages
+
+    session.ws.closed = True
+    manager = _get_manager(hass, config_entry_cloud)
+    with patch.object(handlers, "async_handle_request", return_value=Response(request_id="req", payload=None)):
+        await manager._async_handle_request(session.ws, CloudRequest(request_id="req", action="/user/devices"))
+
+    assert len(session.ws.send_queue) == 1
+
+
+async def test_cloud_response_compression(hass_platform, config_entry_cloud, aioclient_mock):
+    hass = hass_platform
+
+    requests = [
+        {"request_id": "req_query", "action": "/user/devices/query", "message": json.dumps({"devices": []})},
+        {
+            "request_id": "req_devices",
+            "action": "/user/devices/query",
+            "message": json.dumps({"devices": [{"id": "sensor.outside_temp"}, {"id": "light.kitchen"}]}),
+        },
+    ]
+    session = MockSession(
+        aioclient_mock, msg=[WSMessage(type=WSMsgType.TEXT, extra={}, data=json.dumps(r)) for r in requests]
+    )
+    with patch("custom_components.yandex_smart_home.cloud.WS_COMPRESS_THRESHOLD", 100):
+        await async_setup_entry(hass, config_entry_cloud, session=session)
+
+    assert session.ws.compress == 15
+    assert [json.loads(r)["request_id"] for r in session.ws.send_queue] == ["req_query", "req_devices"]
+    assert len(session.ws.send_queue[0]) < 100 < len(session.ws.send_queue[1])
+    assert session.ws.send_compress == [0, 15]
+    assert session.ws._writer.compress == 0
+
+    # sends waiting for the transport don't block each other
+    manager = _get_manager(hass, config_entry_cloud)
+    session.ws.send_drain = asyncio.Event()
+    small_task = hass.async_create_task(manager._async_send_response(session.ws, "small"))
+    large_task = hass.async_create_task(manager._async_send_response(session.ws, "large" * 300))
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert session.ws.send_queue[2:] == ["small", "large" * 300]
+    session.ws.send_drain.set()
+    await asyncio.gather(small_task, large_task)
+    assert session.ws.send_compress == [0, 15, 0, 15]
+
+
+async def test_cloud_binary_protocol(hass_platform, config_entry_cloud, aioclient_mock):
+    hass = hass_platform
+
+    requests = [
+        {"request_id": "req_text", "action": "/user/devices/query", "message": json.dumps({"devices": []})},
+        {"request_id": "req_binary", "action": "/user/devices/query", "message": json.dumps({"devices": []})},
+    ]
+    session = MockSession(
+        aioclient_mock,
+        msg=[
+            WSMessage(type=WSMsgType.TEXT, extra={}, data=json.dumps(requests[0])),
+            WSMessage(type=WSMsgType.BINARY, extra={}, data=json.dumps(requests[1]).encode("utf-8")),
+        ],
+        protocol="yandex_smart_home.binary",
+    )
+    await async_setup_entry(hass, config_entry_cloud, session=session)
+
+    assert session.ws.protocol == "yandex_smart_home.binary"
+    assert session.ws.send_queue == [
+        b'{"request_id":"req_text","payload":{"devices":[]}}',
+        b'{"request_id":"req_binary","payload":{"devices":[]}}',
+    ]
+    await hass.config_entries.async_unload(config_entry_cloud.entry_id)
+
+    session = MockSession(aioclient_mock, protocol="foo")
+    await async_setup_entry(hass, config_entry_cloud, session=session)
+    assert session.ws.protocol is None
@@ -1,5 +1,6 @@
 from homeassistant.config import YAML_CONFIG_FILE
 from homeassistant.helpers.reload import async_integration_yaml_config
+import pytest
 from pytest_homeassistant_custom_component.common import patch_yaml_files
 
 from custom_components.yandex_smart_home import DOMAIN
@@ -124,6 +125,28 @@ yandex_smart_home:
         assert await async_integration_yaml_config(hass, DOMAIN) is None
 
 
+@pytest.mark.parametrize(
+    "key,value",
+    [
+        ("action_concurrency", 0),
+        ("action_timeout", 0),
+        ("action_timeout", "foo"),
+        ("action_deadline", -1),
+        ("report_interval", 0.5),
+    ],
+)
+async def test_invalid_action_settings(hass, key, value):
+    files = {
+        YAML_CONFIG_FILE: f"""
+yandex_smart_home:
+  settings:
+    {key}: {value}
+"""
+    }
+    with patch_yaml_files(files):
+        assert await async_integration_yaml_config(hass, DOMAIN) is None
+
+
 async def test_invalid_color_name(hass, caplog):
     files = {
         YAML_CONFIG_FILE: """
@@ -189,3 +212,19 @@ yandex_smart_home:
     with patch_yaml_files(files):
         await async_integration_yaml_config(hass, DOMAIN)
         assert "Property type 'button' is not supported" in caplog.messages[-1]
+
+
+@pytest.mark.parametrize(
+    "deadband",
+    ["{on: {absolute: 1}}", "{temperature: {absolute: -1}}", "{temperature: {relative: foo}}", "{power: {foo: 1}}"],
+)
+async def test_invalid_deadband(hass, deadband):
+    files = {
+        YAML_CONFIG_FILE: f"""
+yandex_smart_home:
+  settings:
+    deadband: {deadband}
+"""
+    }
+    with patch_yaml_files(files):
+        assert await async_integration_yaml_config(hass, DOMAIN) is None
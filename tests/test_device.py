@@ -7,6 +7,7 @@ from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.const import (
     ATTR_DEVICE_CLASS,
     ATTR_ENTITY_ID,
+    ATTR_SUPPORTED_FEATURES,
     ATTR_UNIT_OF_MEASUREMENT,
     PERCENTAGE,
     SERVICE_TURN_OFF,
@@ -26,6 +27,7 @@ from pytest_homeassistant_custom_component.common import (
 )
 
 from custom_components.yandex_smart_home import const
+from custom_components.yandex_smart_home.capability import STATE_CAPABILITIES_REGISTRY
 from custom_components.yandex_smart_home.capability_color import (
     ColorSettingCapability,
     ColorTemperatureCapability,
@@ -48,7 +50,8 @@ from custom_components.yandex_smart_home.const import (
     CONF_TYPE,
 )
 from custom_components.yandex_smart_home.device import Device
-from custom_components.yandex_smart_home.helpers import APIError
+from custom_components.yandex_smart_home.helpers import APIError, DomainListRegistry
+from custom_components.yandex_smart_home.property import STATE_PROPERTIES_REGISTRY
 from custom_components.yandex_smart_home.property_custom import (
     ButtonPressCustomEventProperty,
     VoltageCustomFloatProperty,
@@ -104,7 +107,7 @@ async def test_device_duplicate_capabilities(hass):
 
     with patch(
         "custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY",
-        [MockCapability, MockCapability2, MockCapability, MockCapability2],
+        DomainListRegistry([MockCapability, MockCapability2, MockCapability, MockCapability2]),
     ):
         caps = device.get_capabilities()
         assert len(caps) == 2
@@ -187,7 +190,7 @@ async def test_device_duplicate_properties(hass):
 
     with patch(
         "custom_components.yandex_smart_home.device.STATE_PROPERTIES_REGISTRY",
-        [MockProperty, MockPropertyWS, MockProperty, MockPropertyWS, MockPropertyWE],
+        DomainListRegistry([MockProperty, MockPropertyWS, MockProperty, MockPropertyWS, MockPropertyWE]),
     ):
         props = device.get_properties()
         assert len(props) == 3
@@ -555,7 +558,10 @@ async def test_device_execute_exception(hass):
 
     state = State("switch.test", STATE_ON)
     device = Device(hass, BASIC_ENTRY_DATA, state.entity_id, state)
-    with patch("custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY", [MockOnOffCapability]):
+    with patch(
+        "custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY",
+        DomainListRegistry([MockOnOffCapability]),
+    ):
         with pytest.raises(APIError) as e:
             await device.execute(
                 Context(),
@@ -571,7 +577,10 @@ async def test_device_execute_exception(hass):
     )
 
     device = Device(hass, BASIC_ENTRY_DATA, state.entity_id, state)
-    with patch("custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY", [MockBrightnessCapability]):
+    with patch(
+        "custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY",
+        DomainListRegistry([MockBrightnessCapability]),
+    ):
         with pytest.raises(APIError) as e:
             await device.execute(
                 Context(),
@@ -582,3 +591,40 @@ async def test_device_execute_exception(hass):
 
     assert e.value.code == ResponseCode.INVALID_ACTION
     assert e.value.message == "foo"
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        State("light.test", STATE_ON, {ATTR_SUPPORTED_FEATURES: 0xFF, "supported_color_modes": ["hs", "color_temp"]}),
+        State("switch.test", STATE_ON, {"voltage": 220, "power": 100, "battery_level": 50}),
+        State("sensor.test", "20", {ATTR_DEVICE_CLASS: SensorDeviceClass.TEMPERATURE}),
+        State("binary_sensor.test", STATE_ON, {ATTR_DEVICE_CLASS: BinarySensorDeviceClass.DOOR}),
+        State("media_player.test", STATE_ON, {ATTR_SUPPORTED_FEATURES: 0xFFFFF, "source_list": ["a"]}),
+        State(
+            "climate.test", "heat", {ATTR_SUPPORTED_FEATURES: 0xFF, "hvac_modes": ["heat"], "current_temperature": 1}
+        ),
+        State("vacuum.test", STATE_ON, {ATTR_SUPPORTED_FEATURES: 0xFFFF}),
+        State("unknown.test", STATE_ON, {ATTR_DEVICE_CLASS: "button"}),
+    ],
+)
+def test_device_state_capabilities_domain_index(hass, state):
+    def _resolve(registry):
+        resolved = []
+        for CapabilityT in registry:
+            capability = CapabilityT(hass, BASIC_ENTRY_DATA, state)
+            if capability.supported and capability not in resolved:
+                resolved.append(capability)
+        return resolved
+
+    device = Device(hass, BASIC_ENTRY_DATA, state.entity_id, state)
+    assert device.get_state_capabilities() == _resolve(STATE_CAPABILITIES_REGISTRY)
+    assert device.get_state_properties() == _resolve(STATE_PROPERTIES_REGISTRY)
+    assert device.get_state_capabilities() or device.get_state_properties()
+
+    # classes instantiated per resolution, the full registries were scanned before indexing by domain
+    candidates = STATE_CAPABILITIES_REGISTRY.for_domain(state.domain) + STATE_PROPERTIES_REGISTRY.for_domain(
+        state.domain
+    )
+    assert len(candidates) <= 20
+    assert len(STATE_CAPABILITIES_REGISTRY) + len(STATE_PROPERTIES_REGISTRY) > 60
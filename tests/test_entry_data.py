@@ -1,10 +1,12 @@
 from unittest.mock import patch
 
+from homeassistant.helpers import area_registry, device_registry, entity_registry
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.yandex_smart_home import const
+from custom_components.yandex_smart_home import DOMAIN, YandexSmartHome, const
+from custom_components.yandex_smart_home.device import Device
 from custom_components.yandex_smart_home.entry_data import ConfigEntryData
-from custom_components.yandex_smart_home.helpers import APIError
+from custom_components.yandex_smart_home.helpers import APIError, DomainListRegistry
 from custom_components.yandex_smart_home.schema import ResponseCode
 
 from . import MockConfigEntryData, generate_entity_filter
@@ -34,3 +36,162 @@ def test_entry_data_trackable_states(hass, caplog):
     ):
         assert entry_data._get_trackable_states() == {}
     assert caplog.messages == ["Failed to track custom capability: foo"]
+
+
+async def test_entry_data_exposed_entities(hass_platform_direct, config_entry_direct):
+    hass = hass_platform_direct
+    component: YandexSmartHome = hass.data[DOMAIN]
+    entry_data = component.get_entry_data(config_entry_direct)
+    entry_data._entity_filter = generate_entity_filter(exclude_entities=["switch.not_exposed"])
+
+    assert [s.entity_id for s in entry_data.get_exposed_states()] == [
+        "sensor.outside_temp",
+        "binary_sensor.front_door",
+        "light.kitchen",
+    ]
+
+    hass.states.async_set("switch.test", "on")
+    hass.states.async_set("switch.not_exposed", "on")
+    hass.states.async_set("group.all_locks", "on")
+    await hass.async_block_till_done()
+    assert list(entry_data._exposed_entity_ids) == [
+        "sensor.outside_temp",
+        "binary_sensor.front_door",
+        "light.kitchen",
+        "switch.test",
+    ]
+    assert entry_data.is_exposed_entity("switch.test") is True
+    assert entry_data.is_exposed_entity("switch.not_exposed") is False
+    assert entry_data.is_exposed_entity("switch.missing") is False
+
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+    assert [s.entity_id for s in entry_data.get_exposed_states()] == [
+        "sensor.outside_temp",
+        "binary_sensor.front_door",
+        "switch.test",
+    ]
+
+    ent_reg = entity_registry.async_get(hass)
+    ent_reg.async_get_or_create("switch", "test", "1234", suggested_object_id="registry")
+    hass.states.async_set("switch.registry", "on")
+    await hass.async_block_till_done()
+    assert "switch.registry" in entry_data._exposed_entity_ids
+
+    ent_reg.async_update_entity("switch.registry", new_entity_id="switch.renamed")
+    hass.states.async_set("switch.renamed", "on")
+    await hass.async_block_till_done()
+    assert "switch.registry" not in entry_data._exposed_entity_ids
+    assert "switch.renamed" in entry_data._exposed_entity_ids
+
+    ent_reg.async_remove("switch.renamed")
+    await hass.async_block_till_done()
+    assert "switch.renamed" in entry_data._exposed_entity_ids
+    entry_data._exposed_entity_ids["switch.ghost"] = None
+    ent_reg.async_get_or_create("switch", "test", "5678", suggested_object_id="ghost")
+    ent_reg.async_remove("switch.ghost")
+    await hass.async_block_till_done()
+    assert "switch.ghost" not in entry_data._exposed_entity_ids
+
+    await hass.config_entries.async_unload(config_entry_direct.entry_id)
+    hass.states.async_set("switch.after_unload", "on")
+    await hass.async_block_till_done()
+    assert "switch.after_unload" not in entry_data._exposed_entity_ids
+
+
+async def test_entry_data_description_cache(hass_platform_direct, config_entry_direct):
+    hass = hass_platform_direct
+    component: YandexSmartHome = hass.data[DOMAIN]
+    entry_data = component.get_entry_data(config_entry_direct)
+    ent_reg = entity_registry.async_get(hass)
+    dev_reg = device_registry.async_get(hass)
+    area_reg = area_registry.async_get(hass)
+    assert entry_data.description_cache is not None
+
+    async def _describe():
+        state = hass.states.get("switch.test")
+        return await Device(hass, entry_data, state.entity_id, state).describe(ent_reg, dev_reg, area_reg)
+
+    device = dev_reg.async_get_or_create(config_entry_id=config_entry_direct.entry_id, identifiers={("foo", "bar")})
+    ent_reg.async_get_or_create("switch", "test", "1234", suggested_object_id="test", device_id=device.id)
+    hass.states.async_set("switch.test", "on")
+    description = await _describe()
+    assert description is not None
+    assert description.room is None
+    assert await _describe() is description
+
+    hass.states.async_set("switch.test", "on", {"foo": "bar"})
+    assert await _describe() is not description
+    description = await _describe()
+    assert await _describe() is description
+
+    area = area_reg.async_create("Kitchen")
+    ent_reg.async_update_entity("switch.test", area_id=area.id)
+    await hass.async_block_till_done()
+    description = await _describe()
+    assert description.room == "Kitchen"
+    assert await _describe() is description
+
+    area_reg.async_update(area.id, name="Room")
+    assert (await _describe()).room == "Room"
+
+    dev_reg.async_update_device(device.id, model="Model")
+    assert (await _describe()).device_info.model == "Model | switch.test"
+
+    hass.states.async_remove("switch.test")
+    await hass.async_block_till_done()
+    assert "switch.test" not in entry_data.description_cache._descriptions
+
+    with patch.object(Device, "get_capabilities", return_value=[]), patch.object(
+        Device, "get_properties", return_value=[]
+    ):
+        hass.states.async_set("switch.test", "on")
+        assert await _describe() is None
+        assert "switch.test" not in entry_data.description_cache._descriptions
+
+
+async def test_entry_data_support_plans(hass_platform_direct, config_entry_direct):
+    hass = hass_platform_direct
+    component: YandexSmartHome = hass.data[DOMAIN]
+    entry_data = component.get_entry_data(config_entry_direct)
+    assert entry_data.support_plans == {}
+
+    def _device():
+        return Device(hass, entry_data, "light.kitchen", hass.states.get("light.kitchen"))
+
+    state = hass.states.get("light.kitchen")
+    hass.states.async_set(state.entity_id, state.state, dict(state.attributes, illuminance=50))
+    capabilities = _device().get_state_capabilities()
+    properties = _device().get_state_properties()
+    assert capabilities
+    assert properties
+    plan = entry_data.support_plans["light.kitchen"]
+
+    with patch("custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY", DomainListRegistry([])), patch(
+        "custom_components.yandex_smart_home.device.STATE_PROPERTIES_REGISTRY", DomainListRegistry([])
+    ):
+        hass.states.async_set("light.kitchen", "off", hass.states.get("light.kitchen").attributes)
+        assert _device().get_state_capabilities() == capabilities
+        assert _device().get_state_properties() == properties
+        assert entry_data.support_plans["light.kitchen"] is plan
+
+        hass.states.async_set("light.kitchen", "on", dict(hass.states.get("light.kitchen").attributes, brightness=10))
+        assert _device().get_state_capabilities() == capabilities
+        assert entry_data.support_plans["light.kitchen"] is plan
+        assert "brightness" not in plan.attributes
+
+        hass.states.async_set("light.kitchen", "off", {"foo": "bar"})
+        assert _device().get_state_capabilities() == []
+        assert _device().get_state_properties() == []
+        assert entry_data.support_plans["light.kitchen"] is not plan
+
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+    assert "light.kitchen" not in entry_data.support_plans
+
+    hass.states.async_set("media_player.tv", "on", {"supported_features": 2048, "source_list": ["a", "b"]})
+    assert len(Device(hass, entry_data, "media_player.tv", hass.states.get("media_player.tv")).get_capabilities()) == 1
+    plan = entry_data.support_plans["media_player.tv"]
+    hass.states.async_set("media_player.tv", "off", {"supported_features": 2048, "source_list": ["a", "b"]})
+    Device(hass, entry_data, "media_player.tv", hass.states.get("media_player.tv")).get_capabilities()
+    assert entry_data.support_plans["media_player.tv"] is not plan
@@ -1,22 +1,39 @@
+import asyncio
 import json
+import time
 from unittest.mock import Mock, patch
 
 from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNAVAILABLE
 from homeassistant.core import Context, State
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.template import Template
 from homeassistant.util.decorator import Registry
+import pytest
+from pytest_homeassistant_custom_component.common import async_capture_events, async_mock_service
 
 from custom_components.yandex_smart_home import YandexSmartHome, handlers
 from custom_components.yandex_smart_home.capability_onoff import OnOffCapability
 from custom_components.yandex_smart_home.capability_toggle import StateToggleCapability
-from custom_components.yandex_smart_home.const import CONF_DEVICES_DISCOVERED, DOMAIN, EVENT_DEVICE_ACTION
+from custom_components.yandex_smart_home.const import (
+    ATTR_CAPABILITY,
+    CONF_DEVICES_DISCOVERED,
+    DOMAIN,
+    EVENT_DEVICE_ACTION,
+)
+from custom_components.yandex_smart_home.device import Device
 from custom_components.yandex_smart_home.handlers import PING_REQUEST_USER_ID
-from custom_components.yandex_smart_home.helpers import APIError, RequestData
+from custom_components.yandex_smart_home.helpers import APIError, DomainListRegistry, RequestData
 from custom_components.yandex_smart_home.schema import (
     CapabilityType,
+    DeviceDescription,
+    DeviceList,
+    DeviceState,
+    DeviceStates,
+    DeviceType,
     GetStreamInstanceActionResultValue,
     OnOffCapabilityInstance,
     OnOffCapabilityInstanceActionState,
+    Response,
     ResponseCode,
     ToggleCapabilityInstance,
     ToggleCapabilityInstanceActionState,
@@ -68,6 +85,52 @@ async def test_handle_request(hass, caplog):
         }
 
 
+async def test_serialize_response(hass, caplog):
+    devices = [DeviceDescription(id=f"switch.test_{i}", name="Test", type=DeviceType.SWITCH) for i in range(3)]
+    response = Response(request_id=REQ_ID, payload=DeviceList(user_id="foo", devices=devices))
+
+    with patch.object(hass, "async_add_executor_job", wraps=hass.async_add_executor_job) as mock_executor_job:
+        assert (
+            await handlers.async_serialize_response(hass, Response(request_id=REQ_ID)) == f'{{"request_id":"{REQ_ID}"}}'
+        )
+        mock_executor_job.assert_not_called()
+
+        with patch("custom_components.yandex_smart_home.handlers.EXECUTOR_SERIALIZATION_THRESHOLD", 3):
+            assert await handlers.async_serialize_response(hass, response) == response.as_json()
+            mock_executor_job.assert_called_once_with(response.as_json)
+            mock_executor_job.reset_mock()
+
+            # descriptions are cached after the first serialization
+            assert await handlers.async_serialize_response(hass, response) == response.as_json()
+            mock_executor_job.assert_not_called()
+
+            states = Response(request_id=REQ_ID, payload=DeviceStates(devices=[DeviceState(id=d.id) for d in devices]))
+            assert await handlers.async_serialize_response(hass, states) == states.as_json()
+            mock_executor_job.assert_called_once_with(states.as_json)
+
+    assert caplog.messages[1].startswith("Response serialized in ")
+    assert "(devices to serialize: 3, event loop lag: " in caplog.messages[1]
+    assert "(devices to serialize: 0, " in caplog.messages[2]
+
+
+async def test_serialize_response_loop_lag(hass, caplog):
+    def _as_json(_):
+        time.sleep(0.02)
+        return "{}"
+
+    def _get_lag() -> float:
+        return float(caplog.messages[-1].split("event loop lag: ")[1].split(" ")[0])
+
+    response = Response(request_id=REQ_ID)
+    with patch.object(Response, "as_json", _as_json):
+        assert await handlers.async_serialize_response(hass, response) == "{}"
+        assert _get_lag() >= 20
+
+        with patch("custom_components.yandex_smart_home.handlers.EXECUTOR_SERIALIZATION_THRESHOLD", 0):
+            assert await handlers.async_serialize_response(hass, response) == "{}"
+            assert _get_lag() < 20
+
+
 async def test_handler_devices_query(hass, caplog):
     switch_1 = State("switch.test_1", STATE_OFF)
     switch_not_expose = State("switch.not_expose", STATE_ON)
@@ -76,7 +139,7 @@ async def test_handler_devices_query(hass, caplog):
     hass.states.async_set(switch_not_expose.entity_id, switch_not_expose.state, switch_not_expose.attributes)
     hass.states.async_set(sensor.entity_id, sensor.state, sensor.attributes)
 
-    entry_data = MockConfigEntryData(entity_filter=generate_entity_filter(exclude_entities=["switch.not_expose"]))
+    entry_data = MockConfigEntryData(hass, entity_filter=generate_entity_filter(exclude_entities=["switch.not_expose"]))
     data = RequestData(entry_data, Context(), PING_REQUEST_USER_ID, REQ_ID)
     payload = json.dumps(
         {"devices": [{"id": switch_1.entity_id}, {"id": switch_not_expose.entity_id}, {"id": "invalid.foo"}]}
@@ -140,6 +203,27 @@ async def test_handler_devices_discovery(hass_platform_direct):
         mock_update_entry.assert_not_called()
 
 
+@pytest.mark.parametrize("total_entities", [100, 1000, 6000])
+async def test_handler_devices_list_scales_with_exposed_entities(hass_platform_direct, total_entities):
+    hass = hass_platform_direct
+    component: YandexSmartHome = hass.data[DOMAIN]
+    entry_data = component.get_direct_connection_entry_data()
+    entry_data._entity_filter = generate_entity_filter(include_entity_globs=["switch.exposed_*"])
+
+    for i in range(total_entities):
+        object_id = f"exposed_{i}" if i < 50 else f"hidden_{i}"
+        hass.states.async_set(f"switch.{object_id}", STATE_ON)
+
+    entry_data._async_setup_exposed_entities()
+    data = RequestData(entry_data, Context(), PING_REQUEST_USER_ID, REQ_ID)
+
+    with patch("custom_components.yandex_smart_home.handlers.Device", wraps=Device) as mock_device:
+        device_list = await handlers.async_device_list(hass, data, "")
+
+    assert len(device_list.devices) == 50
+    assert mock_device.call_count == 50
+
+
 async def test_handler_devices_action(hass, caplog):
     class MockCapability(StateToggleCapability):
         @property
@@ -185,7 +269,7 @@ async def test_handler_devices_action(hass, caplog):
 
     with patch(
         "custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY",
-        [MockCapabilityA, MockCapabilityReturnState, MockCapabilityFail],
+        DomainListRegistry([MockCapabilityA, MockCapabilityReturnState, MockCapabilityFail]),
     ):
         payload = json.dumps(
             {
@@ -402,7 +486,7 @@ async def test_handler_devices_action_error_template(hass, caplog):
 
     with patch(
         "custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY",
-        [MockCapabilityA, MockCapabilityB, MockCapabilityC],
+        DomainListRegistry([MockCapabilityA, MockCapabilityB, MockCapabilityC]),
     ):
         payload = json.dumps(
             {
@@ -540,3 +624,444 @@ async def test_handler_devices_action_not_allowed(hass, caplog):
     }
 
     assert len([m for m in caplog.messages if "Bus:Handling" not in m]) == 0
+
+
+@pytest.mark.parametrize("concurrency,expected_in_flight", [(None, 3), (1, 1), (2, 2)])
+async def test_handler_devices_action_parallel(hass, concurrency, expected_in_flight):
+    in_flight: list[str] = []
+    max_in_flight = 0
+    calls: list[tuple[str, ToggleCapabilityInstance]] = []
+
+    class MockCapability(StateToggleCapability):
+        @property
+        def supported(self) -> bool:
+            return True
+
+        def get_value(self) -> bool | None:
+            return None
+
+        async def set_instance_state(self, context: Context, state: ToggleCapabilityInstanceActionState) -> None:
+            nonlocal max_in_flight
+            in_flight.append(self.device_id)
+            max_in_flight = max(max_in_flight, len(in_flight))
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            calls.append((self.device_id, self.instance))
+            in_flight.remove(self.device_id)
+
+    class MockCapabilityMute(MockCapability):
+        instance = ToggleCapabilityInstance.MUTE
+
+    class MockCapabilityPause(MockCapability):
+        instance = ToggleCapabilityInstance.PAUSE
+
+    settings = {"action_concurrency": concurrency} if concurrency else {}
+    entry_data = MockConfigEntryData(yaml_config={"settings": settings})
+    data = RequestData(entry_data, Context(), "test", REQ_ID)
+    for entity_id in ("switch.a", "switch.b", "switch.c"):
+        hass.states.async_set(entity_id, STATE_ON)
+
+    payload = json.dumps(
+        {
+            "payload": {
+                "devices": [
+                    {
+                        "id": entity_id,
+                        "capabilities": [
+                            {"type": "devices.capabilities.toggle", "state": {"instance": "mute", "value": True}},
+                            {"type": "devices.capabilities.toggle", "state": {"instance": "pause", "value": True}},
+                        ],
+                    }
+                    for entity_id in ("switch.c", "switch.a", "switch.b")
+                ]
+            }
+        }
+    )
+
+    with patch(
+        "custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY",
+        DomainListRegistry([MockCapabilityMute, MockCapabilityPause]),
+    ):
+        result = await handlers.async_devices_action(hass, data, payload)
+
+    assert max_in_flight == expected_in_flight
+    assert [d.id for d in result.devices] == ["switch.c", "switch.a", "switch.b"]
+    for device_id in ("switch.a", "switch.b", "switch.c"):
+        assert [i for d, i in calls if d == device_id] == [
+            ToggleCapabilityInstance.MUTE,
+            ToggleCapabilityInstance.PAUSE,
+        ]
+
+
+async def test_handler_devices_action_timeout(hass, caplog):
+    class MockCapability(StateToggleCapability):
+        @property
+        def supported(self) -> bool:
+            return True
+
+        def get_value(self) -> bool | None:
+            return None
+
+        async def set_instance_state(self, context: Context, state: ToggleCapabilityInstanceActionState) -> None:
+            if self.device_id == "switch.slow" and self.instance == ToggleCapabilityInstance.PAUSE:
+                await asyncio.sleep(10)
+
+    class MockCapabilityMute(MockCapability):
+        instance = ToggleCapabilityInstance.MUTE
+
+    class MockCapabilityPause(MockCapability):
+        instance = ToggleCapabilityInstance.PAUSE
+
+    class MockCapabilityBacklight(MockCapability):
+        instance = ToggleCapabilityInstance.BACKLIGHT
+
+    entry_data = MockConfigEntryData(yaml_config={"settings": {"action_timeout": 0.05}})
+    data = RequestData(entry_data, Context(), "test", REQ_ID)
+    hass.states.async_set("switch.slow", STATE_ON)
+    hass.states.async_set("switch.fast", STATE_ON)
+    events = async_capture_events(hass, EVENT_DEVICE_ACTION)
+
+    payload = json.dumps(
+        {
+            "payload": {
+                "devices": [
+                    {
+                        "id": entity_id,
+                        "capabilities": [
+                            {"type": "devices.capabilities.toggle", "state": {"instance": instance, "value": True}}
+                            for instance in ("mute", "pause", "backlight")
+                        ],
+                    }
+                    for entity_id in ("switch.slow", "switch.fast")
+                ]
+            }
+        }
+    )
+
+    with patch(
+        "custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY",
+        DomainListRegistry([MockCapabilityMute, MockCapabilityPause, MockCapabilityBacklight]),
+    ):
+        result = await handlers.async_devices_action(hass, data, payload)
+
+    assert result.as_dict()["devices"][0] == {
+        "id": "switch.slow",
+        "capabilities": [
+            {"type": "devices.capabilities.toggle", "state": {"instance": "mute", "action_result": {"status": "DONE"}}},
+            {
+                "type": "devices.capabilities.toggle",
+                "state": {
+                    "instance": "pause",
+                    "action_result": {"status": "ERROR", "error_code": "DEVICE_UNREACHABLE"},
+                },
+            },
+            {
+                "type": "devices.capabilities.toggle",
+                "state": {
+                    "instance": "backlight",
+                    "action_result": {"status": "ERROR", "error_code": "DEVICE_UNREACHABLE"},
+                },
+            },
+        ],
+    }
+    assert [c["state"]["action_result"]["status"] for c in result.as_dict()["devices"][1]["capabilities"]] == [
+        "DONE",
+        "DONE",
+        "DONE",
+    ]
+    assert "Timeout while changing state of switch.slow" in caplog.messages
+
+    await hass.async_block_till_done()
+    assert len(events) == 6
+    assert [e.data.get("error_code") for e in events if e.data["entity_id"] == "switch.slow"] == [
+        None,
+        "DEVICE_UNREACHABLE",
+        "DEVICE_UNREACHABLE",
+    ]
+
+
+async def test_handler_devices_action_batch(hass, caplog):
+    light_calls = async_mock_service(hass, "light", "turn_off")
+    switch_calls = async_mock_service(hass, "switch", "turn_off")
+    script_calls = async_mock_service(hass, "script", "custom")
+    events = async_capture_events(hass, EVENT_DEVICE_ACTION)
+
+    entry_data = MockConfigEntryData(
+        entity_config={"light.custom": {"turn_off": {"service": "script.custom"}}},
+    )
+    data = RequestData(entry_data, Context(), "test", REQ_ID)
+    for entity_id in ("light.a", "light.b", "light.c", "light.custom", "switch.a"):
+        hass.states.async_set(entity_id, STATE_ON)
+    hass.states.async_set("light.unavailable", STATE_UNAVAILABLE)
+
+    payload = json.dumps(
+        {
+            "payload": {
+                "devices": [
+                    {
+                        "id": entity_id,
+                        "capabilities": [
+                            {"type": "devices.capabilities.on_off", "state": {"instance": "on", "value": False}}
+                        ],
+                    }
+                    for entity_id in ("light.a", "switch.a", "light.custom", "light.b", "light.unavailable", "light.c")
+                ]
+            }
+        }
+    )
+
+    result = (await handlers.async_devices_action(hass, data, payload)).as_dict()
+    assert [d["id"] for d in result["devices"]] == [
+        "light.a",
+        "switch.a",
+        "light.custom",
+        "light.b",
+        "light.unavailable",
+        "light.c",
+    ]
+    for device in result["devices"]:
+        if device["id"] == "light.unavailable":
+            assert device["action_result"] == {"status": "ERROR", "error_code": "DEVICE_UNREACHABLE"}
+        else:
+            assert device["capabilities"] == [
+                {
+                    "type": "devices.capabilities.on_off",
+                    "state": {"instance": "on", "action_result": {"status": "DONE"}},
+                }
+            ]
+
+    assert len(light_calls) == 1
+    assert light_calls[0].data == {"entity_id": ["light.a", "light.b", "light.c"]}
+    assert len(switch_calls) == 1
+    assert switch_calls[0].data == {"entity_id": "switch.a"}
+    assert len(script_calls) == 1
+
+    await hass.async_block_till_done()
+    assert sorted(e.data["entity_id"] for e in events) == [
+        "light.a",
+        "light.b",
+        "light.c",
+        "light.custom",
+        "light.unavailable",
+        "switch.a",
+    ]
+
+
+@pytest.mark.parametrize("concurrency,expected_in_flight", [(None, 3), (1, 1)])
+async def test_handler_devices_action_batch_failed(hass, caplog, concurrency, expected_in_flight):
+    calls = []
+    in_flight: list[str] = []
+    max_in_flight = 0
+
+    async def _turn_off(call):
+        nonlocal max_in_flight
+        if isinstance(call.data["entity_id"], list):
+            raise HomeAssistantError("batch failed")
+
+        in_flight.append(call.data["entity_id"])
+        max_in_flight = max(max_in_flight, len(in_flight))
+        await asyncio.sleep(0)
+        in_flight.remove(call.data["entity_id"])
+
+        if call.data["entity_id"] == "light.b":
+            raise HomeAssistantError("light failed")
+
+        calls.append(call)
+
+    hass.services.async_register("light", "turn_off", _turn_off)
+    settings = {"action_concurrency": concurrency} if concurrency else {}
+    data = RequestData(MockConfigEntryData(yaml_config={"settings": settings}), Context(), "test", REQ_ID)
+    for entity_id in ("light.a", "light.b", "light.c"):
+        hass.states.async_set(entity_id, STATE_ON)
+
+    payload = json.dumps(
+        {
+            "payload": {
+                "devices": [
+                    {
+                        "id": entity_id,
+                        "capabilities": [
+                            {"type": "devices.capabilities.on_off", "state": {"instance": "on", "value": False}}
+                        ],
+                    }
+                    for entity_id in ("light.a", "light.b", "light.c")
+                ]
+            }
+        }
+    )
+
+    result = (await handlers.async_devices_action(hass, data, payload)).as_dict()
+    assert [d["capabilities"][0]["state"]["action_result"] for d in result["devices"]] == [
+        {"status": "DONE"},
+        {"status": "ERROR", "error_code": "INTERNAL_ERROR"},
+        {"status": "DONE"},
+    ]
+    assert max_in_flight == expected_in_flight
+    assert sorted(c.data["entity_id"] for c in calls) == ["light.a", "light.c"]
+    assert (
+        "Failed to call light.turn_off for light.a, light.b, light.c, retrying each device: "
+        "HomeAssistantError('batch failed')" in caplog.messages
+    )
+
+
+async def test_handler_devices_action_batch_timeout(hass, caplog):
+    async def _turn_off(_call):
+        await asyncio.sleep(10)
+
+    hass.services.async_register("light", "turn_off", _turn_off)
+    data = RequestData(
+        MockConfigEntryData(yaml_config={"settings": {"action_timeout": 0.05}}), Context(), "test", REQ_ID
+    )
+    for entity_id in ("light.a", "light.b"):
+        hass.states.async_set(entity_id, STATE_ON)
+
+    payload = json.dumps(
+        {
+            "payload": {
+                "devices": [
+                    {
+                        "id": entity_id,
+                        "capabilities": [
+                            {"type": "devices.capabilities.on_off", "state": {"instance": "on", "value": False}}
+                        ],
+                    }
+                    for entity_id in ("light.a", "light.b")
+                ]
+            }
+        }
+    )
+
+    result = (await handlers.async_devices_action(hass, data, payload)).as_dict()
+    assert [d["capabilities"][0]["state"]["action_result"] for d in result["devices"]] == [
+        {"status": "ERROR", "error_code": "DEVICE_UNREACHABLE"},
+        {"status": "ERROR", "error_code": "DEVICE_UNREACHABLE"},
+    ]
+    assert "Timeout while changing state of light.a, light.b" in caplog.messages
+
+
+async def test_handler_devices_action_deadline(hass):
+    calls: list[tuple[str, ToggleCapabilityInstance]] = []
+
+    class MockCapability(StateToggleCapability):
+        @property
+        def supported(self) -> bool:
+            return True
+
+        def get_value(self) -> bool | None:
+            return None
+
+        async def set_instance_state(self, context: Context, state: ToggleCapabilityInstanceActionState) -> None:
+            if self.device_id == "switch.slow" and self.instance == ToggleCapabilityInstance.PAUSE:
+                await asyncio.sleep(0.2)
+
+            calls.append((self.device_id, self.instance))
+
+    class MockCapabilityMute(MockCapability):
+        instance = ToggleCapabilityInstance.MUTE
+
+    class MockCapabilityPause(MockCapability):
+        instance = ToggleCapabilityInstance.PAUSE
+
+    class MockCapabilityBacklight(MockCapability):
+        instance = ToggleCapabilityInstance.BACKLIGHT
+
+    entry_data = MockConfigEntryData(
+        yaml_config={"settings": {"action_deadline": 5}},
+        entity_config={"switch.slow": {"action_deadline": 0.05}},
+    )
+    assert entry_data.get_action_deadline("switch.slow") == 0.05
+    assert entry_data.get_action_deadline("switch.fast") == 5
+
+    data = RequestData(entry_data, Context(), "test", REQ_ID)
+    hass.states.async_set("switch.slow", STATE_ON)
+    hass.states.async_set("switch.fast", STATE_ON)
+    events = async_capture_events(hass, EVENT_DEVICE_ACTION)
+
+    payload = json.dumps(
+        {
+            "payload": {
+                "devices": [
+                    {
+                        "id": entity_id,
+                        "capabilities": [
+                            {"type": "devices.capabilities.toggle", "state": {"instance": instance, "value": True}}
+                            for instance in ("mute", "pause", "backlight")
+                        ],
+                    }
+                    for entity_id in ("switch.slow", "switch.fast")
+                ]
+            }
+        }
+    )
+
+    with patch(
+        "custom_components.yandex_smart_home.device.STATE_CAPABILITIES_REGISTRY",
+        DomainListRegistry([MockCapabilityMute, MockCapabilityPause, MockCapabilityBacklight]),
+    ):
+        result = (await handlers.async_devices_action(hass, data, payload)).as_dict()
+        assert [c["state"]["action_result"] for c in result["devices"][0]["capabilities"]] == [
+            {"status": "DONE"},
+            {"status": "DONE"},
+            {"status": "ERROR", "error_code": "DEVICE_BUSY"},
+        ]
+        assert [c["state"]["action_result"] for c in result["devices"][1]["capabilities"]] == [
+            {"status": "DONE"},
+            {"status": "DONE"},
+            {"status": "DONE"},
+        ]
+        assert ("switch.slow", ToggleCapabilityInstance.PAUSE) not in calls
+
+        await hass.async_block_till_done()
+
+    assert [i for d, i in calls if d == "switch.slow"] == [
+        ToggleCapabilityInstance.MUTE,
+        ToggleCapabilityInstance.PAUSE,
+    ]
+    assert [
+        (e.data[ATTR_CAPABILITY]["state"]["instance"], e.data.get("error_code"))
+        for e in events
+        if e.data["entity_id"] == "switch.slow"
+    ] == [("mute", None), ("backlight", "DEVICE_BUSY"), ("pause", None)]
+
+
+async def test_handler_devices_action_batch_deadline(hass):
+    calls = []
+
+    async def _turn_off(call):
+        await asyncio.sleep(0.2)
+        calls.append(call)
+
+    hass.services.async_register("light", "turn_off", _turn_off)
+    entry_data = MockConfigEntryData(entity_config={"light.b": {"action_deadline": 0.05}})
+    data = RequestData(entry_data, Context(), "test", REQ_ID)
+    events = async_capture_events(hass, EVENT_DEVICE_ACTION)
+    for entity_id in ("light.a", "light.b"):
+        hass.states.async_set(entity_id, STATE_ON)
+
+    payload = json.dumps(
+        {
+            "payload": {
+                "devices": [
+                    {
+                        "id": entity_id,
+                        "capabilities": [
+                            {"type": "devices.capabilities.on_off", "state": {"instance": "on", "value": False}}
+                        ],
+                    }
+                    for entity_id in ("light.a", "light.b")
+                ]
+            }
+        }
+    )
+
+    result = (await handlers.async_devices_action(hass, data, payload)).as_dict()
+    assert [d["capabilities"][0]["state"]["action_result"] for d in result["devices"]] == [
+        {"status": "DONE"},
+        {"status": "DONE"},
+    ]
+    assert calls == []
+    assert events == []
+
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    assert [e.data["entity_id"] for e in events] == ["light.a", "light.b"]
@@ -1,13 +1,23 @@
 import asyncio
+from dataclasses import replace
 import json
 import logging
 import time
 from unittest.mock import patch
 
 from aiohttp.client_exceptions import ClientConnectionError
-from homeassistant.const import ATTR_DEVICE_CLASS, EVENT_HOMEASSISTANT_STARTED, STATE_UNAVAILABLE
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_STATE_CHANGED,
+    STATE_UNAVAILABLE,
+)
 from homeassistant.core import CoreState, State
-from homeassistant.helpers.aiohttp_client import DATA_CLIENTSESSION
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers import entity_registry
+from homeassistant.helpers.aiohttp_client import DATA_CLIENTSESSION, async_get_clientsession
+from homeassistant.helpers.event import TrackTemplateResult
 from homeassistant.helpers.template import Template
 from homeassistant.setup import async_setup_component
 import pytest
@@ -17,19 +27,43 @@ from custom_components.yandex_smart_home import DOMAIN, ConnectionType, YandexSm
 from custom_components.yandex_smart_home.capability_custom import get_custom_capability
 from custom_components.yandex_smart_home.capability_onoff import OnOffCapabilityBasic
 from custom_components.yandex_smart_home.config_flow import ConfigFlowHandler
+from custom_components.yandex_smart_home.device import Device
 from custom_components.yandex_smart_home.helpers import APIError
 from custom_components.yandex_smart_home.notifier import (
+    REPORT_STATE_HEARTBEAT,
+    REPORT_STATE_MAX_DEVICES,
+    REPORT_STATE_MAX_REQUESTS,
+    REPORT_STATE_QUEUE_SIZE,
+    REPORT_STATE_RETRY_DELAY,
+    REPORT_STATE_RETRY_MAX_DELAY,
+    STATS_LOG_INTERVAL,
     NotifierConfig,
+    NotifierPipeline,
+    NotifierPipelineStats,
+    NotifierStats,
     PendingStates,
+    ReportRateLimiter,
+    StatesSpool,
     YandexCloudNotifier,
     YandexDirectNotifier,
+    _get_retry_delay,
+    _merge_device_states,
+    _split_device_states,
 )
 from custom_components.yandex_smart_home.property_custom import ButtonPressCustomEventProperty, get_custom_property
+from custom_components.yandex_smart_home.property_event import MotionStateEventProperty
 from custom_components.yandex_smart_home.property_float import HumiditySensor, TemperatureSensor
 from custom_components.yandex_smart_home.schema import (
+    CapabilityInstanceState,
+    CapabilityInstanceStateValue,
     CapabilityType,
+    DeviceState,
     EventPropertyInstance,
     FloatPropertyInstance,
+    OnOffCapabilityInstance,
+    PropertyInstanceState,
+    PropertyInstanceStateValue,
+    PropertyType,
     RangeCapabilityInstance,
     ResponseCode,
 )
@@ -50,12 +84,12 @@ async def _async_set_state(hass, entity_id, new_state, attributes=None):
     await hass.async_block_till_done()
 
 
-async def _assert_empty_list(coro):
-    assert await coro == []
+def _assert_empty_list(states):
+    assert states == []
 
 
-async def _assert_not_empty_list(coro):
-    assert await coro != []
+def _assert_not_empty_list(states):
+    assert states != []
 
 
 async def test_notifier_setup_config_invalid(hass, hass_admin_user, config_entry_direct, caplog):
@@ -95,8 +129,10 @@ async def test_notifier_setup_not_discovered(hass, hass_admin_user, aioclient_mo
                 const.CONF_NOTIFIER_USER_ID: hass_admin_user.id,
                 const.CONF_NOTIFIER_OAUTH_TOKEN: "token",
                 const.CONF_NOTIFIER_SKILL_ID: "skill_id",
+                const.CONF_REPORT_INTERVAL: 2,
             },
         ],
+        const.CONF_SETTINGS: {const.CONF_REPORT_INTERVAL: 10},
     }
     await async_setup_component(hass, DOMAIN, {DOMAIN: yaml_config})
     component: YandexSmartHome = hass.data[DOMAIN]
@@ -118,11 +154,12 @@ async def test_notifier_setup_not_discovered(hass, hass_admin_user, aioclient_mo
         },
     )
 
-    for config_entry in [config_entry_direct, config_entry_cloud]:
+    for config_entry, report_interval in [(config_entry_direct, 2), (config_entry_cloud, 10)]:
         config_entry.add_to_hass(hass)
         await hass.config_entries.async_setup(config_entry.entry_id)
 
         assert len(component.get_entry_data(config_entry)._notifier_configs) == 1
+        assert component.get_entry_data(config_entry)._notifier_configs[0].report_interval == report_interval
         assert len(component.get_entry_data(config_entry)._notifiers) == 0
 
 
@@ -175,17 +212,19 @@ async def test_notifier_lifecycle_discovered(hass, hass_admin_user, aioclient_mo
     assert len(component.get_entry_data(config_entry_cloud)._notifiers) == 1
 
     for config_entry in [config_entry_direct, config_entry_cloud]:
+        pipeline = component.get_entry_data(config_entry)._notifier_pipeline
+        assert pipeline._notifiers == component.get_entry_data(config_entry)._notifiers
+        assert pipeline._unsub_state_changed is not None
+        assert pipeline._unsub_initial_report is not None
         for notifier in component.get_entry_data(config_entry)._notifiers:
-            assert notifier._unsub_state_changed is not None
-            assert notifier._unsub_initial_report is not None
             assert notifier._unsub_report_states is None
             assert notifier._unsub_discovery is not None
 
         await hass.config_entries.async_unload(config_entry.entry_id)
 
+        assert pipeline._unsub_state_changed is None
+        assert pipeline._unsub_initial_report is None
         for notifier in component.get_entry_data(config_entry)._notifiers:
-            assert notifier._unsub_state_changed is None
-            assert notifier._unsub_initial_report is None
             assert notifier._unsub_report_states is None
             assert notifier._unsub_discovery is None
 
@@ -218,11 +257,11 @@ async def test_notifier_postponed_setup(hass, hass_admin_user):
 
 
 async def test_notifier_format_log_message(hass):
-    direct = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, NotifierConfig(user_id="foo", skill_id="bar", token="x"), {})
+    direct = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, NotifierConfig(user_id="foo", skill_id="bar", token="x"))
     directv = YandexDirectNotifier(
-        hass, BASIC_ENTRY_DATA, NotifierConfig(user_id="ivan", skill_id="sk", token="x", verbose_log=True), {}
+        hass, BASIC_ENTRY_DATA, NotifierConfig(user_id="ivan", skill_id="sk", token="x", verbose_log=True)
     )
-    cloud = YandexCloudNotifier(hass, BASIC_ENTRY_DATA, NotifierConfig(user_id="foo", skill_id="bar", token="x"), {})
+    cloud = YandexCloudNotifier(hass, BASIC_ENTRY_DATA, NotifierConfig(user_id="foo", skill_id="bar", token="x"))
     assert direct._format_log_message("test") == "test"
     assert directv._format_log_message("test") == "test (ivan@sk)"
     assert cloud._format_log_message("test") == "test"
@@ -286,10 +325,11 @@ async def test_notifier_track_templates(hass_platform, mock_call_later, caplog):
     hass.states.async_set("sensor.button", "click")
     hass.states.async_set("sensor.float", "10")
     caplog.clear()
-    notifier = YandexDirectNotifier(hass_platform, entry_data, BASIC_CONFIG, entry_data._get_trackable_states())
-    await notifier.async_setup()
+    notifier = YandexDirectNotifier(hass_platform, entry_data, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass_platform, entry_data, [notifier], entry_data._get_trackable_states())
+    await pipeline.async_setup()
 
-    assert notifier._template_changes_tracker is not None
+    assert pipeline._template_changes_tracker is not None
     assert notifier._pending.empty is True
     assert caplog.messages[:1] == [
         "Failed to track custom property: Unsupported entity binary_sensor.foo for "
@@ -301,7 +341,7 @@ async def test_notifier_track_templates(hass_platform, mock_call_later, caplog):
     await _async_set_state(hass, "sensor.button", "click", {"foo": "bar"})
     assert notifier._pending.empty is True
     await _async_set_state(hass, "sensor.button", "double_click", {"foo": "bar"})
-    pending = await notifier._pending.async_get_all()
+    pending = notifier._pending.async_get_all()
     assert list(pending.keys()) == ["sensor.outside_temp"]
     assert len(pending["sensor.outside_temp"]) == 1
     assert pending["sensor.outside_temp"][0].get_value() == "double_click"
@@ -312,7 +352,7 @@ async def test_notifier_track_templates(hass_platform, mock_call_later, caplog):
     # float
     mock_call_later.reset_mock()
     await _async_set_state(hass, "sensor.float", "50")
-    pending = await notifier._pending.async_get_all()
+    pending = notifier._pending.async_get_all()
     assert list(pending.keys()) == ["light.kitchen", "sensor.outside_temp"]
     assert pending["light.kitchen"][0].get_value() == 50
     assert pending["light.kitchen"][0].instance == "humidity"
@@ -333,14 +373,14 @@ async def test_notifier_track_templates(hass_platform, mock_call_later, caplog):
     assert notifier._pending.empty is True
     caplog.clear()
     await _async_set_state(hass, "sensor.dishwashing", "one")
-    pending = await notifier._pending.async_get_all()
+    pending = notifier._pending.async_get_all()
     assert list(pending.keys()) == ["sensor.outside_temp"]
     assert len(pending["sensor.outside_temp"]) == 1
     assert pending["sensor.outside_temp"][0].get_value() == "fowl"
     assert (
         caplog.messages[-1]
         == "State report with value 'fowl' scheduled for <CustomModeCapability device_id=sensor.outside_temp "
-        "instance=dishwashing value_template=Template<template=(one) renders=2>>"
+        "instance=dishwashing value_template=Template<template=({{ states('sensor.dishwashing') }}) renders=0>>"
     )
     await _async_set_state(hass, "sensor.dishwashing", "unavailable")
     assert notifier._pending.empty is True
@@ -350,27 +390,88 @@ async def test_notifier_track_templates(hass_platform, mock_call_later, caplog):
 
     # toggle
     await _async_set_state(hass, "binary_sensor.pause", "off")
-    pending = await notifier._pending.async_get_all()
+    pending = notifier._pending.async_get_all()
     assert list(pending.keys()) == ["sensor.outside_temp"]
     assert len(pending["sensor.outside_temp"]) == 1
     assert pending["sensor.outside_temp"][0].get_value() is False
     await _async_set_state(hass, "binary_sensor.pause", "unavailable")
     assert notifier._pending.empty is True
     await _async_set_state(hass, "binary_sensor.pause", "on")
-    pending = await notifier._pending.async_get_all()
+    pending = notifier._pending.async_get_all()
     assert pending["sensor.outside_temp"][0].get_value() is True
 
     # range
     await _async_set_state(hass, "sensor.volume", "50")
-    pending = await notifier._pending.async_get_all()
+    pending = notifier._pending.async_get_all()
     assert list(pending.keys()) == ["sensor.outside_temp"]
     assert len(pending["sensor.outside_temp"]) == 1
     assert pending["sensor.outside_temp"][0].get_value() == 50
     await _async_set_state(hass, "sensor.volume", "unavailable")
     assert notifier._pending.empty is True
 
-    await notifier.async_unload()
-    assert notifier._template_changes_tracker is None
+    await pipeline.async_unload()
+    assert pipeline._template_changes_tracker is None
+
+
+async def test_notifier_track_templates_shared(hass, mock_call_later):
+    for i in range(30):
+        hass.states.async_set(f"sensor.t_{i}", "10")
+
+    entry_data = MockConfigEntryData(
+        hass=hass,
+        entity_config={
+            f"switch.dev_{i}": {
+                const.CONF_ENTITY_PROPERTIES: [
+                    {
+                        const.CONF_ENTITY_PROPERTY_TYPE: "temperature",
+                        const.CONF_ENTITY_PROPERTY_ENTITY: f"sensor.t_{i % 30}",
+                    },
+                ]
+            }
+            for i in range(300)
+        },
+        entity_filter=generate_entity_filter(include_entity_globs=["*"]),
+    )
+    notifier = YandexDirectNotifier(hass, entry_data, BASIC_CONFIG)
+    track_templates = entry_data._get_trackable_states()
+    assert len(track_templates) == 30
+    assert all(len(states) == 10 for states in track_templates.values())
+
+    pipeline = NotifierPipeline(hass, entry_data, [notifier], track_templates)
+    await pipeline.async_setup()
+    await hass.async_block_till_done()
+
+    with patch.object(Template, "__init__", autospec=True, side_effect=Template.__init__) as mock_template:
+        await _async_set_state(hass, "sensor.t_0", "20")
+        mock_template.assert_not_called()
+
+    pending = notifier._pending.async_get_all()
+    assert len(pending) == 10
+    assert all([s.get_value() for s in states] == [20] for states in pending.values())
+
+    template = next(iter(track_templates))
+    await pipeline._async_template_result_changed(
+        EVENT_STATE_CHANGED, [TrackTemplateResult(template, 20, TemplateError(Exception("boom")))]
+    )
+    assert notifier._pending.empty is True
+
+    template = list(track_templates)[1]
+    with patch.object(
+        type(track_templates[template][0]),
+        "new_with_template_result",
+        autospec=True,
+        side_effect=type(track_templates[template][0]).new_with_template_result,
+    ) as mock_new_with_template_result:
+        await pipeline._async_template_result_changed(
+            EVENT_STATE_CHANGED, [TrackTemplateResult(template, TemplateError(Exception("boom")), 30)]
+        )
+        assert {c.args[1] for c in mock_new_with_template_result.call_args_list} == {None, 30}
+
+    pending = notifier._pending.async_get_all()
+    assert len(pending) == 10
+    assert all([s.get_value() for s in states] == [30] for states in pending.values())
+
+    await pipeline.async_unload()
 
 
 async def test_notifier_state_changed(hass_platform, mock_call_later, caplog):
@@ -380,18 +481,22 @@ async def test_notifier_state_changed(hass_platform, mock_call_later, caplog):
         entity_filter=generate_entity_filter(exclude_entities=["switch.not_exposed"]),
     )
 
-    notifier = YandexDirectNotifier(hass_platform, entry_data, BASIC_CONFIG, entry_data._get_trackable_states())
-    await notifier.async_setup()
+    notifier = YandexDirectNotifier(hass_platform, entry_data, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass_platform, entry_data, [notifier], entry_data._get_trackable_states())
+    await pipeline.async_setup()
+
+    with patch("custom_components.yandex_smart_home.notifier.Device") as mock_device:
+        await _async_set_state(hass, "switch.not_exposed", "on")
+        await _async_set_state(hass, "switch.not_exposed", "off")
+        mock_device.assert_not_called()
 
-    await _async_set_state(hass, "switch.not_exposed", "on")
-    await _async_set_state(hass, "switch.not_exposed", "off")
     assert notifier._pending.empty is True
     assert notifier._unsub_report_states is None
 
     caplog.clear()
     mock_call_later.reset_mock()
     await _async_set_state(hass, "sensor.button", "click", {ATTR_DEVICE_CLASS: "button"})
-    pending = await notifier._pending.async_get_all()
+    pending = notifier._pending.async_get_all()
     assert list(pending.keys()) == ["sensor.button"]
     assert len(pending["sensor.button"]) == 1
     assert pending["sensor.button"][0].get_value() == "click"
@@ -403,14 +508,14 @@ async def test_notifier_state_changed(hass_platform, mock_call_later, caplog):
     assert notifier._unsub_report_states is not None
 
     await _async_set_state(hass, "binary_sensor.front_door", "off", {ATTR_DEVICE_CLASS: "door"})
-    pending = await notifier._pending.async_get_all()
+    pending = notifier._pending.async_get_all()
     assert list(pending.keys()) == ["binary_sensor.front_door"]
     assert len(pending["binary_sensor.front_door"]) == 1
     assert pending["binary_sensor.front_door"][0].get_value() == "closed"
 
     light_state = hass.states.get("light.kitchen")
     await _async_set_state(hass, light_state.entity_id, "off", light_state.attributes)
-    pending = await notifier._pending.async_get_all()
+    pending = notifier._pending.async_get_all()
     assert list(pending.keys()) == ["light.kitchen"]
     assert len(pending["light.kitchen"]) == 1
     assert pending["light.kitchen"][0].get_value() is False
@@ -422,7 +527,309 @@ async def test_notifier_state_changed(hass_platform, mock_call_later, caplog):
     hass.states.async_remove("light.kitchen")
     assert notifier._pending.empty is True
 
-    await notifier.async_unload()
+    await pipeline.async_unload()
+
+
+async def test_notifier_pipeline_fan_out(hass_platform, mock_call_later):
+    hass = hass_platform
+    entry_data = MockConfigEntryData(hass=hass, entity_filter=generate_entity_filter(include_entity_globs=["*"]))
+    notifiers = [
+        YandexDirectNotifier(hass, entry_data, BASIC_CONFIG),
+        YandexDirectNotifier(hass, entry_data, replace(BASIC_CONFIG, skill_id="foo")),
+    ]
+    pipeline = NotifierPipeline(hass, entry_data, notifiers, entry_data._get_trackable_states())
+    await pipeline.async_setup()
+    mock_call_later.reset_mock()
+
+    light_state = hass.states.get("light.kitchen")
+    with patch("custom_components.yandex_smart_home.notifier.Device", wraps=Device) as mock_device:
+        await _async_set_state(hass, "light.kitchen", "off", light_state.attributes)
+        assert mock_device.call_count == 2
+
+    pending = [notifier._pending.async_get_all() for notifier in notifiers]
+    assert [s.instance for s in pending[0]["light.kitchen"]] == ["on"]
+    assert pending[0] == pending[1]
+    assert mock_call_later.call_count == 2
+    assert pipeline._stats == NotifierPipelineStats(state_changes=1, state_changes_skipped=0)
+
+    notifiers[0]._rate_limiter.reported("light.kitchen", hass.loop.time(), 10)
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+    assert notifiers[0]._rate_limiter.get_delay("light.kitchen", hass.loop.time()) == 0
+
+    await pipeline.async_unload()
+
+
+async def test_notifier_state_changed_watched_attributes(hass_platform, mock_call_later):
+    hass = hass_platform
+    entry_data = MockConfigEntryData(hass=hass, entity_filter=generate_entity_filter(include_entity_globs=["*"]))
+    notifier = YandexDirectNotifier(hass_platform, entry_data, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass_platform, entry_data, [notifier], entry_data._get_trackable_states())
+    await pipeline.async_setup()
+
+    light_state = hass.states.get("light.kitchen")
+    await _async_set_state(hass, "light.kitchen", "on", {**light_state.attributes, "linkquality": 10})
+    assert notifier._pending.empty is True
+    assert "brightness" in pipeline._watched_attributes["light.kitchen"]
+    assert "linkquality" not in pipeline._watched_attributes["light.kitchen"]
+    assert pipeline._stats == NotifierPipelineStats(state_changes=1, state_changes_skipped=0)
+
+    with patch("custom_components.yandex_smart_home.notifier.Device") as mock_device:
+        await _async_set_state(hass, "light.kitchen", "on", {**light_state.attributes, "linkquality": 20})
+        await _async_set_state(hass, "light.kitchen", "on", {**light_state.attributes, "hs_color": (0, 0)})
+        mock_device.assert_not_called()
+
+    assert notifier._pending.empty is True
+    assert pipeline._stats == NotifierPipelineStats(state_changes=3, state_changes_skipped=2)
+
+    await _async_set_state(hass, "light.kitchen", "on", {**light_state.attributes, "brightness": 51})
+    pending = notifier._pending.async_get_all()
+    assert [s.instance for s in pending["light.kitchen"]] == ["brightness"]
+    assert pending["light.kitchen"][0].get_value() == 20
+    assert pipeline._stats == NotifierPipelineStats(state_changes=4, state_changes_skipped=2)
+
+    await _async_set_state(hass, "light.kitchen", "off", {**light_state.attributes, "brightness": 51})
+    pending = notifier._pending.async_get_all()
+    assert [s.instance for s in pending["light.kitchen"]] == ["on"]
+    assert pipeline._stats == NotifierPipelineStats(state_changes=5, state_changes_skipped=2)
+
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+    assert "light.kitchen" not in pipeline._watched_attributes
+
+    await pipeline.async_unload()
+
+
+async def test_notifier_state_changed_support_plan(hass_platform, mock_call_later):
+    hass = hass_platform
+    entry_data = MockConfigEntryData(hass=hass, entity_filter=generate_entity_filter(include_entity_globs=["*"]))
+    entry_data.support_plans = {}
+    notifier = YandexDirectNotifier(hass_platform, entry_data, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass_platform, entry_data, [notifier], entry_data._get_trackable_states())
+    await pipeline.async_setup()
+
+    light_state = hass.states.get("light.kitchen")
+    await _async_set_state(hass, "light.kitchen", "on", {**light_state.attributes, "brightness": 51})
+    plan = entry_data.support_plans["light.kitchen"]
+    assert plan.attributes is not None
+    assert "supported_color_modes" in plan.attributes
+    assert "supported_color_modes" in pipeline._watched_attributes["light.kitchen"]
+    assert "brightness" in pipeline._watched_attributes["light.kitchen"]
+    notifier._pending.async_get_all()
+
+    for brightness in (77, 102):
+        await _async_set_state(hass, "light.kitchen", "on", {**light_state.attributes, "brightness": brightness})
+        assert entry_data.support_plans["light.kitchen"] is plan
+        assert "supported_color_modes" in pipeline._watched_attributes["light.kitchen"]
+        assert [s.instance for s in notifier._pending.async_get_all()["light.kitchen"]] == ["brightness"]
+
+    await _async_set_state(
+        hass, "light.kitchen", "on", {**light_state.attributes, "brightness": 102, "supported_color_modes": ["onoff"]}
+    )
+    assert entry_data.support_plans["light.kitchen"] is not plan
+    assert pipeline._stats.state_changes_skipped == 0
+
+    await pipeline.async_unload()
+
+
+async def test_notifier_state_changed_last_states(hass_platform, mock_call_later):
+    hass = hass_platform
+    entry_data = MockConfigEntryData(hass=hass, entity_filter=generate_entity_filter(include_entity_globs=["*"]))
+    notifier = YandexDirectNotifier(hass_platform, entry_data, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass_platform, entry_data, [notifier], entry_data._get_trackable_states())
+    await pipeline.async_setup()
+
+    light_state = hass.states.get("light.kitchen")
+    light_attributes = dict(light_state.attributes)
+    with patch("custom_components.yandex_smart_home.notifier.Device", wraps=Device) as mock_device:
+        await _async_set_state(hass, "light.kitchen", "off", light_attributes)
+        assert mock_device.call_count == 2
+        assert [s.instance for s in notifier._pending.async_get_all()["light.kitchen"]] == ["on"]
+
+        mock_device.reset_mock()
+        await _async_set_state(hass, "light.kitchen", "on", light_attributes)
+        assert mock_device.call_count == 1
+        assert [s.instance for s in notifier._pending.async_get_all()["light.kitchen"]] == ["on"]
+
+    await _async_set_state(hass, "light.kitchen", STATE_UNAVAILABLE, light_attributes)
+    await _async_set_state(hass, "light.kitchen", "on", light_attributes)
+    assert notifier._pending.empty is True
+
+    await _async_set_state(hass, "light.kitchen", "on", {**light_attributes, "brightness": None})
+    await _async_set_state(hass, "light.kitchen", "on", light_attributes)
+    assert notifier._pending.empty is True
+
+    await _async_set_state(hass, "light.kitchen", "on", {**light_attributes, "brightness": 51})
+    assert [s.get_value() for s in notifier._pending.async_get_all()["light.kitchen"]] == [20]
+
+    for value in ["click", "", "click", STATE_UNAVAILABLE, "click"]:
+        await _async_set_state(hass, "sensor.button", value, {ATTR_DEVICE_CLASS: "button"})
+        if value == "click":
+            assert [s.get_value() for s in notifier._pending.async_get_all()["sensor.button"]] == ["click"]
+        else:
+            assert notifier._pending.empty is True
+
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+    assert "light.kitchen" not in pipeline._last_states
+
+    await pipeline.async_unload()
+
+
+async def test_notifier_state_removed(hass_platform_direct, config_entry_direct, mock_call_later):
+    hass = hass_platform_direct
+    component: YandexSmartHome = hass.data[DOMAIN]
+    entry_data = component.get_entry_data(config_entry_direct)
+    assert entry_data._exposed_entity_ids is not None
+    notifier = YandexDirectNotifier(hass, entry_data, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass, entry_data, [notifier], entry_data._get_trackable_states())
+    await pipeline.async_setup()
+
+    light_state = hass.states.get("light.kitchen")
+    await _async_set_state(hass, "light.kitchen", "on", {**light_state.attributes, "brightness": 51})
+    assert "light.kitchen" in pipeline._last_states
+    assert "light.kitchen" in pipeline._watched_attributes
+
+    with patch.object(notifier, "async_forget_device") as mock_forget_device:
+        hass.states.async_remove("light.kitchen")
+        await hass.async_block_till_done()
+        mock_forget_device.assert_called_once_with("light.kitchen")
+
+    assert entry_data.is_exposed_entity("light.kitchen") is False
+    assert "light.kitchen" not in pipeline._last_states
+    assert "light.kitchen" not in pipeline._suppressed_states
+    assert "light.kitchen" not in pipeline._watched_attributes
+
+    await pipeline.async_unload()
+
+
+async def test_notifier_state_readded(hass_platform_direct, config_entry_direct, mock_call_later):
+    hass = hass_platform_direct
+    component: YandexSmartHome = hass.data[DOMAIN]
+    entry_data = component.get_entry_data(config_entry_direct)
+    notifier = YandexDirectNotifier(hass, entry_data, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass, entry_data, [notifier], entry_data._get_trackable_states())
+    entry_data._notifier_pipeline = pipeline
+    await pipeline.async_setup()
+
+    light_attributes = {**hass.states.get("light.kitchen").attributes, "brightness": 51}
+    await _async_set_state(hass, "light.kitchen", "on", light_attributes)
+    assert [s.get_value() for s in notifier._pending.async_get_all()["light.kitchen"]] == [20]
+
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+    await _async_set_state(hass, "light.kitchen", "on", light_attributes)
+    pending = notifier._pending.async_get_all()
+    assert ("brightness", 20) in [(s.instance, s.get_value()) for s in pending["light.kitchen"]]
+    assert ("on", True) in [(s.instance, s.get_value()) for s in pending["light.kitchen"]]
+
+    ent_reg = entity_registry.async_get(hass)
+    ent_reg.async_get_or_create("switch", "test", "1234", suggested_object_id="registry")
+    await _async_set_state(hass, "switch.registry", "on")
+    assert "switch.registry" in pipeline._last_states
+
+    ent_reg.async_remove("switch.registry")
+    await hass.async_block_till_done()
+    assert "switch.registry" not in pipeline._last_states
+    assert "switch.registry" not in pipeline._watched_attributes
+
+    entry_data._notifier_pipeline = None
+    await pipeline.async_unload()
+
+
+async def test_notifier_state_changed_deadband(hass_platform, mock_call_later):
+    hass = hass_platform
+    entry_data = MockConfigEntryData(
+        hass=hass,
+        yaml_config={const.CONF_SETTINGS: {const.CONF_DEADBAND: {"power": {const.CONF_DEADBAND_RELATIVE: 10}}}},
+        entity_filter=generate_entity_filter(include_entity_globs=["*"]),
+    )
+    notifier = YandexDirectNotifier(hass_platform, entry_data, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass_platform, entry_data, [notifier], entry_data._get_trackable_states())
+    await pipeline.async_setup()
+
+    attributes = {ATTR_DEVICE_CLASS: "power", ATTR_UNIT_OF_MEASUREMENT: "W"}
+    await _async_set_state(hass, "sensor.power", "100", attributes)
+    assert notifier._pending.async_get_all()["sensor.power"][0].get_value() == 100
+
+    mock_call_later.reset_mock()
+    for value in ["105", "91", "109"]:
+        await _async_set_state(hass, "sensor.power", value, attributes)
+        assert notifier._pending.empty is True
+
+    assert pipeline._suppressed_states["sensor.power"]
+    assert [c[1]["delay"] for c in mock_call_later.call_args_list] == [REPORT_STATE_HEARTBEAT]
+    assert pipeline._unsub_heartbeat is not None
+
+    await _async_set_state(hass, "sensor.power", "111", attributes)
+    assert notifier._pending.async_get_all()["sensor.power"][0].get_value() == 111
+    assert "sensor.power" not in pipeline._suppressed_states
+
+    await _async_set_state(hass, "sensor.power", "115", attributes)
+    assert notifier._pending.empty is True
+
+    pipeline._async_heartbeat()
+    assert notifier._pending.async_get_all()["sensor.power"][0].get_value() == 115
+    assert pipeline._suppressed_states == {}
+    assert pipeline._unsub_heartbeat is None
+
+    await _async_set_state(hass, "sensor.power", "120", attributes)
+    assert notifier._pending.empty is True
+    await _async_set_state(hass, "sensor.power", "127", attributes)
+    assert notifier._pending.async_get_all()["sensor.power"][0].get_value() == 127
+
+    await pipeline.async_unload()
+
+
+async def test_notifier_track_templates_deadband(hass_platform, mock_call_later):
+    hass = hass_platform
+    hass.states.async_set("sensor.t", "10")
+    entry_data = MockConfigEntryData(
+        hass=hass,
+        yaml_config={const.CONF_SETTINGS: {const.CONF_DEADBAND: {"temperature": {const.CONF_DEADBAND_ABSOLUTE: 1}}}},
+        entity_config={
+            "switch.dev": {
+                const.CONF_ENTITY_PROPERTIES: [
+                    {
+                        const.CONF_ENTITY_PROPERTY_TYPE: "temperature",
+                        const.CONF_ENTITY_PROPERTY_ENTITY: "sensor.t",
+                    },
+                ]
+            },
+        },
+        entity_filter=generate_entity_filter(include_entity_globs=["*"]),
+    )
+    notifier = YandexDirectNotifier(hass, entry_data, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass, entry_data, [notifier], entry_data._get_trackable_states())
+    await pipeline.async_setup()
+    await hass.async_block_till_done()
+
+    mock_call_later.reset_mock()
+    for value in ["10.5", "10.8"]:
+        await _async_set_state(hass, "sensor.t", value)
+        assert notifier._pending.empty is True
+
+    assert pipeline._suppressed_states["switch.dev"]
+    assert [c[1]["delay"] for c in mock_call_later.call_args_list] == [REPORT_STATE_HEARTBEAT]
+
+    # a slow drift is compared with the last reported value
+    await _async_set_state(hass, "sensor.t", "11.2")
+    assert notifier._pending.async_get_all()["switch.dev"][0].get_value() == 11.2
+    assert "switch.dev" not in pipeline._suppressed_states
+
+    for value in ["11.5", "11.9", "12"]:
+        await _async_set_state(hass, "sensor.t", value)
+        assert notifier._pending.empty is True
+
+    pipeline._async_heartbeat()
+    assert notifier._pending.async_get_all()["switch.dev"][0].get_value() == 12
+
+    await _async_set_state(hass, "sensor.t", "12.5")
+    assert notifier._pending.empty is True
+    await _async_set_state(hass, "sensor.t", "13")
+    assert notifier._pending.async_get_all()["switch.dev"][0].get_value() == 13
+
+    await pipeline.async_unload()
 
 
 async def test_notifier_initial_report(hass_platform, mock_call_later, caplog):
@@ -440,17 +847,18 @@ async def test_notifier_initial_report(hass_platform, mock_call_later, caplog):
         },
         entity_filter=generate_entity_filter(exclude_entities=["switch.test"]),
     )
-    notifier = YandexDirectNotifier(hass_platform, entry_data, BASIC_CONFIG, entry_data._get_trackable_states())
+    notifier = YandexDirectNotifier(hass_platform, entry_data, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass_platform, entry_data, [notifier], entry_data._get_trackable_states())
 
     hass_platform.states.async_set("switch.test", "on")
     hass_platform.states.async_set(
         "sensor.button", "on", {ATTR_DEVICE_CLASS: const.DEVICE_CLASS_BUTTON, "last_action": "click"}
     )
 
-    await notifier._async_initial_report()
+    await pipeline._async_initial_report()
     mock_call_later.assert_called_once()
 
-    devices = await notifier._pending.async_get_all()
+    devices = notifier._pending.async_get_all()
     assert list(devices.keys()) == ["sensor.outside_temp", "light.kitchen"]
 
     sensor_states = [s.get_instance_state().as_dict() for s in devices["sensor.outside_temp"]]
@@ -470,7 +878,7 @@ async def test_notifier_initial_report(hass_platform, mock_call_later, caplog):
 
 
 async def test_notifier_send_callback_exception(hass, caplog):
-    notifier = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG, {})
+    notifier = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG)
 
     with patch.object(notifier._session, "post", side_effect=ClientConnectionError()):
         caplog.clear()
@@ -486,7 +894,7 @@ async def test_notifier_send_callback_exception(hass, caplog):
 
 
 async def test_notifier_send_direct(hass, aioclient_mock, caplog):
-    notifier = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG, {})
+    notifier = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG)
     token = BASIC_CONFIG.token
     skill_id = BASIC_CONFIG.skill_id
     user_id = BASIC_CONFIG.user_id
@@ -512,7 +920,7 @@ async def test_notifier_send_direct(hass, aioclient_mock, caplog):
         status=202,
         json={"request_id": REQ_ID, "status": "ok"},
     )
-    await notifier._pending.async_add(
+    notifier._pending.async_add(
         [ButtonPressCustomEventProperty(hass, BASIC_ENTRY_DATA, {}, "btn", Template("click", hass))],
         [],
     )
@@ -574,7 +982,7 @@ async def test_notifier_send_cloud(hass, aioclient_mock, caplog):
     await async_setup_component(hass, DOMAIN, {})
     entry_data = MockConfigEntryData(hass, BASIC_ENTRY_DATA.entry)
 
-    notifier = YandexCloudNotifier(hass, entry_data, BASIC_CONFIG, {})
+    notifier = YandexCloudNotifier(hass, entry_data, BASIC_CONFIG)
     token = BASIC_CONFIG.token
     user_id = BASIC_CONFIG.user_id
     now = time.time()
@@ -600,7 +1008,7 @@ async def test_notifier_send_cloud(hass, aioclient_mock, caplog):
         status=202,
         json={"request_id": REQ_ID, "status": "ok"},
     )
-    await notifier._pending.async_add(
+    notifier._pending.async_add(
         [ButtonPressCustomEventProperty(hass, BASIC_ENTRY_DATA, {}, "btn", Template("click", hass))],
         [],
     )
@@ -670,7 +1078,7 @@ async def test_notifier_report_states(hass, mock_call_later, aioclient_mock, cap
         def get_value(self) -> bool | None:
             raise APIError(ResponseCode.INTERNAL_ERROR, "api error prop")
 
-    notifier = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG, {})
+    notifier = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG)
     skill_id = BASIC_CONFIG.skill_id
     user_id = BASIC_CONFIG.user_id
     now = time.time()
@@ -685,11 +1093,11 @@ async def test_notifier_report_states(hass, mock_call_later, aioclient_mock, cap
     assert aioclient_mock.call_count == 0
     assert notifier._unsub_report_states is None
 
-    await notifier._pending.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.on", "on"))], [])
-    await notifier._pending.async_add([MockCapabilityFail(hass, BASIC_ENTRY_DATA, State("switch.fail", "on"))], [])
-    await notifier._pending.async_add([TemperatureSensor(hass, BASIC_ENTRY_DATA, State("sensor.temperature", "5"))], [])
-    await notifier._pending.async_add([HumiditySensor(hass, BASIC_ENTRY_DATA, State("sensor.temperature", "5"))], [])
-    await notifier._pending.async_add([MockPropertyFail(hass, BASIC_ENTRY_DATA, State("sensor.fail", "5"))], [])
+    notifier._pending.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.on", "on"))], [])
+    notifier._pending.async_add([MockCapabilityFail(hass, BASIC_ENTRY_DATA, State("switch.fail", "on"))], [])
+    notifier._pending.async_add([TemperatureSensor(hass, BASIC_ENTRY_DATA, State("sensor.temperature", "5"))], [])
+    notifier._pending.async_add([HumiditySensor(hass, BASIC_ENTRY_DATA, State("sensor.temperature", "5"))], [])
+    notifier._pending.async_add([MockPropertyFail(hass, BASIC_ENTRY_DATA, State("sensor.fail", "5"))], [])
 
     assert notifier._pending.empty is False
     with patch("time.time", return_value=now):
@@ -721,20 +1129,384 @@ async def test_notifier_report_states(hass, mock_call_later, aioclient_mock, cap
         "ts": now,
     }
 
-    with patch.object(notifier._pending, "async_get_all", return_value=notifier._pending._device_states):
-        await notifier._pending.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.on", "on"))], [])
+    with patch.object(notifier._pending, "async_get", return_value={}):
+        notifier._pending.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.on", "on"))], [])
         await notifier._async_report_states()
         await hass.async_block_till_done()
         assert notifier._pending.empty is False
         assert notifier._unsub_report_states is not None
 
 
+async def test_notifier_report_states_rate_limit(hass, mock_call_later, aioclient_mock):
+    entry_data = MockConfigEntryData(
+        hass=hass,
+        entity_config={"switch.slow": {const.CONF_REPORT_INTERVAL: 30}},
+    )
+    notifier = YandexDirectNotifier(hass, entry_data, replace(BASIC_CONFIG, report_interval=5))
+    aioclient_mock.post(
+        f"https://dialogs.yandex.net/api/v1/skills/{BASIC_CONFIG.skill_id}/callback/state",
+        status=202,
+        json={"request_id": REQ_ID, "status": "ok"},
+    )
+
+    def _add_states():
+        notifier._pending.async_add([OnOffCapabilityBasic(hass, entry_data, State("switch.fast", "on"))], [])
+        notifier._pending.async_add([OnOffCapabilityBasic(hass, entry_data, State("switch.slow", "on"))], [])
+        notifier._schedule_report_states()
+
+    now = hass.loop.time()
+    with patch.object(hass.loop, "time", return_value=now):
+        _add_states()
+        assert mock_call_later.call_args[1]["delay"] == 1
+
+        await notifier._async_report_states()
+        await hass.async_block_till_done()
+        assert aioclient_mock.call_count == 1
+        assert notifier._rate_limiter.get_delay("switch.fast", now) == 5
+        assert notifier._rate_limiter.get_delay("switch.slow", now) == 30
+        assert notifier._unsub_report_states is None
+
+        mock_call_later.reset_mock()
+        _add_states()
+        assert mock_call_later.call_args[1]["delay"] == 5
+
+        notifier._pending.async_add(
+            [MotionStateEventProperty(hass, entry_data, State("binary_sensor.motion", "on"))],
+            [MotionStateEventProperty(hass, entry_data, State("binary_sensor.motion", "off"))],
+        )
+        notifier._schedule_report_states()
+        assert mock_call_later.call_count == 2
+        assert mock_call_later.call_args[1]["delay"] == 0
+
+        await notifier._async_report_states()
+        await hass.async_block_till_done()
+        assert aioclient_mock.call_count == 2
+        assert list(notifier._pending.device_ids) == ["switch.fast", "switch.slow"]
+        assert mock_call_later.call_args[1]["delay"] == 5
+
+    with patch.object(hass.loop, "time", return_value=now + 5):
+        await notifier._async_report_states()
+        await hass.async_block_till_done()
+        assert aioclient_mock.call_count == 3
+        assert list(notifier._pending.device_ids) == ["switch.slow"]
+        assert notifier._rate_limiter.get_delay("switch.fast", now + 5) == 10
+        assert mock_call_later.call_args[1]["delay"] == 25
+
+
+async def test_notifier_report_rate_limiter():
+    limiter = ReportRateLimiter(max_interval=10)
+    assert limiter.get_delay("switch.test", 0) == 0
+
+    limiter.reported("switch.test", 0, 1)
+    assert limiter.get_delay("switch.test", 0.5) == 0.5
+    assert limiter.get_delay("switch.test", 2) == 0
+
+    for now, interval in [(1, 2), (3, 4), (7, 8), (15, 10), (25, 10)]:
+        limiter.reported("switch.test", now, 1)
+        assert limiter.get_delay("switch.test", now) == interval
+
+    limiter.reported("switch.test", 100, 1)
+    assert limiter.get_delay("switch.test", 100) == 1
+
+    limiter.reported("switch.slow", 0, 30)
+    limiter.reported("switch.slow", 30, 30)
+    assert limiter.get_delay("switch.slow", 30) == 30
+
+    limiter.forget("switch.test")
+    assert limiter.get_delay("switch.test", 100) == 0
+
+
+async def test_notifier_pending_states_get(hass):
+    ps = PendingStates()
+    ps.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.test", "on"))], [])
+    ps.async_add([TemperatureSensor(hass, BASIC_ENTRY_DATA, State("sensor.test", "5"))], [])
+    for device_id in ["sensor.test", "binary_sensor.motion"]:
+        ps.async_add(
+            [MotionStateEventProperty(hass, BASIC_ENTRY_DATA, State(device_id, "on"))],
+            [MotionStateEventProperty(hass, BASIC_ENTRY_DATA, State(device_id, "off"))],
+        )
+
+    pending = ps.async_get(lambda device_id: device_id == "switch.test")
+    assert {device_id: [s.instance for s in states] for device_id, states in pending.items()} == {
+        "switch.test": ["on"],
+        "sensor.test": ["motion"],
+        "binary_sensor.motion": ["motion"],
+    }
+    assert list(ps.device_ids) == ["sensor.test"]
+    assert ps.time_sensitive is False
+    assert ps.async_get(lambda _: False) == {}
+
+    pending = ps.async_get(lambda _: True)
+    assert [s.instance for s in pending["sensor.test"]] == ["temperature"]
+    assert ps.empty is True
+
+
+async def test_notifier_report_states_chunks(hass, mock_call_later):
+    notifier = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG)
+    in_flight, max_in_flight, sent = 0, 0, []
+
+    async def _async_send_request(url, request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(in_flight, max_in_flight)
+        await asyncio.sleep(0)
+        sent.append([d.id for d in request.payload.devices])
+        in_flight -= 1
+
+    with patch.object(notifier, "_async_send_request", side_effect=_async_send_request):
+        for i in range(REPORT_STATE_MAX_DEVICES * 3 + 1):
+            notifier._pending.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State(f"switch.{i}", "on"))], [])
+        await notifier._async_report_states()
+
+        assert notifier._stats.send_queue_depth == 4
+        assert notifier._send_workers == REPORT_STATE_MAX_REQUESTS
+
+        notifier._pending.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.0", "off"))], [])
+        notifier._rate_limiter.forget("switch.0")
+        await notifier._async_report_states()
+        assert list(notifier._pending.device_ids) == ["switch.0"]
+        assert notifier._stats.send_queue_depth == 4
+
+        await hass.async_block_till_done()
+        assert notifier._send_workers == 0
+        assert notifier._stats.send_queue_depth == 0
+        assert notifier._stats.send_queue_max_depth == 4
+        assert notifier._stats.requests_sent == 4
+
+        await notifier._async_report_states()
+        await hass.async_block_till_done()
+
+    assert [len(devices) for devices in sent] == [REPORT_STATE_MAX_DEVICES] * 3 + [1, 1]
+    assert sent[-1] == ["switch.0"]
+    assert max_in_flight == REPORT_STATE_MAX_REQUESTS
+    assert notifier._stats.requests_sent == 5
+    assert notifier._pending.empty is True
+
+
+async def test_notifier_report_states_queue_limit(hass, mock_call_later):
+    notifier = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG)
+    sent = []
+
+    async def _async_send_request(url, request):
+        sent.append(len(request.payload.devices))
+
+    with patch.object(notifier, "_async_send_request", side_effect=_async_send_request):
+        for i in range(REPORT_STATE_QUEUE_SIZE * REPORT_STATE_MAX_DEVICES + 10):
+            notifier._pending.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State(f"switch.{i}", "on"))], [])
+
+        await notifier._async_report_states()
+        assert notifier._stats.send_queue_max_depth == REPORT_STATE_QUEUE_SIZE
+        assert len(notifier._pending.device_ids) == 10
+        await hass.async_block_till_done()
+
+        await notifier._async_report_states()
+        await hass.async_block_till_done()
+
+    assert sent == [REPORT_STATE_MAX_DEVICES] * REPORT_STATE_QUEUE_SIZE + [10]
+    assert notifier._pending.empty is True
+
+
+async def test_notifier_stats_request_time():
+    stats = NotifierStats()
+    assert stats.request_time_avg == 0
+
+    stats.track_request(0.5)
+    stats.track_request(0.1)
+    assert stats.requests_sent == 2
+    assert stats.request_time_last == 0.1
+    assert stats.request_time_max == 0.5
+    assert stats.request_time_avg == pytest.approx(0.3)
+
+
+async def test_notifier_log_stats(hass, mock_call_later, caplog):
+    notifier = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG)
+    pipeline = NotifierPipeline(hass, BASIC_ENTRY_DATA, [notifier], {})
+    notifier.stats.track_request(0.5)
+    notifier.stats.requests_failed = 1
+    notifier.stats.send_queue_max_depth = 3
+    pipeline.stats.state_changes = 10
+    pipeline.stats.state_changes_skipped = 4
+
+    with patch("custom_components.yandex_smart_home.notifier.async_track_time_interval") as mock_track_time_interval:
+        await pipeline.async_setup()
+        assert mock_track_time_interval.call_args[0][1:] == (pipeline._async_log_stats, STATS_LOG_INTERVAL)
+
+    caplog.set_level(logging.INFO)
+    pipeline._async_log_stats()
+    assert caplog.messages == []
+
+    caplog.set_level(logging.DEBUG)
+    pipeline._async_log_stats()
+    assert caplog.messages == [
+        "Notifier pipeline stats: state changes 10, skipped by watched attributes 4",
+        "Notifier stats: queue depth 0 (max 3), requests sent 1, failed 1, "
+        "request time 0.500s (avg 0.500s, max 0.500s)",
+    ]
+
+    await pipeline.async_unload()
+
+
+async def test_notifier_report_states_retry(hass, aioclient_mock, mock_call_later):
+    notifier = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG)
+    url = f"https://dialogs.yandex.net/api/v1/skills/{BASIC_CONFIG.skill_id}/callback/state"
+    await notifier.async_setup()
+    mock_call_later.reset_mock()
+
+    aioclient_mock.post(url, status=500, content=b"ERROR")
+    notifier._pending.async_add(
+        [
+            OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.a", "on")),
+            OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.b", "on")),
+        ],
+        [],
+    )
+    with patch("custom_components.yandex_smart_home.notifier.random.uniform", return_value=0):
+        await notifier._async_report_states()
+        await hass.async_block_till_done()
+
+    assert aioclient_mock.call_count == 1
+    assert notifier._stats.requests_failed == 1
+    assert notifier._spool.empty is False
+    assert notifier._retry_attempt == 1
+    assert mock_call_later.call_args[1]["delay"] == REPORT_STATE_RETRY_DELAY / 2
+    assert mock_call_later.call_args[1]["action"].target == notifier._async_retry
+    mock_call_later.reset_mock()
+
+    notifier._pending.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.a", "off"))], [])
+    notifier._rate_limiter.forget("switch.a")
+    await notifier._async_report_states()
+    await hass.async_block_till_done()
+
+    assert aioclient_mock.call_count == 2
+    assert notifier._stats.requests_failed == 2
+    assert notifier._retry_attempt == 1
+    assert mock_call_later.call_count == 0
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.post(url, status=202, json={"request_id": REQ_ID, "status": "ok"})
+    notifier._async_retry()
+    assert mock_call_later.call_args[1]["delay"] == 0
+    await notifier._async_report_states()
+    await hass.async_block_till_done()
+
+    assert aioclient_mock.call_count == 1
+    assert json.loads(aioclient_mock.mock_calls[0][2]._value)["payload"]["devices"] == [
+        {
+            "id": "switch.b",
+            "capabilities": [{"type": "devices.capabilities.on_off", "state": {"instance": "on", "value": True}}],
+        },
+        {
+            "id": "switch.a",
+            "capabilities": [{"type": "devices.capabilities.on_off", "state": {"instance": "on", "value": False}}],
+        },
+    ]
+    assert notifier._spool.empty is True
+    assert notifier._retry_attempt == 0
+    assert notifier._retry_due is False
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.post(url, status=400, json={"request_id": REQ_ID, "status": "error", "error_message": "bad"})
+    notifier._pending.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.c", "on"))], [])
+    await notifier._async_report_states()
+    await hass.async_block_till_done()
+
+    assert aioclient_mock.call_count == 1
+    assert notifier._spool.empty is True
+
+    await notifier.async_unload()
+
+
+async def test_notifier_states_spool():
+    spool = StatesSpool()
+    on = CapabilityInstanceState(
+        type=CapabilityType.ON_OFF, state=CapabilityInstanceStateValue(instance=OnOffCapabilityInstance.ON, value=True)
+    )
+    off = CapabilityInstanceState(
+        type=CapabilityType.ON_OFF, state=CapabilityInstanceStateValue(instance=OnOffCapabilityInstance.ON, value=False)
+    )
+    temperature = PropertyInstanceState(
+        type=PropertyType.FLOAT, state=PropertyInstanceStateValue(instance=FloatPropertyInstance.TEMPERATURE, value=5)
+    )
+
+    assert spool.empty is True
+    spool.add(
+        [DeviceState(id="a", capabilities=[on], properties=[temperature]), DeviceState(id="b", capabilities=[on])]
+    )
+    spool.add([DeviceState(id="a", capabilities=[off])])
+    spool.discard([DeviceState(id="b", capabilities=[off]), DeviceState(id="c", capabilities=[off])])
+    assert spool.empty is False
+    assert spool.pop_all() == [DeviceState(id="a", capabilities=[off], properties=[temperature])]
+    assert spool.empty is True
+
+    assert _merge_device_states(
+        [DeviceState(id="a", capabilities=[off])],
+        [DeviceState(id="a", properties=[temperature]), DeviceState(id="b", capabilities=[on])],
+    ) == [DeviceState(id="a", capabilities=[off], properties=[temperature]), DeviceState(id="b", capabilities=[on])]
+
+
+def test_notifier_retry_delay():
+    with patch("custom_components.yandex_smart_home.notifier.random.uniform", side_effect=lambda a, b: b):
+        assert [_get_retry_delay(attempt) for attempt in range(8)] == [5, 10, 20, 40, 80, 160, 300, 300]
+        assert _get_retry_delay(1000) == REPORT_STATE_RETRY_MAX_DELAY
+
+    for attempt in range(10):
+        delay = min(REPORT_STATE_RETRY_DELAY * 2**attempt, REPORT_STATE_RETRY_MAX_DELAY)
+        assert delay / 2 <= _get_retry_delay(attempt) <= delay
+
+
+def test_notifier_split_device_states():
+    states = [DeviceState(id=f"switch.{i}", capabilities=[]) for i in range(10)]
+    size = len(states[0].as_json())
+
+    assert _split_device_states([]) == []
+    assert _split_device_states(states) == [states]
+    assert _split_device_states(states, max_devices=4) == [states[:4], states[4:8], states[8:]]
+    assert _split_device_states(states, max_size=size * 3) == [states[:3], states[3:6], states[6:9], states[9:]]
+    assert _split_device_states(states, max_devices=2, max_size=size * 3) == [
+        states[i : i + 2] for i in range(0, 10, 2)
+    ]
+    assert _split_device_states(states[:2], max_size=1) == [states[:1], states[1:2]]
+
+
 async def test_notifier_pending_states(hass):
     ps = PendingStates()
-    await ps.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.test", "on"))], [])
-    assert ps._device_states["switch.test"][0].get_value() is True
-    await ps.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.test", "off"))], [])
-    assert ps._device_states["switch.test"][0].get_value() is False
+    ps.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.test", "on"))], [])
+    ps.async_add([TemperatureSensor(hass, BASIC_ENTRY_DATA, State("sensor.test", "5"))], [])
+    ps.async_add([OnOffCapabilityBasic(hass, BASIC_ENTRY_DATA, State("switch.test", "off"))], [])
+    pending = ps.async_get_all()
+    assert list(pending.keys()) == ["switch.test", "sensor.test"]
+    assert len(pending["switch.test"]) == 1
+    assert pending["switch.test"][0].get_value() is False
+    assert ps.empty is True
+
+
+async def test_notifier_pending_states_load(hass):
+    ps = PendingStates()
+    for i in range(1, 5001):
+        device_id = f"sensor.test_{i % 100}"
+        ps.async_add(
+            [TemperatureSensor(hass, BASIC_ENTRY_DATA, State(device_id, str(i)))],
+            [TemperatureSensor(hass, BASIC_ENTRY_DATA, State(device_id, str(i - 1)))],
+        )
+
+    assert ps.time_sensitive is False
+
+    for i in range(1, 5001):
+        device_id = f"binary_sensor.motion_{i % 10}"
+        ps.async_add(
+            [MotionStateEventProperty(hass, BASIC_ENTRY_DATA, State(device_id, "on" if i % 2 else "off"))],
+            [MotionStateEventProperty(hass, BASIC_ENTRY_DATA, State(device_id, "off" if i % 2 else "on"))],
+        )
+        assert ps.time_sensitive is True
+
+    assert ps._time_sensitive_count == 10
+    pending = ps.async_get_all()
+    assert len(pending) == 110
+    assert all(len(states) == 1 for states in pending.values())
+    assert pending["sensor.test_0"][0].get_value() == 5000
+    assert pending["binary_sensor.motion_0"][0].get_value() == "not_detected"
+    assert ps.empty is True
+    assert ps.time_sensitive is False
 
 
 async def test_notifier_capability_check_value_change(hass):
@@ -749,19 +1521,19 @@ async def test_notifier_capability_check_value_change(hass):
         RangeCapabilityInstance.OPEN,
         "foo",
     )
-    await _assert_not_empty_list(ps.async_add([cap.new_with_value_template(Template("5"))], []))
-    await _assert_empty_list(
+    _assert_not_empty_list(ps.async_add([cap.new_with_value_template(Template("5"))], []))
+    _assert_empty_list(
         ps.async_add([cap.new_with_value_template(Template("5"))], [cap.new_with_value_template(Template("5"))])
     )
-    await _assert_not_empty_list(
+    _assert_not_empty_list(
         ps.async_add([cap.new_with_value_template(Template("5"))], [cap.new_with_value_template(Template("6"))])
     )
-    await _assert_not_empty_list(
+    _assert_not_empty_list(
         ps.async_add(
             [cap.new_with_value_template(Template("5"))], [cap.new_with_value_template(Template(STATE_UNAVAILABLE))]
         )
     )
-    await _assert_empty_list(
+    _assert_empty_list(
         ps.async_add(
             [cap.new_with_value_template(Template(STATE_UNAVAILABLE))], [cap.new_with_value_template(Template("5"))]
         )
@@ -772,19 +1544,19 @@ async def test_notifier_capability_check_value_change(hass):
 async def test_notifier_float_property_check_value_change(hass, instance):
     ps = PendingStates()
     prop = get_custom_property(hass, BASIC_ENTRY_DATA, {const.CONF_ENTITY_PROPERTY_TYPE: instance}, "sensor.foo")
-    await _assert_not_empty_list(ps.async_add([prop.new_with_value_template(Template("5"))], []))
-    await _assert_empty_list(
+    _assert_not_empty_list(ps.async_add([prop.new_with_value_template(Template("5"))], []))
+    _assert_empty_list(
         ps.async_add([prop.new_with_value_template(Template("5"))], [prop.new_with_value_template(Template("5"))])
     )
-    await _assert_not_empty_list(
+    _assert_not_empty_list(
         ps.async_add([prop.new_with_value_template(Template("5"))], [prop.new_with_value_template(Template("6"))])
     )
-    await _assert_not_empty_list(
+    _assert_not_empty_list(
         ps.async_add(
             [prop.new_with_value_template(Template("5"))], [prop.new_with_value_template(Template(STATE_UNAVAILABLE))]
         )
     )
-    await _assert_empty_list(
+    _assert_empty_list(
         ps.async_add(
             [prop.new_with_value_template(Template(STATE_UNAVAILABLE))], [prop.new_with_value_template(Template("5"))]
         )
@@ -798,19 +1570,19 @@ async def test_notifier_binary_event_property_check_value_change(hass, instance)
 
     ps = PendingStates()
     prop = get_custom_property(hass, BASIC_ENTRY_DATA, {const.CONF_ENTITY_PROPERTY_TYPE: instance}, "binary_sensor.foo")
-    await _assert_empty_list(ps.async_add([prop.new_with_value_template(Template("on"))], []))
-    await _assert_empty_list(
+    _assert_empty_list(ps.async_add([prop.new_with_value_template(Template("on"))], []))
+    _assert_empty_list(
         ps.async_add([prop.new_with_value_template(Template("on"))], [prop.new_with_value_template(Template("on"))])
     )
-    await _assert_not_empty_list(
+    _assert_not_empty_list(
         ps.async_add([prop.new_with_value_template(Template("on"))], [prop.new_with_value_template(Template("off"))])
     )
-    await _assert_empty_list(
+    _assert_empty_list(
         ps.async_add(
             [prop.new_with_value_template(Template("on"))], [prop.new_with_value_template(Template(STATE_UNAVAILABLE))]
         )
     )
-    await _assert_empty_list(
+    _assert_empty_list(
         ps.async_add(
             [prop.new_with_value_template(Template(STATE_UNAVAILABLE))], [prop.new_with_value_template(Template("on"))]
         )
@@ -823,20 +1595,30 @@ async def test_notifier_binary_event_property_check_value_change(hass, instance)
 async def test_notifier_reactive_event_property_check_value_change(hass, instance, v):
     ps = PendingStates()
     prop = get_custom_property(hass, BASIC_ENTRY_DATA, {const.CONF_ENTITY_PROPERTY_TYPE: instance}, "binary_sensor.foo")
-    await _assert_not_empty_list(ps.async_add([prop.new_with_value_template(Template(v))], []))
-    await _assert_empty_list(
+    _assert_not_empty_list(ps.async_add([prop.new_with_value_template(Template(v))], []))
+    _assert_empty_list(
         ps.async_add([prop.new_with_value_template(Template(v))], [prop.new_with_value_template(Template(v))])
     )
-    await _assert_not_empty_list(
+    _assert_not_empty_list(
         ps.async_add([prop.new_with_value_template(Template(v))], [prop.new_with_value_template(Template("off"))])
     )
-    await _assert_not_empty_list(
+    _assert_not_empty_list(
         ps.async_add(
             [prop.new_with_value_template(Template(v))], [prop.new_with_value_template(Template(STATE_UNAVAILABLE))]
         )
     )
-    await _assert_empty_list(
+    _assert_empty_list(
         ps.async_add(
             [prop.new_with_value_template(Template(STATE_UNAVAILABLE))], [prop.new_with_value_template(Template(v))]
         )
     )
+
+
+async def test_notifier_shared_session(hass):
+    notifier_a = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG)
+    notifier_b = YandexDirectNotifier(hass, BASIC_ENTRY_DATA, replace(BASIC_CONFIG, skill_id="foo"))
+    notifier_c = YandexCloudNotifier(hass, BASIC_ENTRY_DATA, BASIC_CONFIG)
+
+    assert notifier_a._session is notifier_b._session
+    assert notifier_a._session is notifier_c._session
+    assert notifier_a._session is async_get_clientsession(hass)
@@ -60,6 +60,7 @@ def get_properties(
             continue
 
         if prop.supported:
+            assert PropertyT in STATE_PROPERTIES_REGISTRY.for_domain(state.domain)
             props.append(prop)
 
     return props
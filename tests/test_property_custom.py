@@ -194,6 +194,9 @@ async def test_property_custom_get_value_float(hass):
     assert prop.get_value() is None
     hass.states.async_set("sensor.test_2", "4.52")
     assert prop.get_value() == 4.52
+    assert prop.new_with_template_result(5).get_value() == 5
+    assert prop.new_with_template_result(None).get_value() is None
+    assert prop.get_value() == 4.52
 
     hass.states.async_set("sensor.test_2", "4.52", {"value": 9.99})
     prop = get_custom_property(
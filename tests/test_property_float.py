@@ -605,3 +605,45 @@ async def test_property_float_battery_attr(hass, domain):
 
     prop.state = State(f"{domain}.test", STATE_ON, {ATTR_BATTERY_LEVEL: "200"})
     assert prop.get_value() == 100
+
+
+async def test_property_float_deadband(hass):
+    entry_data = MockConfigEntryData(
+        hass=hass,
+        yaml_config={
+            const.CONF_SETTINGS: {
+                const.CONF_DEADBAND: {
+                    "temperature": {const.CONF_DEADBAND_ABSOLUTE: 0.5},
+                    "power": {const.CONF_DEADBAND_RELATIVE: 10},
+                }
+            }
+        },
+        entity_config={
+            "sensor.power_exact": {const.CONF_DEADBAND: {"power": {}}},
+            "sensor.power_floor": {
+                const.CONF_DEADBAND: {"power": {const.CONF_DEADBAND_ABSOLUTE: 5, const.CONF_DEADBAND_RELATIVE: 10}}
+            },
+        },
+    )
+
+    def _property(entity_id, value, device_class):
+        state = State(entity_id, value, {ATTR_DEVICE_CLASS: device_class})
+        return get_exact_one_property(hass, entry_data, state, PropertyType.FLOAT, device_class)
+
+    for entity_id, device_class, old_value, value, changed in [
+        ("sensor.temperature", "temperature", "20", "20.4", False),
+        ("sensor.temperature", "temperature", "20", "19.5", True),
+        ("sensor.temperature", "temperature", "20", STATE_UNKNOWN, False),
+        ("sensor.temperature", "temperature", STATE_UNKNOWN, "20.1", True),
+        ("sensor.humidity", "humidity", "50", "50.01", True),
+        ("sensor.power", "power", "100", "109", False),
+        ("sensor.power", "power", "100", "90", True),
+        ("sensor.power", "power", "1000", "1101", True),
+        ("sensor.power_exact", "power", "100", "100.01", True),
+        ("sensor.power_floor", "power", "10", "12", False),
+        ("sensor.power_floor", "power", "100", "108", False),
+        ("sensor.power_floor", "power", "100", "111", True),
+    ]:
+        new_prop = _property(entity_id, value, device_class)
+        old_prop = _property(entity_id, old_value, device_class)
+        assert new_prop.check_value_change(old_prop) is changed, (entity_id, old_value, value)
@@ -1,9 +1,27 @@
+import json
+from typing import Any
+
+from pydantic import BaseModel
+import pytest
 from pytest_homeassistant_custom_component.common import load_fixture
 
-from custom_components.yandex_smart_home.schema import ActionRequest, GetStreamInstanceActionStateValue
+from custom_components.yandex_smart_home.schema import (
+    ActionRequest,
+    DeviceDescription,
+    DeviceInfo,
+    DeviceList,
+    DeviceType,
+    GetStreamInstanceActionStateValue,
+    Response,
+    StatesRequest,
+    parse_action_request,
+    parse_states_request,
+)
+from custom_components.yandex_smart_home.schema.base import json_dumps, json_loads
 from custom_components.yandex_smart_home.schema.capability import *
 from custom_components.yandex_smart_home.schema.capability_color import *
 from custom_components.yandex_smart_home.schema.capability_mode import *
+from custom_components.yandex_smart_home.schema.capability_onoff import OnOffCapabilityParameters
 
 
 def test_devices_action_request():
@@ -48,3 +66,150 @@ def test_devices_action_request():
     assert request.payload.devices[0].capabilities[9] == ToggleCapabilityInstanceAction(
         state=ToggleCapabilityInstanceActionState(instance=ToggleCapabilityInstance.IONIZATION, value=False),
     )
+
+
+def test_device_list_json():
+    description = DeviceDescription(
+        id="light.kitchen",
+        name='Люстра "Кухня"',
+        type=DeviceType.LIGHT,
+        capabilities=[
+            CapabilityDescription(
+                type=CapabilityType.ON_OFF,
+                retrievable=True,
+                reportable=True,
+                parameters=OnOffCapabilityParameters(split=False),
+            )
+        ],
+        device_info=DeviceInfo(model="light.kitchen"),
+    )
+    assert description.as_json() is description.as_json()
+
+    device_list = DeviceList(user_id="Пользователь", devices=[description, description])
+    assert device_list.devices[0] is description
+
+    for response in [
+        Response(request_id="foo", payload=device_list),
+        Response(payload=device_list),
+        Response(payload=DeviceList(user_id="foo", devices=[])),
+        Response(request_id="foo"),
+        Response(),
+    ]:
+        assert response.as_json() == BaseModel.json(response, exclude_none=True, ensure_ascii=False)
+
+
+def test_json_codec():
+    assert json_dumps({"id": "light.kitchen", "name": 'Люстра "Кухня"', "value": 1.5, "on": None}) == (
+        '{"id":"light.kitchen","name":"Люстра \\"Кухня\\"","value":1.5,"on":null}'
+    )
+    assert json_loads('{"a": [1, "б", null]}') == {"a": [1, "б", None]}
+    assert json_loads(b'{"a": [1, true]}') == {"a": [1, True]}
+
+
+def test_json_codec_models():
+    description = DeviceDescription(
+        id="light.kitchen",
+        name='Люстра "Кухня"',
+        room="Кухня",
+        type=DeviceType.LIGHT,
+        capabilities=[
+            CapabilityDescription(
+                type=CapabilityType.ON_OFF,
+                retrievable=True,
+                reportable=True,
+                parameters=OnOffCapabilityParameters(split=False),
+            ),
+            CapabilityDescription(
+                type=CapabilityType.COLOR_SETTING,
+                retrievable=True,
+                reportable=True,
+                parameters=ColorSettingCapabilityParameters(
+                    color_model=CapabilityParameterColorModel.RGB,
+                    temperature_k=CapabilityParameterTemperatureK(min=2000, max=6500),
+                ),
+            ),
+        ],
+        device_info=DeviceInfo(model="light.kitchen"),
+    )
+    assert DeviceDescription.parse_raw(description.json()) == description
+
+    for response in [
+        Response(request_id="foo", payload=DeviceList(user_id="Пользователь", devices=[description] * 50)),
+        Response(request_id="foo"),
+    ]:
+        assert json.loads(response.as_json()) == response.as_dict()
+
+    action_payload = load_fixture("devices_action.json")
+    assert ActionRequest.parse_raw(action_payload) == ActionRequest.parse_obj(json.loads(action_payload))
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        '{"devices": [{"id": "light.kitchen", "custom_data": {"foo": "bar"}}, {"id": "sensor.temp"}]}',
+        '{"devices": [{"id": "light.kitchen", "custom_data": null, "extra": 1}]}',
+        '{"devices": [{"id": 5}, {"id": 1.5}, {"id": true}]}',
+        '{"devices": []}',
+        '{"devices": [{"id": null}]}',
+        '{"devices": [{"id": []}]}',
+        '{"devices": [{"id": "light.kitchen", "custom_data": "foo"}]}',
+        '{"devices": [{"custom_data": {}}]}',
+        '{"devices": ["light.kitchen"]}',
+        '{"devices": {"id": "light.kitchen"}}',
+        '{"devices": null}',
+        "{}",
+        "[]",
+        "",
+        "{",
+    ],
+)
+def test_parse_states_request(payload: str):
+    try:
+        expected = [(d.id, d.custom_data) for d in StatesRequest.parse_raw(payload).devices]
+    except ValueError:
+        with pytest.raises(ValueError):
+            parse_states_request(payload)
+        return
+
+    assert [(d.id, d.custom_data) for d in parse_states_request(payload)] == expected
+
+
+def _action_payload(capabilities: list[Any]) -> str:
+    return json.dumps({"payload": {"devices": [{"id": "light.kitchen", "capabilities": capabilities}]}})
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        load_fixture("devices_action.json"),
+        '{"payload": {"devices": [{"id": "light.kitchen", "capabilities": []}, {"id": 1, "capabilities": []}]}}',
+        _action_payload([{"type": "devices.capabilities.range", "state": {"instance": "volume", "value": -1}}]),
+        _action_payload(
+            [{"type": "devices.capabilities.range", "state": {"instance": "volume", "value": 5, "relative": True}}]
+        ),
+        _action_payload([{"type": "devices.capabilities.on_off", "state": {"instance": "on", "value": "on"}}]),
+        _action_payload([{"type": "devices.capabilities.on_off", "state": {"instance": "foo", "value": True}}]),
+        _action_payload([{"type": "devices.capabilities.foo", "state": {"instance": "on", "value": True}}]),
+        _action_payload([{"type": ["foo"], "state": {"instance": "on", "value": True}}]),
+        _action_payload([{"state": {"instance": "on", "value": True}}]),
+        _action_payload([{"type": "devices.capabilities.on_off"}]),
+        _action_payload(["devices.capabilities.on_off"]),
+        _action_payload(None),  # type: ignore[arg-type]
+        '{"payload": {"devices": [{"id": "light.kitchen"}]}}',
+        '{"payload": {"devices": [{"capabilities": []}]}}',
+        '{"payload": {"devices": null}}',
+        '{"payload": {}}',
+        '{"payload": []}',
+        "{}",
+        "",
+    ],
+)
+def test_parse_action_request(payload: str):
+    try:
+        expected = [(d.id, d.capabilities) for d in ActionRequest.parse_raw(payload).payload.devices]
+    except ValueError:
+        with pytest.raises(ValueError):
+            parse_action_request(payload)
+        return
+
+    assert [(d.id, d.capabilities) for d in parse_action_request(payload)] == expected